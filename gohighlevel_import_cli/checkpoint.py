@@ -0,0 +1,121 @@
+# gohighlevel_import_cli/checkpoint.py
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+SUCCESS = "success"
+FAILED = "failed"
+
+
+def record_digest(kind, email, *fields):
+    digest = hashlib.blake2b(digest_size=12)
+    for field in fields:
+        digest.update(repr(field).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f"{kind}:{email.strip().lower()}:{digest.hexdigest()}"
+
+
+def idempotency_key(kind, email, *fields, occurrence=0):
+    """Stable key for one record of a contact.
+
+    Built from the contact email and the record's own content, plus its
+    occurrence number among identical records of that contact, so the same
+    export row maps to the same key on every run.
+    """
+    return f"{record_digest(kind, email, *fields)}:{occurrence}"
+
+
+def contact_key(email):
+    return f"contact:{email.strip().lower()}"
+
+
+class CheckpointStore:
+    """Per-record import status in SQLite (WAL mode).
+
+    Every contact, task and note is stored under its idempotency key with its
+    status and GoHighLevel ID. Writes are buffered and committed in batches;
+    a crash loses at most the last unflushed batch.
+    """
+
+    def __init__(self, path, batch_size=100, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        # Sharded runs write from several processes; wait out their locks
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS records (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                email TEXT NOT NULL,
+                status TEXT NOT NULL,
+                ghl_id TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS records_email ON records (email);
+        """)
+
+    def lookup(self, email):
+        """Return {key: (status, ghl_id)} for everything recorded for a contact."""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT key, status, ghl_id FROM records WHERE email = ?", (email.strip().lower(),)
+            ).fetchall()
+        return {key: (status, ghl_id) for key, status, ghl_id in rows}
+
+    def status(self, key):
+        with self._lock:
+            row = self.db.execute("SELECT status, ghl_id FROM records WHERE key = ?", (key,)).fetchone()
+        return row if row else (None, None)
+
+    def record(self, key, kind, email, status, ghl_id=None, error=None):
+        with self._lock:
+            self._pending.append((key, kind, email.strip().lower(), status, ghl_id, error, time.time()))
+            if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            with self.db:
+                self.db.executemany("""
+                    INSERT INTO records (key, kind, email, status, ghl_id, error, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (key) DO UPDATE SET
+                        status = excluded.status,
+                        ghl_id = COALESCE(excluded.ghl_id, records.ghl_id),
+                        error = excluded.error,
+                        attempts = records.attempts + 1,
+                        updated_at = excluded.updated_at
+                """, self._pending)
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def counts(self):
+        with self._lock:
+            self._flush_locked()
+            rows = self.db.execute("SELECT kind, status, COUNT(*) FROM records GROUP BY kind, status").fetchall()
+        return {(kind, status): count for kind, status, count in rows}
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,150 @@
+# gohighlevel_import_cli/concurrency.py
+
+import logging
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class AdaptiveConcurrency:
+    """Cap on in-flight requests that follows the API's health (AIMD).
+
+    Every healthy response whose smoothed latency stays within `tolerance`
+    times the best latency seen adds 1/limit to the limit, so it grows by
+    about one per round of requests, up to `maximum`. An overload signal
+    (429, 5xx, timeout) halves it, at most once per `cooldown` seconds so a
+    burst of failures from one bad moment counts once.
+    """
+
+    def __init__(self, initial, minimum=1, maximum=None, tolerance=2.0, decrease_factor=0.5, cooldown=1.0,
+                 clock=time.monotonic):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum or initial))
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.tolerance = tolerance
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._baseline = None
+        self._smoothed = None
+        self._last_decrease = float("-inf")
+        self.low_water = self.limit
+        self.high_water = self.limit
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency=None, overloaded=False):
+        with self._cond:
+            self._in_flight -= 1
+            if overloaded:
+                self._decrease()
+            elif latency is not None:
+                self._observe(latency)
+            self._cond.notify_all()
+
+    def _observe(self, latency):
+        # The baseline creeps up slowly so a permanently slower network is
+        # not mistaken for overload forever
+        self._baseline = latency if self._baseline is None else min(latency, self._baseline * 1.001)
+        self._smoothed = latency if self._smoothed is None else 0.8 * self._smoothed + 0.2 * latency
+        if self._smoothed <= self._baseline * self.tolerance and self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self.high_water = max(self.high_water, self.limit)
+
+    def _decrease(self):
+        now = self._clock()
+        if now - self._last_decrease < self.cooldown or self.limit <= self.minimum:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+        self.low_water = min(self.low_water, self.limit)
+        logging.warning(f"API under strain; cutting concurrent requests from {int(previous)} to {int(self.limit)}")
+
+
+class CircuitBreaker:
+    """Stops all traffic after `failure_threshold` consecutive failures.
+
+    While open, before_request() blocks every caller for `reset_timeout`
+    seconds. Then one probe request is let through: success closes the
+    circuit, failure re-opens it for twice as long (up to `max_reset_timeout`).
+    Permanent client errors are not failures; the API answered fine.
+    """
+
+    def __init__(self, failure_threshold=10, reset_timeout=15.0, max_reset_timeout=300.0,
+                 clock=time.monotonic, sleep=time.sleep, metrics=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._clock = clock
+        self._sleep = sleep
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self._failures = 0
+        self._timeout = reset_timeout
+        self._opened_until = 0.0
+        self._probing = False
+
+    def _wait(self):
+        # 0 when the caller may send, otherwise how long to sleep first
+        with self._lock:
+            if self.state == CLOSED:
+                return 0
+            now = self._clock()
+            if self.state == OPEN and now >= self._opened_until:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if not self._probing:
+                    self._probing = True
+                    return 0
+                return 0.1
+            return min(self._opened_until - now, 1.0)
+
+    def before_request(self):
+        while True:
+            wait = self._wait()
+            if not wait:
+                return
+            self._sleep(wait)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self.state != CLOSED:
+                self.state = CLOSED
+                self._probing = False
+                self._timeout = self.reset_timeout
+                logging.info("API recovered; resuming requests")
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN:
+                self._probing = False
+                self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_until = self._clock() + self._timeout
+        if self.metrics is not None:
+            self.metrics.count("circuit_opened")
+        logging.warning(
+            f"{self._failures} consecutive API failures; pausing all requests for {self._timeout:.0f} seconds"
+        )
@@ -0,0 +1,118 @@
+# gohighlevel_import_cli/delta.py
+
+import sqlite3
+import threading
+import time
+import numpy as np
+import pandas as pd
+from gohighlevel_import_cli.streaming import record_key
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+
+def row_fingerprints(df, columns):
+    """Content hash of each row over `columns`, as a Series of hex strings."""
+    present = [column for column in columns if column in df.columns]
+    if df.empty or not present:
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+    # Hash the text form so 12 and 12.0 or a str/Timestamp round trip through
+    # the parse cache do not look like edits
+    values = df[present].astype(object).where(df[present].notna(), None).astype(str)
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    return pd.Series(np.char.mod("%016x", hashes).astype(object), index=df.index)
+
+
+def record_ids(df, column):
+    values = df[column]
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype(str).astype(object)
+    # Blank cells turn CSV ids into floats; record_key maps 12.0 back to "12"
+    return pd.Series([record_key(value) for value in values.tolist()], index=df.index, dtype=object)
+
+
+def classify(ids, fingerprints, stored):
+    """Compare rows with the fingerprints of the previous run.
+
+    `stored` is FingerprintStore.frame(); returns a status Series (NEW,
+    CHANGED or UNCHANGED) and the GoHighLevel ID each row was sent as.
+    """
+    previous = ids.map(stored["hash"]) if len(stored) else pd.Series([None] * len(ids), index=ids.index)
+    ghl_ids = ids.map(stored["ghl_id"]) if len(stored) else previous
+    status = np.where(previous.isna(), NEW, np.where(previous == fingerprints, UNCHANGED, CHANGED))
+    ghl_ids = ghl_ids.astype(object).where(ghl_ids.notna(), None)
+    return pd.Series(status, index=ids.index), ghl_ids
+
+
+class FingerprintStore:
+    """Content hash and GoHighLevel ID of every record sent, by source Record Id.
+
+    Read once per kind before a delta run and written back, in batches, as
+    records are created or updated.
+    """
+
+    def __init__(self, path, batch_size=500, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        # Sharded runs write from several processes; wait out their locks
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                kind TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                ghl_id TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (kind, record_id)
+            );
+        """)
+
+    def frame(self, kind):
+        """Stored hash and ghl_id of every record of `kind`, indexed by record_id."""
+        with self._lock:
+            self._flush_locked()
+            return pd.read_sql_query(
+                "SELECT record_id, hash, ghl_id FROM fingerprints WHERE kind = ?", self.db, params=(kind,)
+            ).set_index("record_id")
+
+    def record(self, kind, record_id, fingerprint, ghl_id=None):
+        with self._lock:
+            self._pending.append((kind, record_id, fingerprint, ghl_id, time.time()))
+            if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            with self.db:
+                self.db.executemany("""
+                    INSERT INTO fingerprints (kind, record_id, hash, ghl_id, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (kind, record_id) DO UPDATE SET
+                        hash = excluded.hash,
+                        ghl_id = COALESCE(excluded.ghl_id, fingerprints.ghl_id),
+                        updated_at = excluded.updated_at
+                """, self._pending)
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,175 @@
+# gohighlevel_import_cli/dry_run.py
+
+import json
+import math
+import re
+from array import array
+
+# Same encoding requests uses for json= bodies; NaN/inf are rejected there too
+_encode = json.JSONEncoder(allow_nan=False).encode
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# GoHighLevel's documented per-location daily request limit
+DAILY_LIMIT = 200000
+
+
+class PayloadSizes:
+
+    def __init__(self):
+        self.sizes = array("I")
+
+    def add(self, size):
+        self.sizes.append(size)
+
+    def summary(self):
+        if not self.sizes:
+            return {"count": 0}
+        ordered = sorted(self.sizes)
+        n = len(ordered)
+        return {
+            "count": n,
+            "total_bytes": sum(ordered),
+            "mean_bytes": round(sum(ordered) / n, 1),
+            "p50_bytes": ordered[n // 2],
+            "p95_bytes": ordered[min(n - 1, int(n * 0.95))],
+            "max_bytes": ordered[-1],
+        }
+
+
+class DryRunPlanner:
+    """Builds and checks every payload of an import without touching the API.
+
+    Each contact, task and note goes through the client's own payload
+    builders and is JSON-encoded exactly as a live request would be, so
+    anything the live run would choke on (missing titles, NaN values,
+    malformed emails) shows up here. report() adds the live run's projected
+    request count and duration for the given concurrency and rate limit.
+    """
+
+    def __init__(self, client, concurrency=1, latency=0.25, prefetch_contacts=False,
+                 batch_size=20, batch_delay=0.0):
+        self.client = client
+        self.concurrency = concurrency
+        self.latency = latency
+        self.prefetch_contacts = prefetch_contacts
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.counts = {}
+        self.sizes = {"contact": PayloadSizes(), "task": PayloadSizes(), "note": PayloadSizes()}
+        # Owner name -> user ID; each distinct owner is resolved once
+        self.owners = {}
+        self.unmatched_owners = set()
+
+    def _count(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def _encode(self, kind, payload):
+        # Returns an error message, or None if the payload would be sent as is
+        try:
+            body = _encode(payload)
+        except (TypeError, ValueError) as e:
+            return f"payload is not valid JSON: {e}"
+        self.sizes[kind].add(len(body.encode("utf-8")))
+        return None
+
+    def _owner(self, name):
+        if not name or not isinstance(name, str):
+            return None
+        if name not in self.owners:
+            user_id = self.owners[name] = self.client.resolve_user_id(name)
+            if user_id is None and self.client.user_directory.available:
+                self.unmatched_owners.add(name)
+        return self.owners[name]
+
+    def check_contact(self, contact):
+        """Validate one contact and its records.
+
+        Returns [(kind, error, record, request)] for the invalid ones, where
+        request is the API body a live run would have sent.
+        """
+        invalid = []
+        email = contact.email
+        payload = self.client.contact_payload(contact)
+        if not isinstance(email, str) or not _EMAIL.match(email.strip()):
+            invalid.append(("Contact", f"invalid email {email!r}", contact, payload))
+        else:
+            error = self._encode("contact", payload)
+            if error:
+                invalid.append(("Contact", error, contact, payload))
+        if invalid:
+            # Without a contact none of its records can be created
+            self._count("contacts_invalid")
+            self._count("records_skipped", len(contact.tasks) + len(contact.notes))
+            return invalid
+        self._count("contacts")
+
+        for task in contact.tasks:
+            payload = self.client.task_payload(task, completed=task.completed, assigned_to=self._owner(task.owner))
+            if not isinstance(task.subject, str) or not task.subject.strip():
+                error = "task has no subject"
+            else:
+                error = self._encode("task", payload)
+            if error:
+                self._count("tasks_invalid")
+                invalid.append(("Task", error, task, payload))
+            else:
+                self._count("tasks")
+                if not task.due_date:
+                    self._count("tasks_without_due_date")
+
+        for note in contact.notes:
+            payload = self.client.note_payload(note, assigned_to=self._owner(note.owner))
+            if not isinstance(note.content, str) or not note.content.strip():
+                error = "note has no content"
+            else:
+                error = self._encode("note", payload)
+            if error:
+                self._count("notes_invalid")
+                invalid.append(("Note", error, note, payload))
+            else:
+                self._count("notes")
+        return invalid
+
+    def projection(self):
+        contacts = self.counts.get("contacts", 0)
+        records = self.counts.get("tasks", 0) + self.counts.get("notes", 0)
+        if self.prefetch_contacts:
+            # At least one search page per 500 contacts already in the location
+            lookups = max(1, math.ceil(contacts / 500))
+        else:
+            lookups = contacts
+        users = 1 if self.owners and not self.client.user_directory.available else 0
+        # Between none and all of the contacts may need creating
+        requests_min = lookups + records + users
+        requests_max = requests_min + contacts
+
+        limiter = self.client.rate_limiter
+        rate = limiter.rate
+
+        def seconds(requests):
+            by_rate = requests / rate if rate else 0.0
+            by_latency = requests * self.latency / self.concurrency
+            if self.concurrency == 1 and self.batch_delay:
+                by_latency += math.ceil(contacts / self.batch_size) * self.batch_delay
+            return round(max(by_rate, by_latency), 1)
+
+        return {
+            "requests_min": requests_min,
+            "requests_max": requests_max,
+            "seconds_min": seconds(requests_min),
+            "seconds_max": seconds(requests_max),
+            "rate_limit_per_s": round(rate, 3),
+            "concurrency": self.concurrency,
+            "assumed_latency_s": self.latency,
+            "exceeds_daily_limit": requests_max > DAILY_LIMIT,
+            "days_at_daily_limit": math.ceil(requests_max / DAILY_LIMIT),
+        }
+
+    def report(self):
+        return {
+            "counts": dict(self.counts),
+            "payload_sizes": {kind: sizes.summary() for kind, sizes in self.sizes.items()},
+            "owners": len(self.owners),
+            # None when there was no cached user list to match against
+            "unmatched_owners": sorted(self.unmatched_owners) if self.client.user_directory.available else None,
+            "projection": self.projection(),
+        }
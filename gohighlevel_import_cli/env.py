@@ -0,0 +1,11 @@
+# gohighlevel_import_cli/env.py
+
+import functools
+
+
+@functools.cache
+def load_env():
+    """Load .env into os.environ, once per process however many clients are built."""
+    # Imported here so modules that only need os.environ stay cheap to import
+    from dotenv import load_dotenv
+    load_dotenv()
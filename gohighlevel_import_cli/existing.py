@@ -0,0 +1,91 @@
+# gohighlevel_import_cli/existing.py
+
+import threading
+from collections import defaultdict
+import pandas as pd
+
+
+def _text(value):
+    if value is None or (not isinstance(value, str) and value != value):
+        return ""
+    return " ".join(str(value).split()).casefold()
+
+
+def _due(value):
+    # GoHighLevel returns "2025-01-01T00:00:00.000Z"; naive export dates are
+    # taken to be UTC, as the API reads them
+    if value is None or value == "":
+        return None
+    try:
+        timestamp = pd.Timestamp(value)
+    except (ValueError, TypeError, OverflowError):
+        return str(value)
+    if timestamp is pd.NaT:
+        return None
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp.floor("s").isoformat()
+
+
+def task_signature(title, due_date):
+    return _text(title), _due(due_date)
+
+
+def note_signature(body):
+    return _text(body)
+
+
+class ExistingRecords:
+    """Tasks and notes already on each GoHighLevel contact.
+
+    A contact's records are listed the first time one of its tasks or notes
+    is about to be written, then kept for the rest of the run. Each existing
+    record can be claimed once, so two identical export rows still need two
+    identical records in GoHighLevel before both are skipped.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._lock = threading.Lock()
+        self._records = {}
+        self._loading = {}
+
+    def seed(self, contact_id):
+        # A contact created during this run has nothing to list
+        with self._lock:
+            self._records.setdefault(contact_id, {"tasks": {}, "notes": {}})
+
+    def claim(self, contact_id, kind, signature):
+        """Return the ID of an unclaimed existing record matching `signature`, or None."""
+        records = self._load(contact_id)
+        with self._lock:
+            ids = records[kind].get(signature)
+            return ids.pop() if ids else None
+
+    def _load(self, contact_id):
+        with self._lock:
+            records = self._records.get(contact_id)
+            if records is not None:
+                return records
+            loading = self._loading.setdefault(contact_id, threading.Lock())
+        # One listing per contact even when its records are written in parallel
+        with loading:
+            with self._lock:
+                records = self._records.get(contact_id)
+            if records is None:
+                records = {
+                    "tasks": self._index(self.client.list_tasks(contact_id),
+                                         lambda task: task_signature(task.get("title"), task.get("dueDate"))),
+                    "notes": self._index(self.client.list_notes(contact_id),
+                                         lambda note: note_signature(note.get("body"))),
+                }
+                with self._lock:
+                    self._records[contact_id] = records
+                    self._loading.pop(contact_id, None)
+        return records
+
+    def _index(self, records, signature):
+        index = defaultdict(list)
+        for record in records:
+            index[signature(record)].append(record.get("id"))
+        return index
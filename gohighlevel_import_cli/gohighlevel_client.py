@@ -1,98 +1,294 @@
 # gohighlevel_import_cli/gohighlevel_client.py
 
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import time
 import os
-from dotenv import load_dotenv
+import random
+import threading
+from gohighlevel_import_cli.env import load_env
+from gohighlevel_import_cli.logs import record_event
 from gohighlevel_import_cli.models import Contact, Task, Note
+from gohighlevel_import_cli.metrics import RunMetrics, endpoint_name
+from gohighlevel_import_cli.rate_limiter import RateLimiter
+from gohighlevel_import_cli.concurrency import AdaptiveConcurrency, CircuitBreaker
+from gohighlevel_import_cli.user_directory import UserDirectory, load_user_aliases
+
+class GoHighLevelError(Exception):
+    """A request that did not succeed; status_code is None if no response came back."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RetryableError(GoHighLevelError):
+    """Timeouts, connection errors, 408s and 5xx (or 429s) that outlasted every attempt."""
+
+
+class PermanentError(GoHighLevelError):
+    """Any other 4xx, or a request that cannot be built: the same request will never succeed."""
+
+
+# Raised while building a request, before anything is sent: a payload that
+# cannot be encoded (NaN in a JSON body) or a malformed URL fails the same way
+# on every attempt
+REQUEST_BUILD_ERRORS = (
+    requests.exceptions.InvalidJSONError, requests.exceptions.InvalidURL, requests.exceptions.MissingSchema,
+    requests.exceptions.InvalidSchema, requests.exceptions.InvalidHeader, requests.exceptions.URLRequired,
+)
+
+
+def is_retryable_status(status):
+    return status == 408 or (status >= 500 and status != 501)
+
+
+def normalize_email(email):
+    if not isinstance(email, str):
+        return None
+    return email.strip().lower() or None
+
 
 class GoHighLevelClient:
-    def __init__(self, api_key=None, location_id=None, dry_run=True):
-        load_dotenv()
+    def __init__(self, api_key=None, location_id=None, dry_run=True, rate_limiter=None, pool_size=None, metrics=None,
+                 concurrency=None, circuit_breaker=None):
+        load_env()
         self.dry_run = dry_run
-        self.base_url = "https://services.leadconnectorhq.com"
+        # GHL_BASE_URL points the client at a local stand-in (see mock_server)
+        self.base_url = os.getenv("GHL_BASE_URL", "https://services.leadconnectorhq.com").rstrip("/")
         self.api_version = "2021-07-28"
         self.token = api_key or os.getenv("GHL_PRIVATE_INTEGRATION_TOKEN")
         self.location_id = location_id or os.getenv("GHL_LOCATION_ID")
-        self.user_cache = {}  # Cache for user data
+        self.user_directory = UserDirectory(
+            self.fetch_users,
+            self.location_id,
+            cache_path=os.getenv("GHL_USER_CACHE_PATH"),
+            ttl=int(os.getenv("GHL_USER_CACHE_TTL", 86400)),
+            aliases=load_user_aliases(os.getenv("GHL_USER_ALIASES_PATH")),
+            # Dry runs only match owners against an existing cached user list
+            offline=dry_run,
+        )
+        # Normalized email -> contact ID, filled by prefetch_contacts()
+        self.contact_index = None
+        self._contact_index_lock = threading.Lock()
+        # Share one limiter between clients that hit the same location
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.metrics = metrics or RunMetrics()
+        self.max_attempts = 3
+        # Cap on requests in flight across all threads, adjusted to the
+        # API's health, and a breaker that pauses everything in a brownout
+        self.concurrency = concurrency or AdaptiveConcurrency(int(pool_size or os.getenv("HTTP_POOL_SIZE", 10)))
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 10)),
+            reset_timeout=float(os.getenv("CIRCUIT_RESET_TIMEOUT", 15)),
+            metrics=self.metrics,
+        )
+        self.max_rate_limit_waits = int(os.getenv("MAX_RATE_LIMIT_WAITS", 10))
+        # Without a timeout a stalled connection would hang its worker forever
+        self.timeout = float(os.getenv("HTTP_TIMEOUT", 30))
         
         if not self.token:
             raise ValueError("GHL_PRIVATE_INTEGRATION_TOKEN is not set in the environment variables.")
         if not self.location_id:
             raise ValueError("GHL_LOCATION_ID is not set in the environment variables.")
 
+        # One keep-alive session per client: connections are reused across
+        # calls and threads instead of a new TCP+TLS handshake per request
+        self.pool_size = int(pool_size or os.getenv("HTTP_POOL_SIZE", 10))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(self._get_headers())
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def _get_headers(self):
         return {
             "Authorization": f"Bearer {self.token}",
             "Accept": "application/json",
             "Version": self.api_version,
+            "Accept-Encoding": "gzip, deflate",
         }
 
     def _handle_rate_limit(self, response):
+        self.rate_limiter.update(response.headers)
         if response.status_code == 429:
-            reset_time = int(response.headers.get("X-RateLimit-Reset", 1))
-            logging.warning(f"Rate limit exceeded. Waiting {reset_time} seconds before retrying...")
-            time.sleep(reset_time)
+            reset_time = float(response.headers.get("X-RateLimit-Reset", 1))
+            self.metrics.record_rate_limit_wait(reset_time)
+            self.rate_limiter.pause(reset_time)
             return True
         return False
 
+    def _backoff(self, attempt):
+        # Full jitter keeps retrying workers from waking up in lockstep
+        time.sleep(random.uniform(0, min(30.0, 2 ** attempt)))
+
     def _make_request(self, method, url, **kwargs):
-        for attempt in range(3):
+        # 429s wait on the shared limiter and do not use up an error retry.
+        # 4xx errors and requests that cannot be built raise PermanentError
+        # at once; timeouts, connection errors and 5xx are retried and raise
+        # RetryableError when attempts run out.
+        endpoint = endpoint_name(method, url)
+        try:
+            # Build the request once up front so a bad payload fails fast,
+            # without a rate-limit token, a concurrency slot or a breaker failure
+            requests.Request(method, url, **kwargs).prepare()
+        except REQUEST_BUILD_ERRORS as e:
+            raise PermanentError(f"{endpoint} request could not be built: {e}")
+        attempt = 0
+        rate_limit_waits = 0
+        error = None
+        while attempt < self.max_attempts and rate_limit_waits <= self.max_rate_limit_waits:
+            self.circuit_breaker.before_request()
+            wait_start = time.perf_counter()
+            self.rate_limiter.acquire()
+            self.concurrency.acquire()
+            start = time.perf_counter()
+            self.metrics.record_limiter_wait(start - wait_start)
+            response = None
             try:
-                response = requests.request(method, url, headers=self._get_headers(), **kwargs)
-                if self._handle_rate_limit(response):
-                    continue
-                logging.debug(f"Response [{response.status_code}]: {response.text}")
-                response.raise_for_status()
-                return response.json()
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                latency = time.perf_counter() - start
+                self.metrics.record_request(
+                    endpoint, response.status_code, latency,
+                    bytes_sent=len(response.request.body or b""), bytes_received=len(response.content)
+                )
             except requests.exceptions.RequestException as e:
-                logging.error(f"Request failed (attempt {attempt + 1}/3): {e}")
-                time.sleep(2 ** attempt)
-        raise Exception("API request failed after 3 attempts.")
+                # Timeouts and connection errors never produced a response
+                self.metrics.record_request(endpoint, None, time.perf_counter() - start)
+                self.circuit_breaker.record_failure()
+                self.metrics.record_retry(endpoint)
+                logging.error("Request failed (attempt %d/%d): %s", attempt + 1, self.max_attempts, e)
+                error = RetryableError(f"{endpoint} failed: {e}")
+                self._backoff(attempt)
+                attempt += 1
+                continue
+            finally:
+                overloaded = response is None or response.status_code == 429 or response.status_code >= 500
+                self.concurrency.release(None if response is None else latency, overloaded=overloaded)
 
-    def resolve_user_id(self, full_name):
-        if full_name in self.user_cache:
-            return self.user_cache[full_name]
+            status = response.status_code
+            if self._handle_rate_limit(response):
+                # The API answered; being throttled is not an outage
+                self.circuit_breaker.record_success()
+                rate_limit_waits += 1
+                continue
+            logging.debug("Response [%s] %s %s (%d bytes)", status, method, url, len(response.content))
+            if status < 400:
+                try:
+                    result = response.json()
+                except ValueError as e:
+                    # A truncated or non-JSON body (a proxy's error page, say)
+                    # is retried like a 5xx
+                    message = f"{endpoint} returned {status} with a body that is not JSON: {e}"
+                else:
+                    self.circuit_breaker.record_success()
+                    return result
+            else:
+                message = f"{endpoint} returned {status}: {response.text[:200]}"
+                if not is_retryable_status(status):
+                    self.circuit_breaker.record_success()
+                    raise PermanentError(message, status)
+            self.circuit_breaker.record_failure()
+            self.metrics.record_retry(endpoint)
+            logging.error("Request failed (attempt %d/%d): %s", attempt + 1, self.max_attempts, message)
+            error = RetryableError(message, status)
+            self._backoff(attempt)
+            attempt += 1
+        if error is None:
+            error = RetryableError(f"{endpoint} was rate limited {rate_limit_waits} times", 429)
+        raise RetryableError(f"API request failed after {attempt} attempts and {rate_limit_waits} rate-limit waits: "
+                             f"{error}", error.status_code)
 
+    def fetch_users(self):
         url = f"{self.base_url}/users/"
         params = {"locationId": self.location_id}
+        result = self._make_request("GET", url, params=params)
+        return result.get("users", [])
+
+    def resolve_user_id(self, full_name):
         try:
-            result = self._make_request("GET", url, params=params)
-            for user in result.get("users", []):
-                user_name = f"{user.get('firstName', '').strip()} {user.get('lastName', '').strip()}".strip()
-                if user_name.lower() == full_name.lower():
-                    user_id = user.get("id")
-                    self.user_cache[full_name] = user_id
-                    logging.info(f"Matched user '{full_name}' to ID {user_id}")
-                    return user_id
-            logging.warning(f"No user match found for '{full_name}'")
-            self.user_cache[full_name] = None
-            return None
+            return self.user_directory.resolve(full_name)
         except Exception as e:
             logging.error(f"Error resolving user '{full_name}': {e}")
             return None
 
+    def prefetch_contacts(self, page_limit=500):
+        """Page through every contact in the location once and index them by email.
+
+        After this, find_contact_by_email answers from the local index and
+        only contacts created during the run are added to it.
+        """
+        url = f"{self.base_url}/contacts/search"
+        index = {}
+        search_after = None
+        while True:
+            payload = {"locationId": self.location_id, "pageLimit": page_limit}
+            if search_after:
+                payload["searchAfter"] = search_after
+            result = self._make_request("POST", url, json=payload)
+            contacts = result.get("contacts", [])
+            for contact in contacts:
+                email = normalize_email(contact.get("email"))
+                if email and email not in index:
+                    index[email] = contact.get("id")
+            if len(contacts) < page_limit:
+                break
+            search_after = contacts[-1].get("searchAfter")
+            if not search_after:
+                break
+            logging.info(f"Prefetched {len(index)} contacts so far...")
+
+        with self._contact_index_lock:
+            self.contact_index = index
+        logging.info(f"Prefetched {len(index)} GoHighLevel contacts for location {self.location_id}")
+        return index
+
+    def _remember_contact(self, email, contact_id):
+        if self.contact_index is not None and contact_id:
+            with self._contact_index_lock:
+                self.contact_index[normalize_email(email)] = contact_id
+
     def find_contact_by_email(self, email):
+        if self.contact_index is not None:
+            contact_id = self.contact_index.get(normalize_email(email))
+            return {"id": contact_id} if contact_id else None
+        if self.dry_run:
+            # Dry runs never touch the API; every contact looks new
+            return None
+
         url = f"{self.base_url}/contacts/search"
         payload = {
             "locationId": self.location_id,
             "filters": [
                 {
                     "field": "email",
-                    "operator": "contains",
+                    "operator": "eq",
                     "value": email
                 }
             ],
             "page": 1,
             "pageLimit": 1
         }
-        logging.debug(f"Sending contact search payload: {payload}")
+        logging.debug("Sending contact search payload: %s", payload)
         result = self._make_request("POST", url, json=payload)
         contacts = result.get("contacts", [])
-        return contacts[0] if contacts else None
+        # Guard against partial matches (bob@x.com vs jimbob@x.com)
+        for contact in contacts:
+            if normalize_email(contact.get("email")) in (None, normalize_email(email)):
+                return contact
+        return None
 
-    def create_task(self, contact_id, task: Task, completed=False, assigned_to=None):
+    def task_payload(self, task: Task, completed=False, assigned_to=None):
         payload = {
             "title": task.subject,
             "dueDate": task.due_date,
@@ -100,31 +296,17 @@ class GoHighLevelClient:
         }
         if assigned_to:
             payload["assignedTo"] = assigned_to
-        if self.dry_run:
-            logging.info(f"[DRY RUN] Would create task: {payload}")
-            return payload
-        else:
-            url = f"{self.base_url}/contacts/{contact_id}/tasks"
-            response = self._make_request("POST", url, json=payload)
-            logging.info(f"Created task: {response}")
-            return response
+        return payload
 
-    def create_note(self, contact_id, note: Note, assigned_to=None):
+    def note_payload(self, note: Note, assigned_to=None):
         payload = {
             "body": note.content
         }
         if assigned_to:
             payload["assignedTo"] = assigned_to
-        if self.dry_run:
-            logging.info(f"[DRY RUN] Would create note: {payload}")
-            return payload
-        else:
-            url = f"{self.base_url}/contacts/{contact_id}/notes"
-            response = self._make_request("POST", url, json=payload)
-            logging.info(f"Created note: {response}")
-            return response
+        return payload
 
-    def create_contact(self, contact: Contact):
+    def contact_payload(self, contact: Contact):
         payload = {
             "email": contact.email,
             "firstName": contact.first_name,
@@ -132,22 +314,95 @@ class GoHighLevelClient:
             "companyName": contact.business_name,
             "phone": contact.phone,
             "additionalPhones": contact.additional_phones,
-            "address1": contact.address.get("street"),
-            "city": contact.address.get("city"),
-            "state": contact.address.get("state"),
-            "postalCode": contact.address.get("postalCode"),
-            "country": contact.address.get("country"),
+            "address1": contact.street,
+            "city": contact.city,
+            "state": contact.state,
+            "postalCode": contact.postal_code,
+            "country": contact.country,
         }
 
         # Remove empty fields
-        payload = {k: v for k, v in payload.items() if v}
-        logging.info(f"Creating contact: {payload}")
+        return {k: v for k, v in payload.items() if v}
+
+    def create_task(self, contact_id, task: Task, completed=False, assigned_to=None):
+        payload = self.task_payload(task, completed=completed, assigned_to=assigned_to)
+        if self.dry_run:
+            record_event("task_dry_run", "[DRY RUN] Would create task: %s", payload, contact_id=contact_id, payload=payload)
+            return payload
+        else:
+            url = f"{self.base_url}/contacts/{contact_id}/tasks"
+            response = self._make_request("POST", url, json=payload)
+            record_event("task_created", "Created task: %s", response, contact_id=contact_id, response=response)
+            return response
+
+    def create_note(self, contact_id, note: Note, assigned_to=None):
+        payload = self.note_payload(note, assigned_to=assigned_to)
+        if self.dry_run:
+            record_event("note_dry_run", "[DRY RUN] Would create note: %s", payload, contact_id=contact_id, payload=payload)
+            return payload
+        else:
+            url = f"{self.base_url}/contacts/{contact_id}/notes"
+            response = self._make_request("POST", url, json=payload)
+            record_event("note_created", "Created note: %s", response, contact_id=contact_id, response=response)
+            return response
 
+    def create_contact(self, contact: Contact):
+        payload = self.contact_payload(contact)
         if self.dry_run:
-            logging.info(f"[DRY RUN] Would create contact: {payload}")
+            record_event("contact_dry_run", "[DRY RUN] Would create contact: %s", payload, payload=payload)
             return {"id": f"mock-{contact.email}"}
         else:
             url = f"{self.base_url}/contacts/"
-            response = self._make_request("POST", url, json=payload)
-            logging.info(f"Created contact: {response}")
+            # New contacts are created in this client's location (one of
+            # several under --shard-by location)
+            response = self._make_request("POST", url, json=dict(payload, locationId=self.location_id))
+            record_event("contact_created", "Created contact: %s", response, email=contact.email, response=response)
+            # The v2 API wraps the new record as {"contact": {...}}
+            response = response.get("contact", response)
+            self._remember_contact(contact.email, response.get("id"))
             return response
+
+    def update_task(self, contact_id, task_id, task: Task, completed=False, assigned_to=None):
+        payload = self.task_payload(task, completed=completed, assigned_to=assigned_to)
+        if self.dry_run:
+            record_event("task_dry_run", "[DRY RUN] Would update task %s: %s", task_id, payload,
+                         contact_id=contact_id, task_id=task_id, payload=payload)
+            return payload
+        url = f"{self.base_url}/contacts/{contact_id}/tasks/{task_id}"
+        response = self._make_request("PUT", url, json=payload)
+        record_event("task_updated", "Updated task %s: %s", task_id, response, contact_id=contact_id, response=response)
+        return response
+
+    def update_note(self, contact_id, note_id, note: Note, assigned_to=None):
+        payload = self.note_payload(note, assigned_to=assigned_to)
+        if self.dry_run:
+            record_event("note_dry_run", "[DRY RUN] Would update note %s: %s", note_id, payload,
+                         contact_id=contact_id, note_id=note_id, payload=payload)
+            return payload
+        url = f"{self.base_url}/contacts/{contact_id}/notes/{note_id}"
+        response = self._make_request("PUT", url, json=payload)
+        record_event("note_updated", "Updated note %s: %s", note_id, response, contact_id=contact_id, response=response)
+        return response
+
+    def update_contact(self, contact_id, contact: Contact):
+        payload = self.contact_payload(contact)
+        if self.dry_run:
+            record_event("contact_dry_run", "[DRY RUN] Would update contact %s: %s", contact_id, payload, payload=payload)
+            return {"id": contact_id}
+        url = f"{self.base_url}/contacts/{contact_id}"
+        response = self._make_request("PUT", url, json=payload)
+        record_event("contact_updated", "Updated contact %s: %s", contact_id, response, email=contact.email,
+                     response=response)
+        return response.get("contact", response)
+
+    def list_tasks(self, contact_id):
+        if self.dry_run:
+            return []
+        result = self._make_request("GET", f"{self.base_url}/contacts/{contact_id}/tasks")
+        return result.get("tasks", [])
+
+    def list_notes(self, contact_id):
+        if self.dry_run:
+            return []
+        result = self._make_request("GET", f"{self.base_url}/contacts/{contact_id}/notes")
+        return result.get("notes", [])
@@ -1,37 +1,194 @@
 # gohighlevel_import_cli/importer.py
 
 import pandas as pd
+import json
 import time
 import os
 import logging
-from datetime import datetime
-from gohighlevel_import_cli.models import Contact, Task, Note
-from gohighlevel_import_cli.gohighlevel_client import GoHighLevelClient
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from gohighlevel_import_cli.metrics import RunMetrics, ProgressReporter
+from gohighlevel_import_cli.models import Contact, Task, Note, DeltaTask, DeltaNote, task_from_dict, note_from_dict
+from gohighlevel_import_cli.normalize import (normalize_datetimes, normalize_datetime, normalize_text, clean_text,
+                                              completed_flags, is_completed, is_missing)
+from gohighlevel_import_cli.dry_run import DryRunPlanner
+from gohighlevel_import_cli.logs import record_event
+from gohighlevel_import_cli.checkpoint import CheckpointStore, idempotency_key, contact_key, SUCCESS, FAILED
+from gohighlevel_import_cli.existing import ExistingRecords, task_signature, note_signature
+from gohighlevel_import_cli.delta import FingerprintStore, classify, record_ids, row_fingerprints, CHANGED, UNCHANGED
+from gohighlevel_import_cli.gohighlevel_client import GoHighLevelClient, GoHighLevelError
+from gohighlevel_import_cli.concurrency import AdaptiveConcurrency
+from gohighlevel_import_cli.rate_limiter import RateLimiter
+from gohighlevel_import_cli.sharding import shard_of
+from gohighlevel_import_cli.parse_cache import ParseCache, read_table
+from gohighlevel_import_cli.pipeline import ImportPipeline
+from gohighlevel_import_cli.streaming import StreamingSource
 from itertools import islice
 
+# Columns whose normalized values are fingerprinted for --delta; tasks and
+# notes include Email so moving a record to another contact is a change
+TASK_COLUMNS = ('Email', 'Subject', 'Due Date', 'Description', 'Status', 'Priority', 'Task Owner')
+NOTE_COLUMNS = ('Email', 'Note Title', 'Note Content', 'Created Time', 'Note Owner')
+# The columns behind Importer._signature, for numbering identical records
+TASK_SIGNATURE = ('Subject', 'Due Date', 'Description')
+NOTE_SIGNATURE = ('Note Title', 'Note Content', 'Created Time')
+# The --delta metadata columns, in DeltaTask/DeltaNote argument order
+DELTA_COLUMNS = ('_record_id', '_fingerprint', '_ghl_id', '_occurrence')
+
+
+def load_failures(path):
+    """Read a failure log written by Importer.run (one JSON object per line)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_frames(contacts_path, tasks_path, notes_path, cache_dir=None):
+    """Parse the exports into (contacts, tasks, notes) frames, via the parse cache.
+
+    Tasks and notes get their contact's Email (and Record Id) merged in;
+    rows whose contact is not in the contacts export are dropped.
+    """
+    cache = ParseCache(cache_dir) if cache_dir else None
+    names = ("contacts", "tasks", "notes")
+    if cache:
+        cache_key = cache.key([contacts_path, tasks_path, notes_path])
+        frames = cache.get(cache_key, names)
+        if frames is not None:
+            logging.info(f"Loaded parsed exports from cache {cache_dir}")
+            return tuple(frames[name] for name in names)
+
+    contacts_df = read_table(contacts_path)
+    tasks_df = read_table(tasks_path)
+    notes_df = read_table(notes_path)
+
+    tasks_df = tasks_df.merge(
+        contacts_df[['Record Id', 'Email']],
+        left_on='Contact Name.id',
+        right_on='Record Id',
+        how='left'
+    ).dropna(subset=['Email'])
+
+    notes_df = notes_df.merge(
+        contacts_df[['Record Id', 'Email']],
+        left_on='Parent ID.id',
+        right_on='Record Id',
+        how='left'
+    ).dropna(subset=['Email'])
+
+    if cache:
+        cache.put(cache_key, dict(zip(names, (contacts_df, tasks_df, notes_df))))
+    return contacts_df, tasks_df, notes_df
+
+
 class Importer:
-    def __init__(self, api_key, location_id, contacts_path, tasks_path, notes_path, dry_run=True, limit=None):
+    def __init__(self, api_key, location_id, contacts_path, tasks_path, notes_path, dry_run=True, limit=None, concurrency=1, prefetch_contacts=False,
+                 stream=False, stream_batch_size=500, cache_dir=".import_cache",
+                 checkpoint_path="import_checkpoint.sqlite", metrics_path=None, progress_interval=0,
+                 pipeline=False, pipeline_queue_size=1000, projected_latency=0.25, replay_attempts=5,
+                 date_formats=None, timezone=None, delta=False, fingerprints_path="import_fingerprints.sqlite",
+                 skip_existing=False, max_concurrency=None, shard=None, location_column=None, rate_share=1.0):
         self.batch_size = int(os.getenv("BATCH_SIZE", 20))
-        self.batch_delay = int(os.getenv("BATCH_DELAY", 5))
+        # The client paces itself from the rate-limit headers, so no extra
+        # pause between batches is needed unless one is configured
+        self.batch_delay = float(os.getenv("BATCH_DELAY", 0))
         self.import_log_path = "imported_contacts.log"
         self.already_imported = set()
         self.failed_imports = []
-        self.failed_log_path = "failed_imports.csv"
+        # One JSON object per failed record, reloadable by replay_failures();
+        # dry runs list invalid records separately so a live log is never lost
+        self.failed_log_path = "dry_run_invalid.jsonl" if dry_run else "failed_imports.jsonl"
+        self.unmatched_log_path = "unmatched_contacts.csv"
+        # Date values that could not be parsed, one row per value
+        self.rejected_log_path = "rejected_values.csv"
+        self.rejections = []
+        # strptime formats tried before ISO 8601, and the timezone of naive
+        # export timestamps (aware values are sent as UTC)
+        self.date_formats = tuple(date_formats or ())
+        self.timezone = timezone
+        self.dry_run_report_path = "dry_run_report.json"
         self.contacts_path = contacts_path
         self.tasks_path = tasks_path
         self.notes_path = notes_path
-        self.client = GoHighLevelClient(api_key, location_id, dry_run)
+        self.concurrency = max(1, int(concurrency or 1))
+        # Threads per pool; the client starts with one request in flight per
+        # --concurrency thread and raises that towards max_concurrency while
+        # the API stays healthy
+        self.workers = max(self.concurrency, int(max_concurrency or 0))
+        self.metrics = RunMetrics()
+        self.metrics_path = metrics_path
+        self.progress_interval = progress_interval
+        # None redraws progress in place on a terminal; shard processes log it
+        self.progress_interactive = None
+        # Enough pooled connections for the contact and record workers
+        self.client = GoHighLevelClient(
+            api_key, location_id, dry_run, pool_size=max(10, self.workers * 2), metrics=self.metrics,
+            # Processes sharing one location split its rate limit
+            rate_limiter=RateLimiter(share=rate_share),
+            # Contact and record pools both send requests
+            concurrency=AdaptiveConcurrency(self.concurrency * 2, maximum=self.workers * 2)
+        )
+        # The client falls back to GHL_LOCATION_ID; failure entries name it
+        self.location_id = self.client.location_id
+        # Lists each found contact's tasks and notes once and skips writing
+        # records that are already there
+        self.existing = ExistingRecords(self.client) if skip_existing and not dry_run else None
         self.contacts_dict = {}
         self.unmatched_contacts = []
         self.limit = limit
+        self.prefetch_contacts = prefetch_contacts
+        # Streaming keeps at most stream_batch_size contacts (with their tasks
+        # and notes) in memory instead of whole DataFrames
+        self.stream = stream
+        self.stream_batch_size = stream_batch_size
+        # Pipeline mode overlaps reading, contact resolution and record writes;
+        # dry runs are planned offline from the mapped contacts instead
+        self.pipeline = pipeline and not dry_run
+        self.pipeline_queue_size = pipeline_queue_size
+        # Parsed frames are cached here between runs; None disables the cache
+        self.cache_dir = cache_dir
+        self._import_log_lock = threading.Lock()
+        # Live runs record per-record progress here; dry runs never write it
+        self.dry_run = dry_run
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint = None
+        # Per-request latency assumed when projecting a live run's duration
+        self.projected_latency = projected_latency
+        # Attempts per request when replaying failures
+        self.replay_attempts = replay_attempts
+        # Delta sync compares each row with the fingerprints stored by the
+        # previous delta run and only sends new or changed records
+        self.delta = delta
+        self.fingerprints_path = fingerprints_path
+        self.fingerprints = None
+        # email -> (record_id, fingerprint, status, previous GoHighLevel ID)
+        self._delta_contacts = {}
+        # Sharded runs: (index, count) keeps the contacts whose email hashes
+        # to index; location_column keeps the rows of this location only
+        self.shard = shard
+        self.location_column = location_column
 
-    def log_failure(self, email, record_type, error, payload):
-        self.failed_imports.append({
+    def log_failure(self, email, record_type, error, payload, contact_id=None, key=None, request=None):
+        entry = {
             "Email": email,
             "Type": record_type,
             "Error": str(error),
-            "Payload": str(payload)
-        })
+            "Payload": payload,
+            "ContactId": contact_id,
+            "Key": key,
+            # Replays send each record back to this location
+            "Location": self.location_id
+        }
+        if request is not None:
+            # Dry runs add the API body a live run would have sent; Payload
+            # is always the record's to_dict(), ready for --replay-failures
+            entry["Request"] = request
+        self.failed_imports.append(entry)
+
+    def _write_failures(self):
+        with open(self.failed_log_path, "w", encoding="utf-8") as f:
+            for failure in self.failed_imports:
+                f.write(json.dumps(failure, default=str) + "\n")
+        logging.warning(f"Wrote {len(self.failed_imports)} failed records to {self.failed_log_path}")
 
     def chunked_iterable(self, iterable, size):
         it = iter(iterable)
@@ -42,188 +199,785 @@ class Importer:
             yield chunk
  
     def load_data(self):
-        self.contacts_df = pd.read_excel(self.contacts_path)
-        self.tasks_df = pd.read_excel(self.tasks_path)
-        self.notes_df = pd.read_excel(self.notes_path)
-
-        self.tasks_df = self.tasks_df.merge(
-            self.contacts_df[['Record Id', 'Email']],
-            left_on='Contact Name.id',
-            right_on='Record Id',
-            how='left'
-        ).dropna(subset=['Email'])
-
-        self.notes_df = self.notes_df.merge(
-            self.contacts_df[['Record Id', 'Email']],
-            left_on='Parent ID.id',
-            right_on='Record Id',
-            how='left'
-        ).dropna(subset=['Email'])
+        self.contacts_df, self.tasks_df, self.notes_df = load_frames(
+            self.contacts_path, self.tasks_path, self.notes_path, self.cache_dir
+        )
+        self._select_shard()
+        self._normalize_frames()
 
-    def map_to_objects(self):
-        for _, row in self.tasks_df.iterrows():
-            email = row['Email']
-            if email not in self.contacts_dict:
-                match = self.contacts_df[self.contacts_df['Email'] == email]
-                if not match.empty:
-                    row_data = match.iloc[0]
-                    additional_phones = [
-                        value for key, value in row_data.items()
-                        if "phone" in key.lower() and key.lower() != "mobile phone" and pd.notnull(value)
-                    ]
-                    address = {
-                        "street": row_data.get("Mailing Street"),
-                        "city": row_data.get("Mailing City"),
-                        "state": row_data.get("Mailing State"),
-                        "postalCode": row_data.get("Mailing Zip"),
-                        "country": row_data.get("Mailing Country")
-                    }
-                    self.contacts_dict[email] = Contact(
-                        email=email,
-                        source_id=row_data.get('Record Id'),
-                        first_name=row_data.get("First Name"),
-                        last_name=row_data.get("Last Name"),
-                        business_name=row_data.get("Company"),
-                        phone=row_data.get("Mobile Phone"),
-                        additional_phones=additional_phones,
-                        address=address
-                    )
-
-            task = Task(
-                subject=row['Subject'],
-                due_date=self._validate_date(row['Due Date']),
-                description=row.get('Description'),
-                status=row.get('Status'),
-                priority=row.get('Priority'),
-                completed=str(row.get('Status')).strip().lower() == "completed"
-            )
-            task.owner = row.get("Task Owner")
-            self.contacts_dict[email].add_task(task)
-
-        for _, row in self.notes_df.iterrows():
-            email = row['Email']
-            if email not in self.contacts_dict:
-                match = self.contacts_df[self.contacts_df['Email'] == email]
-                if not match.empty:
-                    row_data = match.iloc[0]
-                    additional_phones = [
-                        value for key, value in row_data.items()
-                        if "phone" in key.lower() and key.lower() != "mobile phone" and pd.notnull(value)
-                    ]
-                    address = {
-                        "street": row_data.get("Mailing Street"),
-                        "city": row_data.get("Mailing City"),
-                        "state": row_data.get("Mailing State"),
-                        "postalCode": row_data.get("Mailing Zip"),
-                        "country": row_data.get("Mailing Country")
-                    }
-                    self.contacts_dict[email] = Contact(
-                        email=email,
-                        source_id=row_data.get('Record Id'),
-                        first_name=row_data.get("First Name"),
-                        last_name=row_data.get("Last Name"),
-                        business_name=row_data.get("Company"),
-                        phone=row_data.get("Mobile Phone"),
-                        additional_phones=additional_phones,
-                        address=address
-                    )
-
-            note = Note(
-                title=row.get('Note Title'),
-                content=row['Note Content'],
-                created_time=row.get('Created Time')
+    def _select_shard(self):
+        # Tasks and notes follow their contact row, so a contact's records
+        # never end up in another process
+        if self.shard is not None:
+            index, count = self.shard
+            emails = self.contacts_df['Email'].tolist()
+            keep = pd.Series([shard_of(email, count) == index for email in emails], index=self.contacts_df.index)
+        elif self.location_column:
+            locations = self.contacts_df[self.location_column]
+            keep = locations.notna() & (locations.astype(str).str.strip() == self.client.location_id)
+        else:
+            return
+        self.contacts_df = self.contacts_df[keep]
+        contact_ids = self.contacts_df['Record Id']
+        self.tasks_df = self._rows_of(self.tasks_df, contact_ids)
+        self.notes_df = self._rows_of(self.notes_df, contact_ids)
+
+    def _rows_of(self, df, contact_ids):
+        # The merged-in contact Record Id is 'Record Id_y' when the task/note
+        # export has a Record Id of its own
+        column = 'Record Id_y' if 'Record Id_y' in df.columns else 'Record Id'
+        return df[df[column].isin(contact_ids)]
+
+    def _normalize_frames(self):
+        # Dates, statuses and owners are parsed once per column here (after
+        # the cache, so format and timezone settings always apply); mapping
+        # then only copies values
+        tasks, notes = self.tasks_df, self.notes_df
+        if 'Due Date' in tasks.columns:
+            tasks['Due Date'] = self._normalize_dates(tasks, "tasks", 'Due Date', 'Contact Name.id')
+        if 'Status' in tasks.columns:
+            tasks['Status'] = normalize_text(tasks['Status'])
+            tasks['_completed'] = completed_flags(tasks['Status'])
+        else:
+            tasks['_completed'] = False
+        if 'Task Owner' in tasks.columns:
+            tasks['Task Owner'] = normalize_text(tasks['Task Owner'])
+        if 'Created Time' in notes.columns:
+            notes['Created Time'] = self._normalize_dates(notes, "notes", 'Created Time', 'Parent ID.id')
+        if 'Note Owner' in notes.columns:
+            notes['Note Owner'] = normalize_text(notes['Note Owner'])
+
+    def _normalize_dates(self, df, file, column, parent_column):
+        values, rejected = normalize_datetimes(df[column], self.date_formats, self.timezone)
+        if rejected.any():
+            bad = df[rejected]
+            self.rejections.extend(
+                {"File": file, "Parent Id": parent, "Column": column, "Value": value}
+                for parent, value in zip(self._column(bad, parent_column), bad[column].tolist())
             )
-            note.owner = row.get("Note Owner")
-            self.contacts_dict[email].add_note(note)
+            logging.warning(f"{int(rejected.sum())} {column} values in {file} could not be parsed")
+        return values
+
+    def _row_date(self, row, file, column, parent_column):
+        value, rejected = normalize_datetime(row.get(column), self.date_formats, self.timezone)
+        if rejected:
+            self.rejections.append({"File": file, "Parent Id": row.get(parent_column), "Column": column,
+                                    "Value": row.get(column)})
+        return value
+
+    def _column(self, df, name):
+        # Missing optional columns behave like row.get() did: every value is None
+        if name in df.columns:
+            return df[name].tolist()
+        return [None] * len(df)
+
+    def _text_column(self, df, name):
+        # Blank cells come back as NaN, which the JSON encoder rejects; the
+        # streaming readers already give None for them
+        if name in df.columns:
+            return df[name].astype(object).where(df[name].notna(), None).tolist()
+        return [None] * len(df)
+
+    def _open_fingerprints(self):
+        # Dry runs only read a store left by an earlier live run
+        if self.dry_run and not os.path.exists(self.fingerprints_path):
+            return None
+        return FingerprintStore(self.fingerprints_path)
+
+    def _apply_delta(self):
+        """Drop task and note rows whose fingerprint matches the previous run.
+
+        Runs on the normalized frames, so a reformatted date alone is not an
+        edit. Records are matched by their own Record Id when the export has
+        one; otherwise the fingerprint is the identity and an edited record
+        is sent as a new one.
+        """
+        contacts = self.contacts_df.drop_duplicates(subset=['Email'], keep='first')
+        ids = record_ids(contacts, 'Record Id')
+        fingerprints = row_fingerprints(contacts, contacts.columns)
+        status, ghl_ids = classify(ids, fingerprints, self.fingerprints.frame("contact"))
+        self._delta_contacts = dict(zip(
+            contacts['Email'].tolist(), zip(ids.tolist(), fingerprints.tolist(), status.tolist(), ghl_ids.tolist())
+        ))
+        self._log_delta("contacts", status)
+        # After the merge a task/note export's own Record Id is 'Record Id_x'
+        self.tasks_df = self._delta_frame(self.tasks_df, "task", TASK_COLUMNS, TASK_SIGNATURE)
+        self.notes_df = self._delta_frame(self.notes_df, "note", NOTE_COLUMNS, NOTE_SIGNATURE)
+
+    def _delta_frame(self, df, kind, columns, signature):
+        # Checkpoint keys number identical records of a contact; count them
+        # in the full export so dropping unchanged rows does not renumber them
+        group = df.reindex(columns=['Email', *signature]).astype(object)
+        if kind == "note":
+            group['Note Title'] = group['Note Title'].where(group['Note Title'].notna(), "Note")
+        occurrences = group.groupby(list(group.columns), dropna=False, sort=False).cumcount()
+        fingerprints = row_fingerprints(df, columns)
+        ids = record_ids(df, 'Record Id_x') if 'Record Id_x' in df.columns else fingerprints
+        status, ghl_ids = classify(ids, fingerprints, self.fingerprints.frame(kind))
+        self._log_delta(f"{kind}s", status)
+        keep = (status != UNCHANGED).to_numpy()
+        df = df[keep].copy()
+        df['_record_id'] = ids[keep]
+        df['_fingerprint'] = fingerprints[keep]
+        df['_ghl_id'] = ghl_ids[keep]
+        df['_occurrence'] = occurrences[keep]
+        return df
+
+    def _log_delta(self, name, status):
+        counts = status.value_counts()
+        for state, count in counts.items():
+            self.metrics.count(f"{name}_{state}", int(count))
+        logging.info(
+            f"Delta: {counts.get('new', 0)} new, {counts.get(CHANGED, 0)} changed and "
+            f"{counts.get(UNCHANGED, 0)} unchanged {name}"
+        )
+
+    def _record_fingerprint(self, kind, record_id, fingerprint, ghl_id):
+        if self.fingerprints is not None and not self.dry_run and record_id is not None and fingerprint is not None:
+            self.fingerprints.record(kind, record_id, fingerprint, ghl_id)
+
+    def _build_contact_index(self):
+        # One pass over the contacts file: first row per email wins, as the
+        # old per-email lookup used match.iloc[0]
+        contacts = self.contacts_df.drop_duplicates(subset=['Email'], keep='first')
+
+        phone_cols = [
+            col for col in contacts.columns
+            # Numeric header cells stay numbers in pandas
+            if isinstance(col, str) and "phone" in col.lower() and col.lower() != "mobile phone"
+        ]
+        phone_values = contacts[phone_cols].to_numpy(dtype=object)
+        # dtype=bool: with no extra phone columns the empty mask is float
+        phone_mask = contacts[phone_cols].notna().to_numpy(dtype=bool)
+        additional_phones = [list(values[mask]) for values, mask in zip(phone_values, phone_mask)]
+
+        columns = zip(
+            contacts['Email'].tolist(),
+            self._column(contacts, 'Record Id'),
+            self._column(contacts, 'First Name'),
+            self._column(contacts, 'Last Name'),
+            self._column(contacts, 'Company'),
+            self._column(contacts, 'Mobile Phone'),
+            additional_phones,
+            self._column(contacts, 'Mailing Street'),
+            self._column(contacts, 'Mailing City'),
+            self._column(contacts, 'Mailing State'),
+            self._column(contacts, 'Mailing Zip'),
+            self._column(contacts, 'Mailing Country'),
+        )
+        index = {}
+        for email, source_id, first, last, company, phone, phones, street, city, state, zip_code, country in columns:
+            index[email] = {
+                "email": email,
+                "source_id": source_id,
+                "first_name": first,
+                "last_name": last,
+                "business_name": company,
+                "phone": phone,
+                "additional_phones": phones,
+                "address": {
+                    "street": street,
+                    "city": city,
+                    "state": state,
+                    "postalCode": zip_code,
+                    "country": country
+                }
+            }
+        return index
+
+    def _get_or_create_contact(self, email, contact_index):
+        contact = self.contacts_dict.get(email)
+        if contact is None:
+            fields = contact_index.get(email)
+            if fields is None:
+                return None
+            contact = Contact(**fields)
+            self.contacts_dict[email] = contact
+        return contact
+
+    def _contact_from_row(self, row):
+        # Row-wise twin of _build_contact_index for the streaming reader
+        return Contact(
+            email=row.get('Email'),
+            source_id=row.get('Record Id'),
+            first_name=row.get("First Name"),
+            last_name=row.get("Last Name"),
+            business_name=row.get("Company"),
+            phone=row.get("Mobile Phone"),
+            additional_phones=[
+                value for key, value in row.items()
+                if isinstance(key, str) and "phone" in key.lower() and key.lower() != "mobile phone"
+                and pd.notnull(value)
+            ],
+            address={
+                "street": row.get("Mailing Street"),
+                "city": row.get("Mailing City"),
+                "state": row.get("Mailing State"),
+                "postalCode": row.get("Mailing Zip"),
+                "country": row.get("Mailing Country")
+            }
+        )
+
+    def _task_from_row(self, row):
+        # Row-wise twin of _normalize_frames + _build_tasks
+        status = clean_text(row.get('Status'))
+        return Task(
+            subject=row.get('Subject'),
+            due_date=self._row_date(row, "tasks", 'Due Date', 'Contact Name.id'),
+            description=row.get('Description'),
+            status=status,
+            priority=row.get('Priority'),
+            completed=is_completed(status),
+            owner=clean_text(row.get('Task Owner'))
+        )
+
+    def _note_from_row(self, row):
+        return Note(
+            title=row.get('Note Title'),
+            content=row.get('Note Content'),
+            created_time=self._row_date(row, "notes", 'Created Time', 'Parent ID.id'),
+            owner=clean_text(row.get('Note Owner'))
+        )
+
+    def _build_tasks(self):
+        tasks = []
+        columns = [
+            self._text_column(self.tasks_df, 'Subject'),
+            self._column(self.tasks_df, 'Due Date'),
+            self._text_column(self.tasks_df, 'Description'),
+            self._column(self.tasks_df, 'Status'),
+            self._text_column(self.tasks_df, 'Priority'),
+            self._column(self.tasks_df, '_completed'),
+            self._column(self.tasks_df, 'Task Owner'),
+        ]
+        # Only a --delta run carries the metadata columns; other runs build
+        # the smaller plain records
+        cls = Task
+        if '_fingerprint' in self.tasks_df.columns:
+            cls = DeltaTask
+            columns += [self._column(self.tasks_df, name) for name in DELTA_COLUMNS]
+        for fields in zip(*columns):
+            tasks.append(cls(*fields))
+        return tasks
+
+    def _build_notes(self):
+        notes = []
+        columns = [
+            self._text_column(self.notes_df, 'Note Content'),
+            self._column(self.notes_df, 'Note Title'),
+            self._column(self.notes_df, 'Created Time'),
+            self._column(self.notes_df, 'Note Owner'),
+        ]
+        cls = Note
+        if '_fingerprint' in self.notes_df.columns:
+            cls = DeltaNote
+            columns += [self._column(self.notes_df, name) for name in DELTA_COLUMNS]
+        for fields in zip(*columns):
+            notes.append(cls(*fields))
+        return notes
+
+    def _attach(self, df, records, add, contact_index):
+        # Visit emails in order of first appearance with row positions in file
+        # order, so contacts_dict matches what a row-by-row walk would build
+        groups = df.groupby('Email', sort=False).indices
+        for email, positions in sorted(groups.items(), key=lambda item: item[1][0]):
+            contact = self._get_or_create_contact(email, contact_index)
+            if contact is None:
+                continue
+            for position in positions:
+                add(contact, records[position])
+
+    def map_to_objects(self):
+        contact_index = self._build_contact_index()
+        self._attach(self.tasks_df, self._build_tasks(), Contact.add_task, contact_index)
+        self._attach(self.notes_df, self._build_notes(), Contact.add_note, contact_index)
+        # Edited contacts are updated even when none of their records changed
+        for email, (_, _, status, ghl_id) in self._delta_contacts.items():
+            if status == CHANGED and ghl_id:
+                self._get_or_create_contact(email, contact_index)
+
+    def _checkpoint(self, key, kind, email, status, ghl_id=None, error=None):
+        if self.checkpoint is not None:
+            self.checkpoint.record(key, kind, email, status, ghl_id=ghl_id, error=error)
+
+    def _response_id(self, response, kind):
+        # Live responses wrap the record ({"task": {...}}); tolerate bare ones
+        if not isinstance(response, dict):
+            return None
+        return response.get("id") or (response.get(kind) or {}).get("id")
+
+    def _record_keys(self, contact):
+        # Identical records of one contact are told apart by occurrence number
+        seen = {}
+
+        def keys(kind, signatures):
+            result = []
+            for signature, occurrence in signatures:
+                if occurrence is None:
+                    occurrence = seen.get((kind, signature), 0)
+                    seen[(kind, signature)] = occurrence + 1
+                result.append(idempotency_key(kind, contact.email, *signature, occurrence=occurrence))
+            return result
+
+        # Delta runs carry each record's occurrence in the full export
+        task_keys = keys("task", [(self._signature(task), task.occurrence) for task in contact.tasks])
+        note_keys = keys("note", [(self._signature(note), note.occurrence) for note in contact.notes])
+        return task_keys, note_keys
+
+    def _signature(self, record):
+        # Fields that identify a task or note within its contact. Blank cells
+        # arrive as NaN/NaT from pandas and as None from the row readers; the
+        # idempotency keys hash them all as None so every mode agrees
+        if isinstance(record, Task):
+            fields = (record.subject, record.due_date, record.description)
+        else:
+            fields = (record.title, record.content, record.created_time)
+        return tuple(None if is_missing(value) else value for value in fields)
+
+    def _existing_id(self, contact, kind, signature):
+        if self.existing is None:
+            return None
+        return self.existing.claim(contact.gohighlevel_id, kind, signature)
+
+    def _import_task(self, contact, task, key=None):
+        try:
+            existing_id = None
+            if not task.gohighlevel_id:
+                existing_id = self._existing_id(contact, "tasks", task_signature(task.subject, task.due_date))
+            if existing_id:
+                ghl_id = existing_id
+                self.metrics.count("tasks_existing")
+                record_event("task_exists", "Task already in GoHighLevel for %s: %s", contact.email, existing_id,
+                             email=contact.email, id=existing_id)
+            else:
+                assigned_to = self.client.resolve_user_id(task.owner) if task.owner else None
+                if task.gohighlevel_id:
+                    self.client.update_task(contact.gohighlevel_id, task.gohighlevel_id, task, completed=task.completed,
+                                            assigned_to=assigned_to)
+                    ghl_id = task.gohighlevel_id
+                    self.metrics.count("tasks_updated")
+                else:
+                    response = self.client.create_task(contact.gohighlevel_id, task, completed=getattr(task, 'completed', False), assigned_to=assigned_to)
+                    ghl_id = self._response_id(response, "task")
+                    self.metrics.count("tasks_created")
+            self._checkpoint(key, "task", contact.email, SUCCESS, ghl_id=ghl_id)
+            self._record_fingerprint("task", task.source_id, task.fingerprint, ghl_id)
+        except Exception as e:
+            self.metrics.count("tasks_failed")
+            logging.error("Failed to create task for %s: %s", contact.email, e)
+            self.log_failure(contact.email, "Task", e, task.to_dict(), contact_id=contact.gohighlevel_id, key=key)
+            self._checkpoint(key, "task", contact.email, FAILED, error=str(e))
+
+    def _import_note(self, contact, note, key=None):
+        try:
+            existing_id = None
+            if not note.gohighlevel_id:
+                existing_id = self._existing_id(contact, "notes", note_signature(note.content))
+            if existing_id:
+                ghl_id = existing_id
+                self.metrics.count("notes_existing")
+                record_event("note_exists", "Note already in GoHighLevel for %s: %s", contact.email, existing_id,
+                             email=contact.email, id=existing_id)
+            else:
+                assigned_to = self.client.resolve_user_id(note.owner) if note.owner else None
+                if note.gohighlevel_id:
+                    self.client.update_note(contact.gohighlevel_id, note.gohighlevel_id, note, assigned_to=assigned_to)
+                    ghl_id = note.gohighlevel_id
+                    self.metrics.count("notes_updated")
+                else:
+                    response = self.client.create_note(contact.gohighlevel_id, note, assigned_to=assigned_to)
+                    ghl_id = self._response_id(response, "note")
+                    self.metrics.count("notes_created")
+            self._checkpoint(key, "note", contact.email, SUCCESS, ghl_id=ghl_id)
+            self._record_fingerprint("note", note.source_id, note.fingerprint, ghl_id)
+        except Exception as e:
+            self.metrics.count("notes_failed")
+            logging.error("Failed to create note for %s: %s", contact.email, e)
+            self.log_failure(contact.email, "Note", e, note.to_dict(), contact_id=contact.gohighlevel_id, key=key)
+            self._checkpoint(key, "note", contact.email, FAILED, error=str(e))
+
+    def _contact_failed(self, contact, action, error):
+        self.metrics.count("contacts_failed")
+        logging.error("Failed to %s contact for %s: %s", action, contact.email, error)
+        self.log_failure(contact.email, "Contact", error, contact.to_dict(), key=contact_key(contact.email))
+        self._checkpoint(contact_key(contact.email), "contact", contact.email, FAILED, error=str(error))
 
-    def _validate_date(self, date_value):
+    def _resolve_contact(self, contact):
+        # A failed search or create fails this contact only, in every mode
         try:
-            if pd.isnull(date_value):
+            gh_contact = self.client.find_contact_by_email(contact.email)
+        except GoHighLevelError as e:
+            self._contact_failed(contact, "search for", e)
+            return None
+        if not gh_contact:
+            self.unmatched_contacts.append(contact.email)
+            try:
+                gh_contact = self.client.create_contact(contact)
+                self.metrics.count("contacts_created")
+                if self.existing is not None:
+                    self.existing.seed(gh_contact.get("id"))
+                record_event("contact_created", "Created new GoHighLevel contact for %s", contact.email,
+                             email=contact.email, id=gh_contact.get("id"))
+            except Exception as e:
+                self._contact_failed(contact, "create", e)
                 return None
-            if isinstance(date_value, str):
-                return pd.to_datetime(date_value).isoformat()
-            return date_value.isoformat()
+        else:
+            self.metrics.count("contacts_found")
+            record_event("contact_found", "Found existing GoHighLevel contact for %s", contact.email,
+                         email=contact.email, id=gh_contact.get("id"))
+        self._checkpoint(contact_key(contact.email), "contact", contact.email, SUCCESS, ghl_id=gh_contact['id'])
+        return gh_contact['id']
+
+    def _sync_contact(self, contact, ghl_id, status):
+        # A contact sent by an earlier delta run needs no search: it is
+        # reused as-is, or updated in place when its row changed
+        if status == UNCHANGED:
+            self.metrics.count("contacts_reused")
+            return ghl_id
+        try:
+            self.client.update_contact(ghl_id, contact)
+            self.metrics.count("contacts_updated")
         except Exception as e:
-            logging.warning(f"Invalid date format: {date_value} — {e}")
+            self._contact_failed(contact, "update", e)
             return None
+        self._checkpoint(contact_key(contact.email), "contact", contact.email, SUCCESS, ghl_id=ghl_id)
+        return ghl_id
 
-    def run(self):
-        logging.info("Loading data from Excel files...")
-        self.load_data()
-        logging.info("Mapping tasks and notes to contact objects...")
-        self.map_to_objects()
+    def import_contact(self, contact, record_pool=None):
+        """Resolve one contact, then create its tasks and notes.
+
+        Tasks and notes only start once the contact has a GoHighLevel ID. When
+        a record_pool executor is given they are fanned out on it and this call
+        waits for all of them before marking the contact as imported. Records
+        the checkpoint store already lists as successful are skipped.
+        Returns True if the contact was processed.
+        """
+        try:
+            return self._import_contact(contact, record_pool)
+        finally:
+            self.metrics.count("contacts_done")
+
+    def _import_contact(self, contact, record_pool):
+        if contact.email in self.already_imported:
+            record_event("contact_skipped", "Skipping already imported contact: %s", contact.email, email=contact.email)
+            return False
+
+        done = self.checkpoint.lookup(contact.email) if self.checkpoint is not None else {}
+        status, ghl_id = done.get(contact_key(contact.email), (None, None))
+        record_id, fingerprint, delta_status, previous_id = self._delta_contacts.get(contact.email, (None,) * 4)
+        if previous_id:
+            contact.gohighlevel_id = self._sync_contact(contact, previous_id, delta_status)
+        elif status == SUCCESS and ghl_id:
+            self.metrics.count("contacts_resumed")
+            contact.gohighlevel_id = ghl_id
+        else:
+            contact.gohighlevel_id = self._resolve_contact(contact)
+        if contact.gohighlevel_id and delta_status != UNCHANGED:
+            self._record_fingerprint("contact", record_id, fingerprint, contact.gohighlevel_id)
+
+        task_keys, note_keys = self._record_keys(contact)
+        if contact.gohighlevel_id is None:
+            # List the records that were never sent so a replay can finish the contact
+            for task, key in zip(contact.tasks, task_keys):
+                self.log_failure(contact.email, "Task", "contact was not created", task.to_dict(), key=key)
+            for note, key in zip(contact.notes, note_keys):
+                self.log_failure(contact.email, "Note", "contact was not created", note.to_dict(), key=key)
+            return False
+
+        # Updates are sent even if the new content was checkpointed before
+        tasks = [(task, key) for task, key in zip(contact.tasks, task_keys)
+                 if task.gohighlevel_id or done.get(key, (None,))[0] != SUCCESS]
+        notes = [(note, key) for note, key in zip(contact.notes, note_keys)
+                 if note.gohighlevel_id or done.get(key, (None,))[0] != SUCCESS]
+        if self.fingerprints is not None:
+            # Records a crashed run sent but never fingerprinted
+            for kind, records, keys in (("task", contact.tasks, task_keys), ("note", contact.notes, note_keys)):
+                for record, key in zip(records, keys):
+                    record_status, record_id = done.get(key, (None, None))
+                    if record_status == SUCCESS and not record.gohighlevel_id:
+                        self._record_fingerprint(kind, record.source_id, record.fingerprint, record_id)
+        skipped = len(contact.tasks) + len(contact.notes) - len(tasks) - len(notes)
+        if skipped:
+            self.metrics.count("records_resumed", skipped)
+            record_event("records_resumed", "Skipping %d already imported tasks/notes for %s", skipped, contact.email,
+                         email=contact.email, count=skipped)
+
+        if record_pool is None:
+            for task, key in tasks:
+                self._import_task(contact, task, key)
+            for note, key in notes:
+                self._import_note(contact, note, key)
+        else:
+            futures = [record_pool.submit(self._import_task, contact, task, key) for task, key in tasks]
+            futures += [record_pool.submit(self._import_note, contact, note, key) for note, key in notes]
+            wait(futures)
+
+        if self.checkpoint is None:
+            with self._import_log_lock:
+                with open(self.import_log_path, "a") as f:
+                    f.write(contact.email + "\n")
+
+        return True
+
+    def _run_sequential(self, contacts):
+        processed_count = 0
+        for batch in self.chunked_iterable(contacts, self.batch_size):
+            for contact in batch:
+                if self.import_contact(contact):
+                    processed_count += 1
+
+            if self.batch_delay:
+                logging.info(f"Waiting {self.batch_delay} seconds before next batch...")
+                time.sleep(self.batch_delay)
+        return processed_count
 
+    def _run_concurrent(self, contacts):
+        # Contacts run on one pool and their tasks/notes on another, so a
+        # contact worker waiting on its children never starves them of threads.
+        # Instead of sleeping between batches, submission blocks once
+        # 2 x workers contacts are queued or in flight.
         processed_count = 0
+        max_pending = self.workers * 2
+        pending = set()
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="contact") as contact_pool, \
+                ThreadPoolExecutor(self.workers, thread_name_prefix="record") as record_pool:
+            for contact in contacts:
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    processed_count += sum(1 for future in done if future.result())
+                pending.add(contact_pool.submit(self.import_contact, contact, record_pool))
+            done, _ = wait(pending)
+            processed_count += sum(1 for future in done if future.result())
+        return processed_count
 
-        # Load already-imported emails if log exists
-        if os.path.exists(self.import_log_path):
+    def _run_dry(self, contacts):
+        planner = DryRunPlanner(
+            self.client, concurrency=self.concurrency, latency=self.projected_latency,
+            prefetch_contacts=self.prefetch_contacts, batch_size=self.batch_size, batch_delay=self.batch_delay
+        )
+        processed_count = 0
+        for contact in contacts:
+            if contact.email in self.already_imported:
+                continue
+            for record_type, error, record, request in planner.check_contact(contact):
+                self.log_failure(contact.email, record_type, error, record.to_dict(), request=request)
+            processed_count += 1
+            self.metrics.count("contacts_done")
+
+        report = planner.report()
+        with open(self.dry_run_report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        counts = report["counts"]
+        projection = report["projection"]
+        logging.info(
+            f"[DRY RUN] {counts.get('contacts', 0)} contacts, {counts.get('tasks', 0)} tasks and "
+            f"{counts.get('notes', 0)} notes ready; "
+            f"{sum(v for k, v in counts.items() if k.endswith('_invalid'))} invalid records"
+        )
+        logging.info(
+            f"[DRY RUN] A live run would send {projection['requests_min']}-{projection['requests_max']} requests "
+            f"and take about {projection['seconds_min'] / 60:.1f}-{projection['seconds_max'] / 60:.1f} minutes "
+            f"at concurrency {self.concurrency}; report written to {self.dry_run_report_path}"
+        )
+        if projection["exceeds_daily_limit"]:
+            logging.warning("[DRY RUN] The projected request count exceeds GoHighLevel's daily limit per location")
+        return processed_count
+
+    def _streaming_source(self):
+        return StreamingSource(
+            self.contacts_path, self.tasks_path, self.notes_path,
+            make_contact=self._contact_from_row,
+            make_task=self._task_from_row,
+            make_note=self._note_from_row,
+            batch_size=self.stream_batch_size
+        )
+
+    def _run_pipeline(self):
+        logging.info(f"Pipelining reads, contact lookups and writes with {self.workers} workers per stage")
+        return ImportPipeline(self, queue_size=self.pipeline_queue_size).run()
+
+    def run(self):
+        source = None
+        if self.pipeline:
+            # Rows are read inside the pipeline while uploads are under way
+            all_contacts, total = (), None
+        elif self.stream:
+            logging.info("Streaming contacts, tasks and notes from the export files...")
+            source = self._streaming_source()
+            with self.metrics.phase("load"):
+                source.prepare()
+            all_contacts = source.contacts()
+            total = source.contact_count()
+        else:
+            logging.info("Loading data from export files...")
+            with self.metrics.phase("load"):
+                self.load_data()
+                if self.delta:
+                    self.fingerprints = self._open_fingerprints()
+                    if self.fingerprints is not None:
+                        self._apply_delta()
+            logging.info("Mapping tasks and notes to contact objects...")
+            with self.metrics.phase("map"):
+                self.map_to_objects()
+            all_contacts = self.contacts_dict.values()
+            total = len(self.contacts_dict)
+
+        # Load already-imported emails if log exists; a delta run decides
+        # per record instead
+        if os.path.exists(self.import_log_path) and not self.delta:
             with open(self.import_log_path, "r") as f:
                 self.already_imported = set(line.strip() for line in f if line.strip())
 
         # Apply contact limit if set
-        all_contacts = list(self.contacts_dict.values())
-        if self.limit:
-            all_contacts = all_contacts[:self.limit]
+        if self.limit and not self.pipeline:
+            all_contacts = islice(all_contacts, self.limit)
+            total = min(total, self.limit)
             logging.info(f"Limiting import to first {self.limit} contacts.")
 
-        for batch in self.chunked_iterable(all_contacts, self.batch_size):
-            for contact in batch:
-                if contact.email in self.already_imported:
-                    logging.info(f"Skipping already imported contact: {contact.email}")
-                    continue
-
-                gh_contact = self.client.find_contact_by_email(contact.email)
-                if not gh_contact:
-                    self.unmatched_contacts.append(contact.email)
-                    try:
-                        gh_contact = self.client.create_contact(contact)
-                        logging.info(f"Created new GoHighLevel contact for {contact.email}")
-                    except Exception as e:
-                        logging.error(f"Failed to create contact for {contact.email}: {e}")
-                        self.log_failure(contact.email, "Contact", e, contact.__dict__)
-                        continue
-                else:
-                    logging.info(f"Found existing GoHighLevel contact for {contact.email}")
-
-                contact.gohighlevel_id = gh_contact['id']
-
-                for task in contact.tasks:
-                    try:
-                        task_owner_name = task.status  # fallback if Task Owner is not passed (adjust if needed)
-                        if hasattr(task, 'owner'):
-                            task_owner_name = task.owner
-                        assigned_to = self.client.resolve_user_id(task_owner_name) if task_owner_name else None
-                        self.client.create_task(contact.gohighlevel_id, task, completed=getattr(task, 'completed', False), assigned_to=assigned_to)
-                    except Exception as e:
-                        logging.error(f"Failed to create task for {contact.email}: {e}")
-                        self.log_failure(contact.email, "Task", e, task.__dict__)
-
-                for note in contact.notes:
-                    try:
-                        note_owner_name = note.title  # fallback if Note Owner is not passed (adjust if needed)
-                        if hasattr(note, 'owner'):
-                            note_owner_name = note.owner
-                        assigned_to = self.client.resolve_user_id(note_owner_name) if note_owner_name else None
-                        self.client.create_note(contact.gohighlevel_id, note, assigned_to=assigned_to)
-                    except Exception as e:
-                        logging.error(f"Failed to create note for {contact.email}: {e}")
-                        self.log_failure(contact.email, "Note", e, note.__dict__)
-
-                with open(self.import_log_path, "a") as f:
-                    f.write(contact.email + "\n")
+        if self.checkpoint_path and not self.dry_run:
+            self.checkpoint = CheckpointStore(self.checkpoint_path)
+            logging.info(f"Recording progress in {self.checkpoint_path}")
 
-                processed_count += 1
+        self.metrics.contacts_total = total
+        progress = (ProgressReporter(self.metrics, self.progress_interval, interactive=self.progress_interactive).start()
+                    if self.progress_interval else None)
+        try:
+            if self.prefetch_contacts and not self.dry_run:
+                logging.info("Prefetching existing GoHighLevel contacts...")
+                with self.metrics.phase("prefetch"):
+                    self.client.prefetch_contacts()
 
-            logging.info(f"Waiting {self.batch_delay} seconds before next batch...")
-            time.sleep(self.batch_delay)
+            if self.dry_run:
+                with self.metrics.phase("plan"):
+                    processed_count = self._run_dry(all_contacts)
+            else:
+                with self.metrics.phase("upload"):
+                    if self.pipeline:
+                        processed_count = self._run_pipeline()
+                    elif self.workers > 1:
+                        logging.info(f"Importing with concurrency {self.concurrency}"
+                                     + (f", rising to {self.workers} while the API keeps up" if self.workers > self.concurrency else ""))
+                        processed_count = self._run_concurrent(all_contacts)
+                    else:
+                        processed_count = self._run_sequential(all_contacts)
+        finally:
+            if progress is not None:
+                progress.stop()
+            self.client.close()
+            if source is not None:
+                source.close()
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+            if self.fingerprints is not None:
+                self.fingerprints.close()
 
         logging.info(f"Processed {processed_count} contacts.")
+        self._log_concurrency()
 
         if self.unmatched_contacts:
             unmatched_df = pd.DataFrame(self.unmatched_contacts, columns=["Unmatched Emails"])
-            unmatched_df.to_csv("unmatched_contacts.csv", index=False)
-            logging.info(f"Wrote {len(self.unmatched_contacts)} unmatched emails to unmatched_contacts.csv")
+            unmatched_df.to_csv(self.unmatched_log_path, index=False)
+            logging.info(f"Wrote {len(self.unmatched_contacts)} unmatched emails to {self.unmatched_log_path}")
+
+        if self.failed_imports:
+            self._write_failures()
+
+        if self.rejections:
+            pd.DataFrame(self.rejections).to_csv(self.rejected_log_path, index=False)
+            logging.warning(f"Wrote {len(self.rejections)} unparseable values to {self.rejected_log_path}")
+
+        if self.metrics_path:
+            self.metrics.write_json(self.metrics_path)
+        return processed_count
+
+    def _log_concurrency(self):
+        limiter = self.client.concurrency
+        if limiter.low_water != limiter.high_water:
+            logging.info(f"Concurrent requests ranged from {int(limiter.low_water)} to {int(limiter.high_water)}, "
+                         f"ending at {int(limiter.limit)}")
+
+    def _replay_contact(self, contact, failures, record_pool):
+        if contact.gohighlevel_id is None:
+            contact.gohighlevel_id = self._resolve_contact(contact)
+            if contact.gohighlevel_id is None:
+                for failure in failures:
+                    self.log_failure(contact.email, failure["Type"], "contact was not created",
+                                     failure["Payload"], key=failure.get("Key"))
+                return False
+
+        futures = []
+        for failure in failures:
+            key = failure.get("Key")
+            if key and self.checkpoint is not None and self.checkpoint.status(key)[0] == SUCCESS:
+                self.metrics.count("records_resumed")
+                continue
+            if failure["Type"] == "Task":
+                futures.append(record_pool.submit(self._import_task, contact, task_from_dict(failure["Payload"]), key))
+            else:
+                futures.append(record_pool.submit(self._import_note, contact, note_from_dict(failure["Payload"]), key))
+        wait(futures)
+        return True
+
+    def replay_failures(self, path):
+        """Re-submit only the records listed in a failure log.
+
+        The export files are not read: tasks and notes are rebuilt from their
+        logged payloads and sent to the logged contact ID. Contacts that
+        failed are resolved again first, then their records are sent.
+        Records still failing are written back to failed_log_path.
+        """
+        failures = load_failures(path)
+        # Records from other locations (a --shard-by location run) must not be
+        # created here; they stay in the log for replay_by_location
+        foreign = [f for f in failures if f.get("Location") not in (None, self.location_id)]
+        if foreign:
+            failures = [f for f in failures if f.get("Location") in (None, self.location_id)]
+            logging.warning(f"Leaving {len(foreign)} failed records for other locations in the failure log; "
+                            f"replay them with --shard-by location")
+        logging.info(f"Replaying {len(failures)} failed records from {path}")
+        contacts = {}
+        children = {}
+        for failure in failures:
+            email = failure["Email"]
+            if failure["Type"] == "Contact":
+                fields = dict(failure["Payload"])
+                fields.pop("gohighlevel_id", None)
+                contacts[email] = Contact(**fields)
+            else:
+                children.setdefault(email, []).append(failure)
+        for email, records in children.items():
+            if email not in contacts:
+                contact = contacts[email] = Contact(email)
+                contact.gohighlevel_id = next((r["ContactId"] for r in records if r.get("ContactId")), None)
+
+        self.failed_imports = []
+        self.client.max_attempts = self.replay_attempts
+        if self.checkpoint_path and not self.dry_run:
+            self.checkpoint = CheckpointStore(self.checkpoint_path)
+        self.metrics.contacts_total = len(contacts)
+        try:
+            with self.metrics.phase("replay"), \
+                    ThreadPoolExecutor(self.workers, thread_name_prefix="contact") as contact_pool, \
+                    ThreadPoolExecutor(self.workers, thread_name_prefix="record") as record_pool:
+                futures = [
+                    contact_pool.submit(self._replay_contact, contact, children.get(email, []), record_pool)
+                    for email, contact in contacts.items()
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            self.client.close()
+            if self.checkpoint is not None:
+                self.checkpoint.close()
 
+        logging.info(f"Replayed {len(failures)} records; {len(self.failed_imports)} still failing")
+        self._log_concurrency()
+        replayed = len(failures) - len(self.failed_imports)
+        self.failed_imports += foreign
         if self.failed_imports:
-            pd.DataFrame(self.failed_imports).to_csv(self.failed_log_path, index=False)
-            logging.warning(f"Wrote {len(self.failed_imports)} failed records to {self.failed_log_path}")
+            self._write_failures()
+        elif os.path.abspath(path) == os.path.abspath(self.failed_log_path):
+            os.remove(path)
+        if self.metrics_path:
+            self.metrics.write_json(self.metrics_path)
+        return replayed
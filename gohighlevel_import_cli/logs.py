@@ -0,0 +1,113 @@
+# gohighlevel_import_cli/logs.py
+
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+
+# Per-record events (contact found, task created, ...) go to this logger at
+# DEBUG, so at the default INFO level they cost one isEnabledFor() check
+RECORD_LOGGER = logging.getLogger("gohighlevel_import_cli.records")
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+
+def record_event(event, message, *args, **fields):
+    """Log one per-record event lazily; fields become JSON keys in json mode."""
+    if RECORD_LOGGER.isEnabledFor(logging.DEBUG):
+        RECORD_LOGGER.debug(message, *args, extra={"event": event, "fields": fields})
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and event fields."""
+
+    def __init__(self, shard=None):
+        super().__init__()
+        self.shard = shard
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if self.shard is not None:
+            entry["shard"] = self.shard
+        event = getattr(record, "event", None)
+        if event:
+            entry["event"] = event
+            entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SampleFilter(logging.Filter):
+    """Let through one record in every `every`."""
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = every
+        self._counter = itertools.count()
+
+    def filter(self, record):
+        return next(self._counter) % self.every == 0
+
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+
+    def prepare(self, record):
+        # The queue never leaves the process, so the message is formatted on
+        # the listener thread instead of the thread that logged it
+        return record
+
+
+def setup_logging(level="INFO", fmt="text", log_file="import_log.log", sample_every=0, shard=None):
+    """Route all logging through a queue drained by a background thread.
+
+    Callers only pay for creating a LogRecord and a queue put; formatting and
+    file/terminal writes happen on the listener thread. With sample_every=N,
+    one per-record event in N is logged even below DEBUG. Returns the
+    listener; it is stopped (and the queue flushed) at exit. Shard processes
+    pass their `shard` name, which is added to every line.
+    """
+    if fmt == "json":
+        formatter = JsonFormatter(shard)
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT.replace("] ", f"] [{shard}] ", 1) if shard else TEXT_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.insert(0, logging.FileHandler(log_file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_InProcessQueueHandler(log_queue))
+    root.setLevel(level)
+
+    for record_filter in list(RECORD_LOGGER.filters):
+        RECORD_LOGGER.removeFilter(record_filter)
+    if sample_every and sample_every > 1 and root.getEffectiveLevel() > logging.DEBUG:
+        RECORD_LOGGER.setLevel(logging.DEBUG)
+        RECORD_LOGGER.addFilter(SampleFilter(sample_every))
+    else:
+        RECORD_LOGGER.setLevel(logging.NOTSET)
+
+    listener.start()
+    atexit.register(_stop_listener, listener)
+    return listener
+
+
+def _stop_listener(listener):
+    # QueueListener.stop() fails if the listener was already stopped
+    if listener._thread is not None:
+        listener.stop()
@@ -3,46 +3,166 @@
 import argparse
 import logging
 import os
-from dotenv import load_dotenv
-from gohighlevel_import_cli.importer import Importer
-
-def setup_logger():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        handlers=[
-            logging.FileHandler("import_log.log", encoding="utf-8"),
-            logging.StreamHandler()
-        ]
-    )
+from functools import partial
+from gohighlevel_import_cli.env import load_env
+
+LOG_FILE = "import_log.log"
+
+def setup_logger(level="INFO", fmt="text", sample_every=0):
+    # Handlers run on a background thread fed by a queue
+    from gohighlevel_import_cli.logs import setup_logging
+    return setup_logging(level=level, fmt=fmt, log_file=LOG_FILE, sample_every=sample_every)
 
 
 def main():
-    setup_logger()
-    load_dotenv()  # Load environment variables from .env file
+    load_env()  # Load environment variables from .env file
 
     parser = argparse.ArgumentParser(description="Import tasks and notes from CRM into GoHighLevel.")
     parser.add_argument("--api-key", help="GoHighLevel API key")
     parser.add_argument("--location-id", help="GoHighLevel location ID")
-    parser.add_argument("--contacts", help="Path to Zoho Contacts Excel file")
-    parser.add_argument("--tasks", help="Path to Zoho Tasks Excel file")
-    parser.add_argument("--notes", help="Path to Zoho Notes Excel file")
+    parser.add_argument("--contacts", help="Path to Zoho Contacts export (.xlsx, .csv or .parquet)")
+    parser.add_argument("--tasks", help="Path to Zoho Tasks export (.xlsx, .csv or .parquet)")
+    parser.add_argument("--notes", help="Path to Zoho Notes export (.xlsx, .csv or .parquet)")
     parser.add_argument("--live", action="store_true", help="If set, send data to GoHighLevel")
     parser.add_argument("--limit", type=int, help="Limit the number of contacts to process")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("CONCURRENCY", 1)),
+                        help="Number of contacts (and of task/note requests) to process at once")
+    parser.add_argument("--max-concurrency", type=int, default=int(os.getenv("MAX_CONCURRENCY", 0)) or None,
+                        help="Let concurrency grow up to this many workers while the API stays fast and error-free")
+    parser.add_argument("--prefetch-contacts", action="store_true",
+                        help="Download all GoHighLevel contacts once and match emails locally instead of one search per contact")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read the exports row by row and upload in bounded batches instead of loading them into memory")
+    parser.add_argument("--stream-batch-size", type=int, default=500,
+                        help="Contacts held in memory at once in --stream mode")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Upload while the exports are still being read, with --concurrency workers per stage")
+    parser.add_argument("--pipeline-queue-size", type=int, default=1000,
+                        help="Records buffered between pipeline stages")
+    parser.add_argument("--projected-latency", type=float, default=0.25,
+                        help="Seconds per API call assumed when a dry run projects the live run's duration")
+    parser.add_argument("--cache-dir", default=os.getenv("PARSE_CACHE_DIR", ".import_cache"),
+                        help="Directory for parsed export frames reused across runs")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-parse the export files")
+    parser.add_argument("--checkpoint", default=os.getenv("CHECKPOINT_PATH", "import_checkpoint.sqlite"),
+                        help="SQLite file recording each imported contact, task and note (live runs only)")
+    parser.add_argument("--no-checkpoint", action="store_true",
+                        help="Fall back to imported_contacts.log for resume state")
+    parser.add_argument("--metrics-json", default=os.getenv("METRICS_PATH", "import_metrics.json"),
+                        help="Write request counts, latency histograms and phase timings here when the run ends")
+    parser.add_argument("--progress-interval", type=float, default=5.0,
+                        help="Seconds between progress/ETA lines (0 disables)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Run under cProfile, save the stats to PATH and log the hottest functions")
+
+    parser.add_argument("--date-format", action="append", dest="date_formats",
+                        default=[f for f in os.getenv("DATE_FORMATS", "").split(";") if f],
+                        help="strptime format for Due Date/Created Time, tried before ISO 8601 (repeatable)")
+    parser.add_argument("--timezone", default=os.getenv("SOURCE_TIMEZONE"),
+                        help="Timezone of naive export timestamps, e.g. America/New_York; they are sent as UTC")
+    parser.add_argument("--delta", action="store_true",
+                        help="Only send records that are new or changed since the last --delta run")
+    parser.add_argument("--fingerprints", default=os.getenv("FINGERPRINTS_PATH", "import_fingerprints.sqlite"),
+                        help="SQLite file with the record fingerprints --delta compares against")
+    parser.add_argument("--skip-existing", action="store_true",
+                        help="List each existing contact's tasks and notes once and do not re-create matching ones")
+    parser.add_argument("--shards", type=int, default=int(os.getenv("SHARDS", 0)) or None,
+                        help="Split the contacts by email hash into this many processes sharing one location's rate limit")
+    parser.add_argument("--shard-by", choices=["email", "location"],
+                        help="location runs one process per GoHighLevel location named in --location-column")
+    parser.add_argument("--location-column", default=os.getenv("LOCATION_COLUMN"),
+                        help="Contacts export column holding each contact's GoHighLevel location ID")
+    parser.add_argument("--processes", type=int,
+                        help="Shard processes run at once (default: up to the CPU count); --limit applies per shard")
+    parser.add_argument("--replay-failures", nargs="?", const="failed_imports.jsonl", metavar="PATH",
+                        help="Only re-send the records in a failure log (default failed_imports.jsonl); exports are not read")
+    parser.add_argument("--replay-attempts", type=int, default=5,
+                        help="Attempts per request when replaying failures")
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "INFO"),
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="DEBUG also logs every contact, task and note created")
+    parser.add_argument("--log-format", default=os.getenv("LOG_FORMAT", "text"), choices=["text", "json"],
+                        help="json writes one structured event per line")
+    parser.add_argument("--log-sample", type=int, default=int(os.getenv("LOG_SAMPLE", 0)),
+                        help="Below DEBUG, still log one in every N per-record events")
 
     args = parser.parse_args()
+    if args.delta and (args.stream or args.pipeline):
+        parser.error("--delta compares whole export frames and cannot be combined with --stream or --pipeline")
+    shard_by = args.shard_by or ("email" if args.shards else None)
+    if shard_by and (args.stream or args.pipeline):
+        parser.error("sharded runs split whole export frames and cannot be combined with --stream or --pipeline")
+    if shard_by == "email" and args.replay_failures:
+        parser.error("email shards share one location and checkpoint; replay their failure log without --shards")
+    if shard_by == "email" and not (args.shards and args.shards > 1):
+        parser.error("--shard-by email needs --shards 2 or more")
+    if shard_by == "location" and not args.location_column:
+        parser.error("--shard-by location needs --location-column")
+    setup_logger(args.log_level, args.log_format, args.log_sample)
 
-    importer = Importer(
+    options = dict(
         api_key=args.api_key or os.getenv("GHL_PRIVATE_INTEGRATION_TOKEN"),
         location_id=args.location_id or os.getenv("GHL_LOCATION_ID"),
         contacts_path=args.contacts or os.getenv("CONTACTS_PATH"),
         tasks_path=args.tasks or os.getenv("TASKS_PATH"),
         notes_path=args.notes or os.getenv("NOTES_PATH"),
         dry_run=not args.live,
-        limit=args.limit
+        limit=args.limit,
+        concurrency=args.concurrency,
+        prefetch_contacts=args.prefetch_contacts,
+        stream=args.stream,
+        stream_batch_size=args.stream_batch_size,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        checkpoint_path=None if args.no_checkpoint else args.checkpoint,
+        metrics_path=args.metrics_json or None,
+        progress_interval=args.progress_interval,
+        pipeline=args.pipeline,
+        pipeline_queue_size=args.pipeline_queue_size,
+        projected_latency=args.projected_latency,
+        replay_attempts=args.replay_attempts,
+        date_formats=args.date_formats,
+        timezone=args.timezone,
+        delta=args.delta,
+        fingerprints_path=args.fingerprints,
+        skip_existing=args.skip_existing,
+        max_concurrency=args.max_concurrency
     )
 
-    importer.run()
+    if shard_by == "location" and args.replay_failures:
+        from gohighlevel_import_cli.sharding import replay_by_location
+        run = partial(replay_by_location, options, args.replay_failures, args.location_column)
+    elif shard_by:
+        from gohighlevel_import_cli.sharding import run_sharded
+        log_options = dict(level=args.log_level, fmt=args.log_format, log_file=LOG_FILE, sample_every=args.log_sample)
+        run = partial(run_sharded, options, args.shards, shard_by, args.location_column, args.processes, log_options)
+    else:
+        # pandas, numpy and requests come in with the importer; --help and
+        # argument errors never get this far
+        from gohighlevel_import_cli.importer import Importer
+        importer = Importer(**options)
+        run = importer.run
+        if args.replay_failures:
+            run = partial(importer.replay_failures, args.replay_failures)
+
+    if args.profile:
+        run_profiled(run, args.profile)
+    else:
+        run()
+
+
+def run_profiled(run, path, top=25):
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run)
+    finally:
+        profiler.dump_stats(path)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(top)
+        logging.info(f"Profile saved to {path}; top {top} by cumulative time:\n{report.getvalue()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,265 @@
+# gohighlevel_import_cli/metrics.py
+
+import bisect
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open-ended
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+_ID_SEGMENT = re.compile(r"^/contacts/(?!search/?$)[^/]+")
+
+
+def endpoint_name(method, url):
+    # Collapse per-contact URLs so /contacts/abc/tasks and /contacts/xyz/tasks share a row
+    path = _ID_SEGMENT.sub("/contacts/{id}", urlsplit(url).path)
+    return f"{method} {path}"
+
+
+class LatencyHistogram:
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, pct):
+        # Upper bound of the bucket holding the pct-th sample
+        n = sum(self.counts)
+        if not n:
+            return 0.0
+        rank = pct / 100 * n
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.max
+        return self.max
+
+    def as_dict(self):
+        n = sum(self.counts)
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "mean_ms": round(self.total / n, 2) if n else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max, 2),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class EndpointStats:
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.statuses = {}
+        self.latency = LatencyHistogram()
+
+
+class StageStats:
+
+    def __init__(self, queue=None):
+        self.processed = 0
+        self.busy_s = 0.0
+        self.queue = queue
+        self.max_queue_depth = 0
+
+
+class RunMetrics:
+    """Counters, latency histograms and phase timings for one import run.
+
+    Shared by the client and importer threads; every update takes a single
+    lock and does a few integer additions, so it is cheap on the hot path.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+        self.stages = {}
+        self.phases = {}
+        self.records = {}
+        self.rate_limit_wait_s = 0.0
+        self.limiter_wait_s = 0.0
+        self.started_at = time.time()
+        self.contacts_total = None
+
+    def _endpoint(self, name):
+        stats = self.endpoints.get(name)
+        if stats is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    def record_request(self, endpoint, status, seconds, bytes_sent=0, bytes_received=0):
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.requests += 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.latency.add(seconds * 1000)
+            if status == 429:
+                stats.rate_limited += 1
+            elif status is None or status >= 400:
+                stats.errors += 1
+
+    def record_retry(self, endpoint):
+        with self._lock:
+            self._endpoint(endpoint).retries += 1
+
+    def record_rate_limit_wait(self, seconds):
+        with self._lock:
+            self.rate_limit_wait_s += seconds
+
+    def record_limiter_wait(self, seconds):
+        with self._lock:
+            self.limiter_wait_s += seconds
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.records[name] = self.records.get(name, 0) + n
+
+    def add_stage(self, name, queue=None):
+        # queue is the stage's input queue; its depth shows where work piles up
+        with self._lock:
+            self.stages[name] = StageStats(queue)
+
+    def record_stage(self, name, seconds, n=1):
+        with self._lock:
+            stats = self.stages[name]
+            stats.processed += n
+            stats.busy_s += seconds
+            if stats.queue is not None:
+                stats.max_queue_depth = max(stats.max_queue_depth, stats.queue.qsize())
+
+    def stage_line(self):
+        with self._lock:
+            parts = []
+            for name, stats in self.stages.items():
+                depth = f" [queue {stats.queue.qsize()}]" if stats.queue is not None else ""
+                parts.append(f"{name} {stats.processed}{depth}")
+        return " ".join(parts)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def summary(self):
+        with self._lock:
+            elapsed = time.time() - self.started_at
+            requests = sum(s.requests for s in self.endpoints.values())
+            return {
+                "elapsed_s": round(elapsed, 3),
+                "phases_s": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+                "records": dict(self.records),
+                "requests": requests,
+                "requests_per_s": round(requests / elapsed, 2) if elapsed else 0.0,
+                "stages": {
+                    name: {
+                        "processed": stats.processed,
+                        "per_s": round(stats.processed / elapsed, 2) if elapsed else 0.0,
+                        "busy_s": round(stats.busy_s, 3),
+                        "queue_depth": stats.queue.qsize() if stats.queue is not None else None,
+                        "max_queue_depth": stats.max_queue_depth,
+                    }
+                    for name, stats in self.stages.items()
+                },
+                "rate_limit_wait_s": round(self.rate_limit_wait_s, 3),
+                "limiter_wait_s": round(self.limiter_wait_s, 3),
+                "endpoints": {
+                    name: {
+                        "requests": s.requests,
+                        "errors": s.errors,
+                        "retries": s.retries,
+                        "rate_limited": s.rate_limited,
+                        "bytes_sent": s.bytes_sent,
+                        "bytes_received": s.bytes_received,
+                        "statuses": {str(k): v for k, v in s.statuses.items()},
+                        "latency": s.latency.as_dict(),
+                    }
+                    for name, s in sorted(self.endpoints.items())
+                },
+            }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        logging.info(f"Wrote run metrics to {path}")
+
+
+class ProgressReporter:
+    """Background thread that prints contacts done, throughput and ETA."""
+
+    def __init__(self, metrics, interval=5.0, stream=None, interactive=None):
+        self.metrics = metrics
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        # None: redraw one line in place when the stream is a terminal
+        self.interactive = interactive
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+
+    def line(self):
+        # Workers add counters while this thread reads them
+        with self.metrics._lock:
+            counts = dict(self.metrics.records)
+        done = counts.get("contacts_done", 0)
+        records = sum(v for k, v in counts.items() if k.endswith("_created"))
+        elapsed = max(time.perf_counter() - self._started, 1e-9)
+        rate = done / elapsed
+        total = self.metrics.contacts_total
+        text = f"contacts {done}" + (f"/{total}" if total else "")
+        text += f" | {records} records | {rate:.1f} contacts/s | {records / elapsed:.1f} records/s"
+        if total and rate > 0:
+            remaining = max(total - done, 0) / rate
+            text += f" | ETA {int(remaining // 3600):d}:{int(remaining % 3600 // 60):02d}:{int(remaining % 60):02d}"
+        if self.metrics.stages:
+            text += f" | {self.metrics.stage_line()}"
+        return text
+
+    def _run(self):
+        interactive = self.interactive
+        if interactive is None:
+            interactive = hasattr(self.stream, "isatty") and self.stream.isatty()
+        while not self._stop.wait(self.interval):
+            if interactive:
+                self.stream.write("\r" + self.line() + "\x1b[K")
+                self.stream.flush()
+            else:
+                logging.info(self.line())
+        if interactive:
+            self.stream.write("\n")
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        logging.info(self.line())
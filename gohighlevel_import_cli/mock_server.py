@@ -0,0 +1,357 @@
+# gohighlevel_import_cli/mock_server.py
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+CONTACT_CHILD_PATH = re.compile(r"^/contacts/([^/]+)/(tasks|notes)/?$")
+CONTACT_CHILD_RECORD_PATH = re.compile(r"^/contacts/([^/]+)/(tasks|notes)/([^/]+)/?$")
+CONTACT_PATH = re.compile(r"^/contacts/([^/]+)/?$")
+
+
+class MockState:
+    """In-memory contacts, tasks, notes and users behind the mock API."""
+
+    def __init__(self, users=None):
+        self.lock = threading.Lock()
+        self.contacts = {}
+        self.contacts_by_email = {}
+        self.children = {}
+        self.users = users if users is not None else [
+            {"id": "user-1", "firstName": "Jane", "lastName": "Doe", "email": "jane@example.com"},
+            {"id": "user-2", "firstName": "John", "lastName": "Smith", "email": "john@example.com"},
+        ]
+        self._seq = 0
+
+    def _next_id(self, prefix):
+        self._seq += 1
+        return self._seq, f"{prefix}-{self._seq}"
+
+    def add_contact(self, payload):
+        with self.lock:
+            seq, contact_id = self._next_id("contact")
+            contact = dict(payload, id=contact_id, searchAfter=[seq, contact_id])
+            self.contacts[contact_id] = contact
+            email = (payload.get("email") or "").strip().lower()
+            if email:
+                self.contacts_by_email.setdefault(email, contact)
+            self.children[contact_id] = {"tasks": [], "notes": []}
+            return contact
+
+    def add_child(self, contact_id, kind, payload):
+        with self.lock:
+            if contact_id not in self.contacts:
+                return None
+            _, record_id = self._next_id(kind[:-1])
+            record = dict(payload, id=record_id, contactId=contact_id)
+            self.children[contact_id][kind].append(record)
+            return record
+
+    def update_contact(self, contact_id, payload):
+        with self.lock:
+            contact = self.contacts.get(contact_id)
+            if contact is not None:
+                contact.update(payload)
+            return contact
+
+    def update_child(self, contact_id, kind, record_id, payload):
+        with self.lock:
+            for record in self.children.get(contact_id, {}).get(kind, []):
+                if record["id"] == record_id:
+                    record.update(payload)
+                    return record
+            return None
+
+    def list_children(self, contact_id, kind):
+        with self.lock:
+            if contact_id not in self.children:
+                return None
+            return list(self.children[contact_id][kind])
+
+    def search(self, payload):
+        page_limit = int(payload.get("pageLimit") or 20)
+        with self.lock:
+            matches = list(self.contacts.values())
+            for f in payload.get("filters") or []:
+                if f.get("field") != "email":
+                    continue
+                value = str(f.get("value", "")).strip().lower()
+                if f.get("operator") == "contains":
+                    matches = [c for c in matches if value in (c.get("email") or "").lower()]
+                else:
+                    matches = [c for c in matches if (c.get("email") or "").strip().lower() == value]
+            total = len(matches)
+            search_after = payload.get("searchAfter")
+            if search_after:
+                matches = [c for c in matches if c["searchAfter"][0] > search_after[0]]
+            return {"contacts": matches[:page_limit], "total": total}
+
+
+class MockRateLimit:
+    # Server-side token bucket that reports itself in GoHighLevel's headers
+
+    def __init__(self, burst, interval):
+        self.burst = burst
+        self.interval = interval
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.burst / self.interval)
+            self.updated_at = now
+            allowed = self.tokens >= 1
+            if allowed:
+                self.tokens -= 1
+            reset = max(0.0, (1 - self.tokens) * self.interval / self.burst)
+            headers = {
+                "X-RateLimit-Max": str(self.burst),
+                "X-RateLimit-Interval-Milliseconds": str(int(self.interval * 1000)),
+                "X-RateLimit-Remaining": str(int(self.tokens)),
+                "X-RateLimit-Reset": f"{reset:.3f}",
+            }
+            return allowed, headers
+
+
+class MockGoHighLevelHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _handle(self, method):
+        server = self.server
+        payload = self._read_json() if method in ("POST", "PUT") else {}
+        path = urlsplit(self.path).path
+        if method == "PUT":
+            route = CONTACT_CHILD_RECORD_PATH.sub(r"/contacts/{id}/\2/{id}", CONTACT_PATH.sub("/contacts/{id}", path))
+        else:
+            route = CONTACT_CHILD_PATH.sub(r"/contacts/{id}/\2", path)
+        server.request_counts[(method, route)] += 1
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        rate_headers = {}
+        if server.rate_limit is not None:
+            allowed, rate_headers = server.rate_limit.take()
+            if not allowed:
+                return self._send(429, {"message": "Too Many Requests"}, rate_headers)
+
+        fault = server.pick_fault()
+        if fault == "timeout":
+            time.sleep(server.timeout_delay)
+        elif fault == "error":
+            return self._send(503, {"message": "Service Unavailable"}, rate_headers)
+
+        state = server.state
+        if method == "PUT":
+            child_record = CONTACT_CHILD_RECORD_PATH.match(path)
+            contact = CONTACT_PATH.match(path)
+            if child_record:
+                contact_id, kind, record_id = child_record.groups()
+                record = state.update_child(contact_id, kind, record_id, payload)
+                if record is not None:
+                    return self._send(200, {kind[:-1]: record}, rate_headers)
+            elif contact:
+                record = state.update_contact(contact.group(1), payload)
+                if record is not None:
+                    return self._send(200, {"contact": record}, rate_headers)
+            return self._send(404, {"message": "Record not found"}, rate_headers)
+
+        child = CONTACT_CHILD_PATH.match(path)
+        if method == "POST" and path == "/contacts/search":
+            return self._send(200, state.search(payload), rate_headers)
+        if method == "POST" and path in ("/contacts", "/contacts/"):
+            return self._send(201, {"contact": state.add_contact(payload)}, rate_headers)
+        if method == "GET" and path in ("/users", "/users/"):
+            return self._send(200, {"users": state.users}, rate_headers)
+        if child:
+            contact_id, kind = child.groups()
+            if method == "POST":
+                if not payload.get("title" if kind == "tasks" else "body"):
+                    return self._send(422, {"message": f"{kind[:-1]} needs a {'title' if kind == 'tasks' else 'body'}"},
+                                      rate_headers)
+                record = state.add_child(contact_id, kind, payload)
+                if record is not None:
+                    return self._send(201, {kind[:-1]: record}, rate_headers)
+            else:
+                records = state.list_children(contact_id, kind)
+                if records is not None:
+                    return self._send(200, {kind: records}, rate_headers)
+            return self._send(404, {"message": "Contact not found"}, rate_headers)
+        return self._send(404, {"message": f"No mock route for {method} {path}"}, rate_headers)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+
+class MockGoHighLevelServer(ThreadingHTTPServer):
+    """Local stand-in for the GoHighLevel endpoints the importer uses.
+
+    Injects fixed latency, 429s driven by a token bucket that emits the
+    X-RateLimit-* headers, random 503s and stalled responses (timeouts).
+    Point a client at it with GHL_BASE_URL=server.url.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, rate_limit=(1000, 1.0),
+                 error_rate=0.0, timeout_rate=0.0, timeout_delay=5.0, seed=0, state=None):
+        super().__init__((host, port), MockGoHighLevelHandler)
+        self.state = state or MockState()
+        self.latency = latency
+        self.rate_limit = MockRateLimit(*rate_limit) if rate_limit else None
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_delay = timeout_delay
+        self.request_counts = Counter()
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def pick_fault(self):
+        if not self.error_rate and not self.timeout_rate:
+            return None
+        with self._random_lock:
+            roll = self._random.random()
+        if roll < self.timeout_rate:
+            return "timeout"
+        if roll < self.timeout_rate + self.error_rate:
+            return "error"
+        return None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def synthetic_frames(n_contacts, n_tasks, n_notes, seed=0):
+    """Zoho-shaped contacts, tasks and notes DataFrames for tests and benchmarks."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    record_ids = np.arange(1, n_contacts + 1)
+    contacts_df = pd.DataFrame({
+        "Record Id": record_ids,
+        "Email": [f"user{i}@example.com" for i in record_ids],
+        "First Name": [f"First{i}" for i in record_ids],
+        "Last Name": [f"Last{i}" for i in record_ids],
+        "Company": [f"Company {i % 97}" for i in record_ids],
+        "Mobile Phone": [f"+1555{i:07d}" for i in record_ids],
+        "Phone": np.where(record_ids % 3 == 0, None, [f"+1666{i:07d}" for i in record_ids]),
+        "Home Phone": np.where(record_ids % 5 == 0, [f"+1777{i:07d}" for i in record_ids], None),
+        "Mailing Street": [f"{i} Main St" for i in record_ids],
+        "Mailing City": "Springfield",
+        "Mailing State": "IL",
+        "Mailing Zip": "62701",
+        "Mailing Country": "US",
+    })
+    tasks_df = pd.DataFrame({
+        "Contact Name.id": rng.integers(1, n_contacts + 1, n_tasks),
+        "Subject": [f"Task {i}" for i in range(n_tasks)],
+        "Due Date": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, n_tasks), unit="D"),
+        "Description": "Follow up",
+        "Status": rng.choice(["Completed", "Not Started", "In Progress"], n_tasks),
+        "Priority": "High",
+        "Task Owner": rng.choice(["Jane Doe", "John Smith"], n_tasks),
+    })
+    notes_df = pd.DataFrame({
+        "Parent ID.id": rng.integers(1, n_contacts + 1, n_notes),
+        "Note Title": [f"Note {i}" for i in range(n_notes)],
+        "Note Content": [f"Body of note {i}" for i in range(n_notes)],
+        "Created Time": pd.Timestamp("2024-06-01"),
+        "Note Owner": rng.choice(["Jane Doe", "John Smith"], n_notes),
+    })
+    return contacts_df, tasks_df, notes_df
+
+
+def write_synthetic_exports(directory, n_contacts, n_tasks, n_notes, fmt="csv", seed=0):
+    """Write synthetic exports and return their (contacts, tasks, notes) paths."""
+    paths = []
+    frames = synthetic_frames(n_contacts, n_tasks, n_notes, seed=seed)
+    for name, df in zip(("contacts", "tasks", "notes"), frames):
+        path = os.path.join(directory, f"{name}.{fmt}")
+        if fmt == "csv":
+            df.to_csv(path, index=False)
+        else:
+            df.to_excel(path, index=False)
+        paths.append(path)
+    return tuple(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock GoHighLevel API.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--burst", type=int, default=100, help="Requests allowed per interval before 429s")
+    parser.add_argument("--interval", type=float, default=10.0, help="Rate-limit interval in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Fraction of requests that stall")
+    parser.add_argument("--timeout-delay", type=float, default=60.0, help="Seconds a stalled request hangs")
+    args = parser.parse_args()
+
+    server = MockGoHighLevelServer(
+        port=args.port, latency=args.latency, rate_limit=(args.burst, args.interval),
+        error_rate=args.error_rate, timeout_rate=args.timeout_rate, timeout_delay=args.timeout_delay
+    )
+    print(f"Mock GoHighLevel API listening on {server.url} (set GHL_BASE_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,95 @@
 # gohighlevel_import_cli/models.py
 
 from datetime import datetime
-import pandas as pd
+
+
+def _isoformat(value):
+    # Covers pandas Timestamps and openpyxl datetimes; NaT (unequal to itself)
+    # is passed through unchanged
+    if isinstance(value, datetime) and value == value:
+        return value.isoformat()
+    return value
+
+# Records use __slots__: with a million notes resident, a per-instance
+# __dict__ costs more than the fields themselves. to_dict() replaces vars().
+
+# Delta sync metadata (--delta only): export Record Id, content hash, the
+# GoHighLevel ID of the copy sent last time (set only when the record
+# changed) and the position among identical records in the full export
+DELTA_FIELDS = ("source_id", "fingerprint", "gohighlevel_id", "occurrence")
+
 
 class Task:
-    def __init__(self, subject, due_date=None, description=None, status=None, priority=None, completed=False):
+    __slots__ = ("subject", "due_date", "description", "status", "priority", "completed", "owner")
+    _fields = __slots__
+    # Only DeltaTask stores these; plain records stay as small as the fields
+    source_id = fingerprint = gohighlevel_id = occurrence = None
+
+    def __init__(self, subject, due_date=None, description=None, status=None, priority=None, completed=False, owner=None):
         self.subject = subject
-        self.due_date = due_date.isoformat() if isinstance(due_date, pd.Timestamp) else due_date
+        self.due_date = _isoformat(due_date)
         self.description = description
         self.status = status
         self.priority = priority
         self.completed = completed
+        self.owner = owner
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self._fields}
+
+class DeltaTask(Task):
+    __slots__ = DELTA_FIELDS
+    _fields = Task._fields + DELTA_FIELDS
+
+    def __init__(self, subject, due_date=None, description=None, status=None, priority=None, completed=False, owner=None,
+                 source_id=None, fingerprint=None, gohighlevel_id=None, occurrence=None):
+        super().__init__(subject, due_date, description, status, priority, completed, owner)
+        self.source_id = source_id
+        self.fingerprint = fingerprint
+        self.gohighlevel_id = gohighlevel_id
+        self.occurrence = occurrence
 
 class Note:
-    def __init__(self, content, title="Note", created_time=None):
+    __slots__ = ("content", "title", "created_time", "owner")
+    _fields = __slots__
+    source_id = fingerprint = gohighlevel_id = occurrence = None
+
+    def __init__(self, content, title="Note", created_time=None, owner=None):
         self.content = content
-        self.title = title or "Note"
-        self.created_time = created_time.isoformat() if isinstance(created_time, pd.Timestamp) else created_time
+        # A blank title read by pandas is NaN, which is truthy
+        self.title = title if title and title == title else "Note"
+        self.created_time = _isoformat(created_time)
+        self.owner = owner
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self._fields}
+
+class DeltaNote(Note):
+    __slots__ = DELTA_FIELDS
+    _fields = Note._fields + DELTA_FIELDS
+
+    def __init__(self, content, title="Note", created_time=None, owner=None,
+                 source_id=None, fingerprint=None, gohighlevel_id=None, occurrence=None):
+        super().__init__(content, title, created_time, owner)
+        self.source_id = source_id
+        self.fingerprint = fingerprint
+        self.gohighlevel_id = gohighlevel_id
+        self.occurrence = occurrence
+
+
+def task_from_dict(fields):
+    """Rebuild a task from to_dict() output, e.g. a failure log payload."""
+    return (DeltaTask if DELTA_FIELDS[0] in fields else Task)(**fields)
+
+
+def note_from_dict(fields):
+    return (DeltaNote if DELTA_FIELDS[0] in fields else Note)(**fields)
 
 class Contact:
+    __slots__ = ("email", "first_name", "last_name", "business_name", "phone", "additional_phones",
+                 "street", "city", "state", "postal_code", "country",
+                 "source_id", "gohighlevel_id", "tasks", "notes")
+
     def __init__(self, email, first_name=None, last_name=None, business_name=None,
                  phone=None, additional_phones=None, address=None, source_id=None):
         self.email = email
@@ -27,13 +98,47 @@ class Contact:
         self.business_name = business_name
         self.phone = phone
         self.additional_phones = additional_phones or []
-        self.address = address or {}  # dict with street, city, etc.
+        self.address = address  # dict with street, city, etc.
         self.source_id = source_id
+        self.gohighlevel_id = None
         self.tasks = []
         self.notes = []
 
+    # The address is stored as flat slots; the dict view keeps the old interface
+    @property
+    def address(self):
+        return {
+            "street": self.street,
+            "city": self.city,
+            "state": self.state,
+            "postalCode": self.postal_code,
+            "country": self.country,
+        }
+
+    @address.setter
+    def address(self, address):
+        address = address or {}
+        self.street = address.get("street")
+        self.city = address.get("city")
+        self.state = address.get("state")
+        self.postal_code = address.get("postalCode")
+        self.country = address.get("country")
+
     def add_task(self, task):
         self.tasks.append(task)
 
     def add_note(self, note):
         self.notes.append(note)
+
+    def to_dict(self):
+        return {
+            "email": self.email,
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "business_name": self.business_name,
+            "phone": self.phone,
+            "additional_phones": self.additional_phones,
+            "address": self.address,
+            "source_id": self.source_id,
+            "gohighlevel_id": self.gohighlevel_id,
+        }
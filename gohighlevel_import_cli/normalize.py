@@ -0,0 +1,146 @@
+# gohighlevel_import_cli/normalize.py
+
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# A trailing UTC offset marks a value as timezone-aware
+_OFFSET = r"(?:Z|[+-]\d{2}:?\d{2})$"
+
+
+def is_missing(value):
+    return value is None or (not isinstance(value, str) and value != value)
+
+
+def _to_iso(timestamps, timezone):
+    # Naive values are wall-clock times in the export's timezone, if one is
+    # given, and stay naive otherwise; aware values are sent as UTC
+    if timezone and timestamps.dt.tz is None:
+        timestamps = timestamps.dt.tz_localize(timezone, ambiguous=False, nonexistent="shift_forward")
+    suffix = ""
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+        suffix = "+00:00"
+    values = timestamps.to_numpy("datetime64[us]")
+    if (values.astype("int64") % 1000000 == 0).all():
+        # Whole seconds: numpy formats exactly like datetime.isoformat(), in C
+        return [text + suffix for text in np.datetime_as_string(values, unit="s").tolist()]
+    return [value.isoformat() + suffix for value in timestamps.dt.to_pydatetime()]
+
+
+def _parse(text, fmt):
+    aware = text.str.contains(_OFFSET, regex=True)
+    if not aware.any():
+        return pd.to_datetime(text, format=fmt, errors="coerce")
+    # Naive and offset values cannot share one datetime column
+    return (
+        pd.to_datetime(text[~aware], format=fmt, errors="coerce"),
+        pd.to_datetime(text[aware], format=fmt, errors="coerce", utc=True),
+    )
+
+
+def _per_unique(values, normalize):
+    # Exports repeat the same owners, statuses and dates many times over;
+    # normalize each distinct value once and broadcast the results back
+    series = pd.Series(values)
+    codes, uniques = pd.factorize(series)
+    results = [np.asarray(result, dtype=object) for result in normalize(pd.Series(uniques))]
+    present = codes >= 0
+    broadcast = []
+    for result, fill in zip(results, (None, False)):
+        out = np.full(len(series), fill, dtype=object)
+        out[present] = result[codes[present]]
+        broadcast.append(pd.Series(out, index=series.index, dtype=object))
+    return broadcast
+
+
+def normalize_datetimes(values, formats=(), timezone=None):
+    """Parse a whole date column at once.
+
+    Tries each strptime format in `formats`, then ISO 8601, then pandas'
+    per-value guessing for whatever is left. Returns an object Series of ISO
+    strings (None where the value is missing or unparseable) and a boolean
+    Series marking the values that were present but could not be parsed.
+    """
+    result, rejected = _per_unique(values, lambda uniques: _normalize_datetimes(uniques, formats, timezone))
+    return result, rejected.astype(bool)
+
+
+def _normalize_datetimes(series, formats, timezone):
+    result = pd.Series([None] * len(series), index=series.index, dtype=object)
+    rejected = pd.Series(False, index=series.index)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        present = series.notna()
+        result[present] = _to_iso(series[present], timezone)
+        return result, rejected
+
+    present = (series.notna() & (series.astype("string").str.strip() != "")).fillna(False).astype(bool)
+    dates = series[present & series.map(lambda value: isinstance(value, datetime))]
+    for value in dates.index:
+        result[value] = normalize_datetime(series[value], timezone=timezone)[0]
+
+    text = series[present].drop(dates.index).astype(str).str.strip()
+    for fmt in (*formats, "ISO8601", "mixed"):
+        if text.empty:
+            break
+        parsed = _parse(text, fmt)
+        for part in parsed if isinstance(parsed, tuple) else (parsed,):
+            ok = part[part.notna()]
+            if not ok.empty:
+                result[ok.index] = _to_iso(ok, timezone)
+                text = text.drop(ok.index)
+    rejected[text.index] = True
+    return result, rejected
+
+
+def normalize_datetime(value, formats=(), timezone=None):
+    """Row-wise twin of normalize_datetimes: returns (ISO string or None, rejected)."""
+    if is_missing(value):
+        return None, False
+    if isinstance(value, datetime):
+        timestamp = pd.Timestamp(value)
+    else:
+        text = str(value).strip()
+        if not text:
+            return None, False
+        timestamp = None
+        for fmt in formats:
+            try:
+                timestamp = pd.Timestamp(datetime.strptime(text, fmt))
+                break
+            except ValueError:
+                continue
+        if timestamp is None:
+            try:
+                timestamp = pd.Timestamp(datetime.fromisoformat(text))
+            except ValueError:
+                try:
+                    timestamp = pd.Timestamp(text)
+                except (ValueError, OverflowError):
+                    return None, True
+    if timezone and timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize(timezone, ambiguous=False, nonexistent="shift_forward")
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC")
+    return timestamp.to_pydatetime().isoformat(), False
+
+
+def normalize_text(values):
+    """Strip and collapse whitespace; blanks become None."""
+    return _per_unique(values, lambda uniques: ([clean_text(value) for value in uniques],))[0]
+
+
+def clean_text(value):
+    # Scalar normalize_text for the row-by-row readers
+    if not isinstance(value, str):
+        return None if is_missing(value) else value
+    return " ".join(value.split()) or None
+
+
+def is_completed(status):
+    return isinstance(status, str) and status.strip().lower() == "completed"
+
+
+def completed_flags(statuses):
+    flags = _per_unique(statuses, lambda uniques: ([is_completed(value) for value in uniques],))[0]
+    return flags.where(flags.notna(), False).astype(bool)
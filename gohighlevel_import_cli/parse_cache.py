@@ -0,0 +1,123 @@
+# gohighlevel_import_cli/parse_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (enables the Parquet format)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def read_table(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm", ".xls"):
+        return pd.read_excel(path)
+    if ext == ".csv":
+        return pd.read_csv(path)
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    raise ValueError(f"Unsupported export format for {path}; use .xlsx, .csv or .parquet")
+
+
+def file_fingerprint(path, block_size=1 << 20):
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return {
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha": digest.hexdigest(),
+    }
+
+
+class ParseCache:
+    """Parsed and merged DataFrames stored on disk, keyed by their input files.
+
+    An entry is identified by the path, size, mtime and content hash of every
+    input, so editing or replacing any export misses the cache. Frames are
+    written as Parquet when pyarrow is installed and as pickle otherwise.
+    """
+
+    def __init__(self, cache_dir, max_entries=3):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def key(self, paths):
+        fingerprints = [file_fingerprint(path) for path in paths]
+        encoded = json.dumps(fingerprints, sort_keys=True).encode()
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key, names):
+        entry = self._entry_dir(key)
+        manifest_path = os.path.join(entry, "manifest.json")
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            frames = {}
+            for name in names:
+                filename = manifest["files"][name]
+                path = os.path.join(entry, filename)
+                if filename.endswith(".parquet"):
+                    frames[name] = pd.read_parquet(path)
+                else:
+                    frames[name] = pd.read_pickle(path)
+        except Exception as e:
+            logging.warning(f"Discarding unreadable parse cache entry {entry}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        os.utime(manifest_path)
+        return frames
+
+    def _write_frame(self, entry, name, df):
+        if HAS_PYARROW:
+            filename = f"{name}.parquet"
+            try:
+                df.to_parquet(os.path.join(entry, filename), index=False)
+                return filename
+            except Exception as e:
+                # Mixed-type object columns are common in CRM exports
+                logging.debug(f"Parquet write failed for {name}, using pickle: {e}")
+        filename = f"{name}.pkl"
+        df.to_pickle(os.path.join(entry, filename))
+        return filename
+
+    def put(self, key, frames):
+        entry = self._entry_dir(key)
+        # Per process, as shard processes may store the same entry at once
+        tmp_entry = f"{entry}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        os.makedirs(tmp_entry)
+        files = {name: self._write_frame(tmp_entry, name, df) for name, df in frames.items()}
+        with open(os.path.join(tmp_entry, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({"files": files}, f)
+        shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.replace(tmp_entry, entry)
+        except OSError:
+            # Another process stored the same frames first
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+        self._prune()
+
+    def _prune(self):
+        # Keep only the most recently used entries
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            manifest = os.path.join(self.cache_dir, name, "manifest.json")
+            if os.path.exists(manifest):
+                entries.append((os.path.getmtime(manifest), name))
+        for _, name in sorted(entries, reverse=True)[self.max_entries:]:
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
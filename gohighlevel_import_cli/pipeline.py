@@ -0,0 +1,233 @@
+# gohighlevel_import_cli/pipeline.py
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import closing
+from gohighlevel_import_cli.checkpoint import contact_key, record_digest, SUCCESS
+from gohighlevel_import_cli.streaming import iter_rows, record_key
+
+_DONE = object()
+
+
+class ImportPipeline:
+    """Read -> resolve -> write stages connected by bounded queues.
+
+    The reader maps export rows to tasks and notes and queues them as soon as
+    they are parsed; resolver threads find or create each record's contact
+    (once per email) and writer threads create the record. Each stage runs
+    concurrently with the others, and a full queue blocks the stage feeding
+    it, so memory stays bounded by the queue sizes however large the exports
+    are. Only the contacts file is read up front, for the Record Id -> email
+    join. If a stage thread dies, the others stop and run() re-raises its
+    error instead of waiting on a queue nobody drains.
+    """
+
+    def __init__(self, importer, resolve_workers=None, write_workers=None, queue_size=1000, chunk_size=10000):
+        self.importer = importer
+        self.resolve_workers = resolve_workers or importer.workers
+        self.write_workers = write_workers or importer.workers
+        self.chunk_size = chunk_size
+        self.resolve_queue = queue.Queue(queue_size)
+        self.write_queue = queue.Queue(queue_size)
+        self.contacts = {}
+        self._resolving = {}
+        self._resolving_lock = threading.Lock()
+        self._error = None
+        self._error_lock = threading.Lock()
+        self._stop = threading.Event()
+        metrics = importer.metrics
+        metrics.add_stage("read")
+        metrics.add_stage("resolve", self.resolve_queue)
+        metrics.add_stage("write", self.write_queue)
+
+    def _put(self, q, item):
+        # Timed, so a full queue whose consumers died does not block forever;
+        # False once the pipeline is stopping
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _get(self, q):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def _fail(self, error):
+        with self._error_lock:
+            if self._error is None:
+                self._error = error
+
+    def _stage(self, target):
+        def run():
+            try:
+                target()
+            except Exception as e:
+                logging.error(f"Pipeline stage {threading.current_thread().name} failed: {e}")
+                self._fail(e)
+                self._stop.set()
+        return run
+
+    def _read_contacts(self):
+        email_by_id = {}
+        for row in iter_rows(self.importer.contacts_path, self.chunk_size):
+            email = row.get("Email")
+            if not email or (isinstance(email, float) and email != email):
+                continue
+            key = record_key(row.get("Record Id"))
+            if key is not None:
+                email_by_id.setdefault(key, email)
+            # First row per email wins, like the in-memory mapping
+            if email not in self.contacts:
+                self.contacts[email] = self.importer._contact_from_row(row)
+        logging.info(f"Indexed {len(email_by_id)} contact record IDs from {self.importer.contacts_path}")
+        return email_by_id
+
+    def _read(self):
+        importer = self.importer
+        metrics = importer.metrics
+        try:
+            email_by_id = self._read_contacts()
+            admitted = set()
+            # Occurrence numbers per record digest keep idempotency keys equal
+            # to the ones import_contact derives from a whole contact; both
+            # hash Importer._signature, which reads blank cells as None
+            occurrences = {}
+            sources = (
+                (importer.tasks_path, "Contact Name.id", "task", importer._task_from_row),
+                (importer.notes_path, "Parent ID.id", "note", importer._note_from_row),
+            )
+            for path, parent_column, kind, make_record in sources:
+                with closing(iter_rows(path, self.chunk_size)) as rows:
+                    for row in rows:
+                        start = time.perf_counter()
+                        email = email_by_id.get(record_key(row.get(parent_column)))
+                        if email is None or email in importer.already_imported:
+                            continue
+                        if email not in admitted:
+                            if importer.limit and len(admitted) >= importer.limit:
+                                continue
+                            admitted.add(email)
+                        record = make_record(row)
+                        digest = record_digest(kind, email, *importer._signature(record))
+                        occurrence = occurrences.get(digest, 0)
+                        occurrences[digest] = occurrence + 1
+                        metrics.record_stage("read", time.perf_counter() - start)
+                        # Blocks while the resolvers are behind
+                        if not self._put(self.resolve_queue, (email, kind, record, f"{digest}:{occurrence}")):
+                            return
+        except Exception as e:
+            # Rows already queued are still written
+            logging.error(f"Reading the exports failed: {e}")
+            self._fail(e)
+        finally:
+            for _ in range(self.resolve_workers):
+                self._put(self.resolve_queue, _DONE)
+
+    def _contact_id(self, email):
+        # The first resolver to see an email resolves it; the rest wait on its result
+        with self._resolving_lock:
+            future = self._resolving.get(email)
+            owner = future is None
+            if owner:
+                future = self._resolving[email] = Future()
+        if owner:
+            try:
+                future.set_result(self._resolve(email))
+            except Exception as e:
+                logging.error("Failed to resolve contact %s: %s", email, e)
+                self.importer.log_failure(email, "Contact", e, self.contacts[email].to_dict(), key=contact_key(email))
+                self.importer.metrics.count("contacts_failed")
+                future.set_result(None)
+            finally:
+                self.importer.metrics.count("contacts_done")
+        return future.result()
+
+    def _resolve(self, email):
+        importer = self.importer
+        contact = self.contacts[email]
+        if importer.checkpoint is not None:
+            status, ghl_id = importer.checkpoint.status(contact_key(email))
+            if status == SUCCESS and ghl_id:
+                importer.metrics.count("contacts_resumed")
+                contact.gohighlevel_id = ghl_id
+                return ghl_id
+        contact.gohighlevel_id = importer._resolve_contact(contact)
+        return contact.gohighlevel_id
+
+    def _resolver(self):
+        importer = self.importer
+        while True:
+            item = self._get(self.resolve_queue)
+            if item is _DONE:
+                break
+            start = time.perf_counter()
+            email, kind, record, key = item
+            contact_id = self._contact_id(email)
+            resumed = (
+                importer.checkpoint is not None and importer.checkpoint.status(key)[0] == SUCCESS
+            )
+            if resumed:
+                importer.metrics.count("records_resumed")
+            importer.metrics.record_stage("resolve", time.perf_counter() - start)
+            if resumed:
+                continue
+            if contact_id is None:
+                # Listed so a replay can send it once the contact exists
+                importer.log_failure(email, kind.title(), "contact was not created", record.to_dict(), key=key)
+                continue
+            if not self._put(self.write_queue, (self.contacts[email], kind, record, key)):
+                break
+
+    def _writer(self):
+        importer = self.importer
+        while True:
+            item = self._get(self.write_queue)
+            if item is _DONE:
+                break
+            start = time.perf_counter()
+            contact, kind, record, key = item
+            if kind == "task":
+                importer._import_task(contact, record, key)
+            else:
+                importer._import_note(contact, record, key)
+            importer.metrics.record_stage("write", time.perf_counter() - start)
+
+    def run(self):
+        """Run all stages to completion; returns the number of contacts processed."""
+        reader = threading.Thread(target=self._stage(self._read), name="pipeline-read", daemon=True)
+        resolvers = [
+            threading.Thread(target=self._stage(self._resolver), name=f"pipeline-resolve-{n}", daemon=True)
+            for n in range(self.resolve_workers)
+        ]
+        writers = [
+            threading.Thread(target=self._stage(self._writer), name=f"pipeline-write-{n}", daemon=True)
+            for n in range(self.write_workers)
+        ]
+        for thread in [reader, *resolvers, *writers]:
+            thread.start()
+        reader.join()
+        for thread in resolvers:
+            thread.join()
+        for _ in writers:
+            self._put(self.write_queue, _DONE)
+        for thread in writers:
+            thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+        processed = [email for email, future in self._resolving.items() if future.result() is not None]
+        if self.importer.checkpoint is None and processed:
+            with open(self.importer.import_log_path, "a") as f:
+                f.writelines(email + "\n" for email in processed)
+        return len(processed)
@@ -0,0 +1,110 @@
+# gohighlevel_import_cli/rate_limiter.py
+
+import logging
+import threading
+import time
+
+# GoHighLevel's documented burst limit for private integrations: 100 requests
+# per 10 seconds per location. Responses carry the live values in headers.
+DEFAULT_BURST = 100
+DEFAULT_INTERVAL = 10.0
+
+
+def _header_number(headers, name):
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket shared by every thread that talks to one location.
+
+    The bucket holds up to `burst` tokens and refills at burst / interval
+    tokens per second. acquire() takes a token before each request, and
+    update() re-syncs the bucket from the X-RateLimit-* headers of each
+    response so the client stays just under the server's view of the quota.
+    A process that shares the location's quota with others (sharded runs)
+    passes its `share` of it; burst and remaining counts are scaled by it.
+    """
+
+    def __init__(self, burst=DEFAULT_BURST, interval=DEFAULT_INTERVAL, safety_margin=1,
+                 clock=time.monotonic, sleep=time.sleep, share=1.0):
+        self.share = share
+        self.burst = float(burst) * share
+        self.interval = float(interval)
+        self.safety_margin = safety_margin
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._paused_until = 0.0
+        self.daily_remaining = None
+
+    @property
+    def capacity(self):
+        return max(1.0, self.burst - self.safety_margin)
+
+    @property
+    def rate(self):
+        return self.burst / self.interval
+
+    def _refill(self, now):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def _reserve(self):
+        # Returns 0 once a token is taken, otherwise how long to wait for one
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return
+            self._sleep(wait)
+
+    def update(self, headers):
+        burst = _header_number(headers, "X-RateLimit-Max")
+        interval_ms = _header_number(headers, "X-RateLimit-Interval-Milliseconds")
+        remaining = _header_number(headers, "X-RateLimit-Remaining")
+        reset = _header_number(headers, "X-RateLimit-Reset")
+        daily_remaining = _header_number(headers, "X-RateLimit-Daily-Remaining")
+
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if burst:
+                self.burst = burst * self.share
+            if interval_ms:
+                self.interval = interval_ms / 1000.0
+            if daily_remaining is not None:
+                self.daily_remaining = daily_remaining
+            if remaining is not None:
+                # Never believe we have more headroom than the server reports
+                self._tokens = min(self._tokens, max(0.0, remaining * self.share - self.safety_margin))
+                if remaining <= 0 and reset:
+                    self._paused_until = max(self._paused_until, now + reset)
+
+    def pause(self, seconds):
+        """Stop every caller from sending for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = 0.0
+            self._updated_at = now
+            self._paused_until = max(self._paused_until, now + seconds)
+        logging.warning(f"Rate limit exceeded. Pausing requests for {seconds} seconds...")
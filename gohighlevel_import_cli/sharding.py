@@ -0,0 +1,280 @@
+# gohighlevel_import_cli/sharding.py
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Output files each shard writes under its own name for the parent to merge
+SHARD_FILES = ("failed_log_path", "unmatched_log_path", "rejected_log_path", "dry_run_report_path")
+
+
+def shard_of(email, count):
+    """Shard index of a contact's email, the same in every process and run."""
+    # hash() is salted per process, so it cannot be used here
+    if email is None or email != email:
+        return 0
+    digest = hashlib.blake2b(str(email).strip().lower().encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+
+def shard_path(path, tag):
+    root, ext = os.path.splitext(path)
+    return f"{root}.{tag}{ext}"
+
+
+def _tag(location):
+    return re.sub(r"[^\w.-]", "_", location)
+
+
+def _workers(processes, count):
+    return min(processes or os.cpu_count() or 1, count)
+
+
+def email_plans(options, shards, processes=None):
+    """Importer options per email shard, and how many shards run at once.
+
+    With one process per shard, only the shards running at the same time
+    share the location's rate limit, so each takes that fraction of it.
+    """
+    workers = _workers(processes, shards)
+    plans = [
+        (f"shard{index}", dict(options, shard=(index, shards), rate_share=1 / workers, metrics_path=None))
+        for index in range(shards)
+    ]
+    return plans, workers
+
+
+def _location_plan(options, location, location_column):
+    # Checkpoint keys do not include the location, so each location keeps
+    # its own state
+    tag = _tag(location)
+    return tag, dict(
+        options, location_id=location, location_column=location_column,
+        checkpoint_path=options.get("checkpoint_path") and shard_path(options["checkpoint_path"], tag),
+        fingerprints_path=shard_path(options.get("fingerprints_path", "import_fingerprints.sqlite"), tag),
+        metrics_path=None
+    )
+
+
+def _run_shard(options, tag, log_options, own_state):
+    # Runs in a fresh process: the client, its rate limiter and connection
+    # pool belong to this shard alone
+    from gohighlevel_import_cli.importer import Importer
+    from gohighlevel_import_cli.logs import setup_logging, _stop_listener
+
+    listener = setup_logging(**log_options, shard=tag) if log_options is not None else None
+    try:
+        importer = Importer(**options)
+        importer.progress_interactive = False
+        # name -> (merged file, this shard's file)
+        paths = {}
+        for name in SHARD_FILES:
+            paths[name] = (getattr(importer, name), shard_path(getattr(importer, name), tag))
+            setattr(importer, name, paths[name][1])
+        if own_state:
+            importer.import_log_path = shard_path(importer.import_log_path, tag)
+        processed = importer.run()
+        return {
+            "shard": tag,
+            "processed": processed,
+            "metrics": importer.metrics.summary(),
+            "paths": paths,
+        }
+    finally:
+        # Pool workers exit without running atexit handlers
+        if listener is not None:
+            _stop_listener(listener)
+            for handler in listener.handlers:
+                handler.close()
+
+
+def run_sharded(options, shards=None, shard_by="email", location_column=None, processes=None, log_options=None):
+    """Import in several processes and merge their results.
+
+    `options` are Importer keyword arguments. With shard_by="email" the
+    contacts are split into `shards` by a hash of their email; every shard
+    writes to the same location, and the shards running at once split its
+    rate limit; all record progress in the shared checkpoint store. With shard_by="location"
+    each distinct value of the contacts' `location_column` is one shard,
+    imported into that location with its own rate limit and state files.
+    Failures, unmatched emails, rejected values, metrics and dry-run reports
+    are merged into the usual single files. Returns the contacts processed.
+    """
+    from gohighlevel_import_cli.importer import load_frames
+
+    started = time.time()
+    paths = [options["contacts_path"], options["tasks_path"], options["notes_path"]]
+    cache_dir = options.get("cache_dir", ".import_cache")  # the Importer default
+    if cache_dir or shard_by == "location":
+        # Parse once here; every shard then loads the frames from the cache
+        contacts = load_frames(*paths, cache_dir)[0]
+
+    if shard_by == "location":
+        values = contacts[location_column]
+        missing = int((values.isna() | (values.astype(str).str.strip() == "")).sum())
+        if missing:
+            logging.warning(f"Skipping {missing} contacts with no value in {location_column}")
+        locations = sorted(set(values.dropna().astype(str).str.strip()) - {""})
+        plans = [_location_plan(options, location, location_column) for location in locations]
+        workers = _workers(processes, len(plans))
+    else:
+        plans, workers = email_plans(options, shards, processes)
+    if not plans:
+        logging.warning("Nothing to import: no shards")
+        return 0
+
+    logging.info(f"Importing {len(plans)} shards by {shard_by} in {workers} processes")
+    # Spawn, not fork: the parent already runs the logging listener thread
+    context = multiprocessing.get_context("spawn")
+    results, failed = {}, []
+    with ProcessPoolExecutor(workers, mp_context=context, max_tasks_per_child=1) as pool:
+        futures = {
+            pool.submit(_run_shard, plan_options, tag, log_options, shard_by == "location"): tag
+            for tag, plan_options in plans
+        }
+        for future in as_completed(futures):
+            tag = futures[future]
+            try:
+                results[tag] = future.result()
+                logging.info(f"Shard {tag} finished: {results[tag]['processed']} contacts")
+            except Exception as e:
+                failed.append(tag)
+                logging.error(f"Shard {tag} failed: {e}")
+    results = [results[tag] for tag, _ in plans if tag in results]
+
+    _merge_outputs(results)
+    metrics = merge_metrics([result["metrics"] for result in results], time.time() - started)
+    metrics["shards"] = {result["shard"]: result["metrics"] for result in results}
+    if options.get("metrics_path"):
+        with open(options["metrics_path"], "w", encoding="utf-8") as f:
+            json.dump(metrics, f, indent=2)
+        logging.info(f"Wrote run metrics to {options['metrics_path']}")
+
+    processed = sum(result["processed"] or 0 for result in results)
+    logging.info(f"Processed {processed} contacts in {len(results)} shards.")
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {len(plans)} shards failed: {', '.join(failed)}")
+    return processed
+
+
+def replay_by_location(options, path, location_column=None):
+    """Replay a failure log written by a --shard-by location run.
+
+    Each entry is sent to the location it names, with that location's own
+    checkpoint; entries without one go to options["location_id"]. Records
+    still failing are merged back into the failure log, which is removed
+    once everything succeeds. Returns the records replayed.
+    """
+    from gohighlevel_import_cli.importer import Importer, load_failures
+
+    groups = {}
+    for failure in load_failures(path):
+        groups.setdefault(failure.get("Location") or options.get("location_id"), []).append(failure)
+    remaining = groups.pop(None, [])
+    if remaining:
+        logging.warning(f"{len(remaining)} failed records name no location and are left in the failure log")
+
+    replayed, target = 0, None
+    for location, failures in groups.items():
+        tag, location_options = _location_plan(options, location, location_column)
+        importer = Importer(**location_options)
+        target = importer.failed_log_path
+        part = importer.failed_log_path = shard_path(target, tag)
+        _write_failures(part, failures)
+        logging.info(f"Replaying {len(failures)} failed records for location {location}")
+        replayed += importer.replay_failures(part)
+        # The importer rewrites its part with the records still failing
+        if os.path.exists(part):
+            remaining += load_failures(part)
+            os.remove(part)
+
+    if remaining:
+        _write_failures(target or path, remaining)
+        logging.warning(f"Wrote {len(remaining)} failed records to {target or path}")
+    elif target and os.path.abspath(path) == os.path.abspath(target):
+        os.remove(path)
+    return replayed
+
+
+def _write_failures(path, failures):
+    with open(path, "w", encoding="utf-8") as f:
+        for failure in failures:
+            f.write(json.dumps(failure, default=str) + "\n")
+
+
+def merge_metrics(summaries, elapsed):
+    """Sum the record and request counts of several RunMetrics summaries.
+
+    Latency percentiles cannot be combined; they stay in each shard's summary.
+    """
+    records, endpoints = {}, {}
+    for summary in summaries:
+        for name, count in summary["records"].items():
+            records[name] = records.get(name, 0) + count
+        for name, stats in summary["endpoints"].items():
+            merged = endpoints.setdefault(name, {"requests": 0, "errors": 0, "retries": 0, "rate_limited": 0,
+                                                 "statuses": {}})
+            for field in ("requests", "errors", "retries", "rate_limited"):
+                merged[field] += stats[field]
+            for status, count in stats["statuses"].items():
+                merged["statuses"][status] = merged["statuses"].get(status, 0) + count
+    requests = sum(summary["requests"] for summary in summaries)
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "records": records,
+        "requests": requests,
+        "requests_per_s": round(requests / elapsed, 2) if elapsed else 0.0,
+        "rate_limit_wait_s": round(sum(summary["rate_limit_wait_s"] for summary in summaries), 3),
+        "endpoints": dict(sorted(endpoints.items())),
+    }
+
+
+def _merge_outputs(results):
+    if not results:
+        return
+    # Every shard names the same merged files
+    targets = {name: target for name, (target, _) in results[0]["paths"].items()}
+    parts = {name: [result["paths"][name][1] for result in results] for name in SHARD_FILES}
+    _concat(targets["failed_log_path"], parts["failed_log_path"], "failed records")
+    _concat(targets["unmatched_log_path"], parts["unmatched_log_path"], "unmatched emails", header=True)
+    _concat(targets["rejected_log_path"], parts["rejected_log_path"], "unparseable values", header=True)
+
+    reports = {}
+    for result, path in zip(results, parts["dry_run_report_path"]):
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                reports[result["shard"]] = json.load(f)
+            os.remove(path)
+    if reports:
+        counts = {}
+        for report in reports.values():
+            for name, count in report["counts"].items():
+                counts[name] = counts.get(name, 0) + count
+        with open(targets["dry_run_report_path"], "w", encoding="utf-8") as f:
+            json.dump({"counts": counts, "shards": reports}, f, indent=2)
+        logging.info(f"[DRY RUN] Merged {len(reports)} shard reports into {targets['dry_run_report_path']}")
+
+
+def _concat(target, parts, what, header=False):
+    # Shard files are removed once merged; a later run starts clean
+    parts = [part for part in parts if os.path.exists(part)]
+    if not parts:
+        return
+    lines = 0
+    with open(target, "w", encoding="utf-8") as out:
+        for i, part in enumerate(parts):
+            with open(part, "r", encoding="utf-8") as f:
+                if header and i:
+                    next(f, None)
+                for line in f:
+                    out.write(line)
+                    lines += 1
+            os.remove(part)
+    if header:
+        lines -= 1
+    logging.warning(f"Wrote {lines} {what} from {len(parts)} shards to {target}")
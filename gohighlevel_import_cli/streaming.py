@@ -0,0 +1,202 @@
+# gohighlevel_import_cli/streaming.py
+
+import logging
+import os
+import pickle
+import sqlite3
+import tempfile
+from itertools import islice
+import pandas as pd
+
+
+def iter_rows(path, chunk_size=10000):
+    """Yield each row of an xlsx or CSV export as a dict, one at a time."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        yield from _iter_xlsx_rows(path)
+    elif ext == ".csv":
+        yield from _iter_csv_rows(path, chunk_size)
+    else:
+        raise ValueError(f"Streaming mode supports .xlsx and .csv files, not {path}")
+
+
+def _iter_xlsx_rows(path):
+    from openpyxl import load_workbook
+
+    # read_only keeps openpyxl from building the whole sheet in memory
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = _column_labels(header)
+        for values in rows:
+            if any(value is not None for value in values):
+                yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def _column_labels(header):
+    # The labels pd.read_excel gives the same header row: blank cells become
+    # "Unnamed: N" and repeated names get a ".1", ".2" suffix, so every mode
+    # sees the same columns (and no column is dropped by dict())
+    labels, seen = [], {}
+    for position, label in enumerate(header):
+        if label is None:
+            label = f"Unnamed: {position}"
+        count = seen.get(label, 0)
+        seen[label] = count + 1
+        labels.append(f"{label}.{count}" if count else label)
+    return labels
+
+
+def _iter_csv_rows(path, chunk_size):
+    # Closing the generator early closes the file too
+    with pd.read_csv(path, chunksize=chunk_size) as chunks:
+        for chunk in chunks:
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            yield from chunk.to_dict("records")
+
+
+def record_key(value):
+    # Record Ids come back as int from openpyxl, int64/float64 from pandas and
+    # str from CSV; 12345, 12345.0 and "12345" must all join
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip() or None
+
+
+class StreamingSource:
+    """Contacts with their tasks and notes, produced in bounded batches.
+
+    The contacts file is read once to build the Record Id -> email join.
+    Task and note rows are then streamed, mapped to objects and spilled to a
+    temporary SQLite file indexed by email, so only `batch_size` contacts and
+    their records are in memory at any time. Contacts come out in the same
+    order map_to_objects would produce: first appearance in tasks, then notes.
+    """
+
+    def __init__(self, contacts_path, tasks_path, notes_path, make_contact, make_task, make_note,
+                 batch_size=500, chunk_size=10000, spill_dir=None):
+        self.contacts_path = contacts_path
+        self.tasks_path = tasks_path
+        self.notes_path = notes_path
+        self.make_contact = make_contact
+        self.make_task = make_task
+        self.make_note = make_note
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.spill_dir = spill_dir
+        self.db = None
+        self.spill_path = None
+
+    def _open(self):
+        fd, self.spill_path = tempfile.mkstemp(prefix="ghl-stream-", suffix=".sqlite", dir=self.spill_dir)
+        os.close(fd)
+        self.db = sqlite3.connect(self.spill_path)
+        self.db.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE contacts (email TEXT PRIMARY KEY, data BLOB);
+            CREATE TABLE contact_order (email TEXT PRIMARY KEY, seq INTEGER);
+            CREATE TABLE records (seq INTEGER PRIMARY KEY, email TEXT, kind TEXT, data BLOB);
+        """)
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+        if self.spill_path and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+        self.spill_path = None
+
+    def _chunks(self, rows):
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            yield chunk
+
+    def _load_contacts(self):
+        email_by_id = {}
+        for chunk in self._chunks(iter_rows(self.contacts_path, self.chunk_size)):
+            spilled = []
+            for row in chunk:
+                email = row.get("Email")
+                if not email or (isinstance(email, float) and email != email):
+                    continue
+                key = record_key(row.get("Record Id"))
+                if key is not None:
+                    email_by_id.setdefault(key, email)
+                spilled.append((email, pickle.dumps(self.make_contact(row), pickle.HIGHEST_PROTOCOL)))
+            # First row per email wins, like the in-memory mapping
+            self.db.executemany("INSERT OR IGNORE INTO contacts VALUES (?, ?)", spilled)
+        self.db.commit()
+        return email_by_id
+
+    def _spill_records(self, path, parent_column, kind, make_record, email_by_id, seq):
+        for chunk in self._chunks(iter_rows(path, self.chunk_size)):
+            records = []
+            for row in chunk:
+                email = email_by_id.get(record_key(row.get(parent_column)))
+                if email is None:
+                    continue
+                seq += 1
+                records.append((seq, email, kind, pickle.dumps(make_record(row), pickle.HIGHEST_PROTOCOL)))
+            self.db.executemany("INSERT INTO records VALUES (?, ?, ?, ?)", records)
+            self.db.executemany(
+                "INSERT OR IGNORE INTO contact_order VALUES (?, ?)",
+                ((email, record_seq) for record_seq, email, _, _ in records)
+            )
+        self.db.commit()
+        return seq
+
+    def prepare(self):
+        if self.db is not None:
+            return
+        self._open()
+        email_by_id = self._load_contacts()
+        logging.info(f"Indexed {len(email_by_id)} contact record IDs from {self.contacts_path}")
+        seq = self._spill_records(self.tasks_path, "Contact Name.id", "task", self.make_task, email_by_id, 0)
+        seq = self._spill_records(self.notes_path, "Parent ID.id", "note", self.make_note, email_by_id, seq)
+        self.db.execute("CREATE INDEX records_email ON records (email, seq)")
+        logging.info(f"Spilled {seq} tasks and notes to {self.spill_path}")
+
+    def contact_count(self):
+        self.prepare()
+        return self.db.execute("SELECT COUNT(*) FROM contact_order").fetchone()[0]
+
+    def batches(self):
+        self.prepare()
+        cursor = self.db.execute("SELECT email FROM contact_order ORDER BY seq")
+        while True:
+            emails = [email for (email,) in cursor.fetchmany(self.batch_size)]
+            if not emails:
+                break
+            yield self._load_batch(emails)
+
+    def _load_batch(self, emails):
+        placeholders = ",".join("?" * len(emails))
+        contacts = {
+            email: pickle.loads(data)
+            for email, data in self.db.execute(
+                f"SELECT email, data FROM contacts WHERE email IN ({placeholders})", emails
+            )
+        }
+        for email, kind, data in self.db.execute(
+            f"SELECT email, kind, data FROM records WHERE email IN ({placeholders}) ORDER BY seq", emails
+        ):
+            record = pickle.loads(data)
+            if kind == "task":
+                contacts[email].add_task(record)
+            else:
+                contacts[email].add_note(record)
+        return [contacts[email] for email in emails]
+
+    def contacts(self):
+        for batch in self.batches():
+            yield from batch
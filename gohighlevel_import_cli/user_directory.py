@@ -0,0 +1,134 @@
+# gohighlevel_import_cli/user_directory.py
+
+import json
+import logging
+import os
+import threading
+import time
+
+
+def normalize_name(name):
+    if not isinstance(name, str):
+        return None
+    return " ".join(name.split()).lower() or None
+
+
+def load_user_aliases(path):
+    # JSON object mapping an owner spelling from the export to a user's
+    # full name, email or ID
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class UserDirectory:
+    """Location users indexed by normalized name, email and alias.
+
+    The user list is fetched at most once per process (and not at all while a
+    fresh on-disk copy exists), so owner lookups after the first one are
+    plain dict reads that are safe to share across threads. A failed fetch
+    is not retried; owners then stay unassigned.
+    """
+
+    def __init__(self, fetch_users, location_id, cache_path=None, ttl=86400, aliases=None, offline=False):
+        self.fetch_users = fetch_users
+        self.location_id = location_id
+        self.cache_path = cache_path
+        self.ttl = ttl
+        # Extra spellings, e.g. {"J. Doe": "jane@example.com"}; values may be
+        # a user's full name, email or ID
+        self.aliases = aliases or {}
+        # Offline directories use the on-disk copy (at any age) and never fetch
+        self.offline = offline
+        self.available = False
+        self._index = None
+        self._lock = threading.Lock()
+        self._misses = set()
+
+    def _read_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable user cache {self.cache_path}: {e}")
+            return None
+        if cached.get("location_id") != self.location_id:
+            return None
+        if self.ttl is not None and not self.offline and time.time() - cached.get("fetched_at", 0) > self.ttl:
+            return None
+        return cached.get("users", [])
+
+    def _write_cache(self, users):
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"location_id": self.location_id, "fetched_at": time.time(), "users": users}, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _build_index(self, users):
+        index = {}
+        ids = set()
+        for user in users:
+            user_id = user.get("id")
+            if not user_id:
+                continue
+            ids.add(user_id)
+            full_name = f"{(user.get('firstName') or '').strip()} {(user.get('lastName') or '').strip()}"
+            for key in (full_name, user.get("name"), user.get("email")):
+                key = normalize_name(key)
+                if key:
+                    index.setdefault(key, user_id)
+
+        for alias, target in self.aliases.items():
+            alias = normalize_name(alias)
+            if not alias:
+                continue
+            if target in ids:
+                index[alias] = target
+            elif normalize_name(target) in index:
+                index[alias] = index[normalize_name(target)]
+            else:
+                logging.warning(f"User alias '{alias}' points at unknown user '{target}'")
+        return index
+
+    def load(self):
+        if self._index is not None:
+            return self._index
+        with self._lock:
+            if self._index is None:
+                users = self._read_cache()
+                if users is None and self.offline:
+                    logging.info("No cached GoHighLevel user list; owners will not be matched offline")
+                    users = []
+                elif users is None:
+                    try:
+                        users = self.fetch_users()
+                    except Exception as e:
+                        # Remembered for the rest of the run: a token without
+                        # the users scope will not gain it, and an outage that
+                        # outlasted the client's retries should not cost every
+                        # task and note another round of them
+                        logging.warning(f"Could not load GoHighLevel users; owners will not be assigned: {e}")
+                        users = []
+                    else:
+                        self._write_cache(users)
+                        logging.info(f"Loaded {len(users)} GoHighLevel users")
+                else:
+                    logging.info(f"Loaded {len(users)} GoHighLevel users from {self.cache_path}")
+                self.available = bool(users)
+                self._index = self._build_index(users)
+        return self._index
+
+    def resolve(self, name):
+        key = normalize_name(name)
+        if not key:
+            return None
+        user_id = self.load().get(key)
+        if user_id is None and self.available and key not in self._misses:
+            self._misses.add(key)
+            logging.warning(f"No user match found for '{name}'")
+        return user_id
@@ -0,0 +1,144 @@
+# scripts/bench_mapping.py
+
+import argparse
+import time
+import pandas as pd
+from gohighlevel_import_cli.importer import Importer
+from gohighlevel_import_cli.mock_server import synthetic_frames
+from gohighlevel_import_cli.models import Contact, Task, Note
+
+
+def legacy_validate_date(date_value):
+    # The per-row date parsing load-time normalization replaced
+    try:
+        if pd.isnull(date_value):
+            return None
+        if isinstance(date_value, str):
+            return pd.to_datetime(date_value).isoformat()
+        return date_value.isoformat()
+    except Exception:
+        return None
+
+
+def legacy_map_to_objects(importer):
+    # The row-by-row implementation map_to_objects replaced, kept for comparison
+    def contact_for(email):
+        match = importer.contacts_df[importer.contacts_df['Email'] == email]
+        row_data = match.iloc[0]
+        additional_phones = [
+            value for key, value in row_data.items()
+            if "phone" in key.lower() and key.lower() != "mobile phone" and pd.notnull(value)
+        ]
+        address = {
+            "street": row_data.get("Mailing Street"),
+            "city": row_data.get("Mailing City"),
+            "state": row_data.get("Mailing State"),
+            "postalCode": row_data.get("Mailing Zip"),
+            "country": row_data.get("Mailing Country")
+        }
+        return Contact(
+            email=email,
+            source_id=row_data.get('Record Id'),
+            first_name=row_data.get("First Name"),
+            last_name=row_data.get("Last Name"),
+            business_name=row_data.get("Company"),
+            phone=row_data.get("Mobile Phone"),
+            additional_phones=additional_phones,
+            address=address
+        )
+
+    for _, row in importer.tasks_df.iterrows():
+        email = row['Email']
+        if email not in importer.contacts_dict:
+            importer.contacts_dict[email] = contact_for(email)
+        task = Task(
+            subject=row['Subject'],
+            due_date=legacy_validate_date(row['Due Date']),
+            description=row.get('Description'),
+            status=row.get('Status'),
+            priority=row.get('Priority'),
+            completed=str(row.get('Status')).strip().lower() == "completed"
+        )
+        task.owner = row.get("Task Owner")
+        importer.contacts_dict[email].add_task(task)
+
+    for _, row in importer.notes_df.iterrows():
+        email = row['Email']
+        if email not in importer.contacts_dict:
+            importer.contacts_dict[email] = contact_for(email)
+        note = Note(
+            title=row.get('Note Title'),
+            content=row['Note Content'],
+            created_time=row.get('Created Time')
+        )
+        note.owner = row.get("Note Owner")
+        importer.contacts_dict[email].add_note(note)
+
+
+def snapshot(contacts_dict):
+    return [
+        (
+            email,
+            contact.to_dict(),
+            [task.to_dict() for task in contact.tasks],
+            [note.to_dict() for note in contact.notes],
+        )
+        for email, contact in contacts_dict.items()
+    ]
+
+
+def prepared_importer(frames):
+    importer = Importer("bench", "bench", None, None, None, dry_run=True)
+    importer.contacts_df, tasks_df, notes_df = (df.copy() for df in frames)
+    importer.tasks_df = tasks_df.merge(
+        importer.contacts_df[['Record Id', 'Email']],
+        left_on='Contact Name.id', right_on='Record Id', how='left'
+    ).dropna(subset=['Email'])
+    importer.notes_df = notes_df.merge(
+        importer.contacts_df[['Record Id', 'Email']],
+        left_on='Parent ID.id', right_on='Record Id', how='left'
+    ).dropna(subset=['Email'])
+    return importer
+
+
+def normalize_and_map(importer):
+    # load_data normalizes the columns map_to_objects reads
+    importer._normalize_frames()
+    importer.map_to_objects()
+
+
+def timed(fn, importer):
+    start = time.perf_counter()
+    fn(importer)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Importer.map_to_objects against the legacy row loop.")
+    parser.add_argument("--contacts", type=int, default=5000)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--notes", type=int, default=40000)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the current implementation")
+    args = parser.parse_args()
+
+    frames = synthetic_frames(args.contacts, args.tasks, args.notes)
+    print(f"Synthetic frames: {args.contacts} contacts, {args.tasks} tasks, {args.notes} notes")
+
+    indexed = prepared_importer(frames)
+    indexed_time = timed(normalize_and_map, indexed)
+    print(f"normalize + indexed map_to_objects: {indexed_time:.3f}s")
+
+    if args.skip_legacy:
+        return
+
+    legacy = prepared_importer(frames)
+    legacy_time = timed(legacy_map_to_objects, legacy)
+    print(f"legacy row-by-row map_to_objects: {legacy_time:.3f}s")
+    print(f"speedup: {legacy_time / indexed_time:.1f}x")
+
+    identical = snapshot(indexed.contacts_dict) == snapshot(legacy.contacts_dict)
+    print(f"identical contacts_dict: {identical}")
+
+
+if __name__ == "__main__":
+    main()
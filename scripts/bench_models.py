@@ -0,0 +1,98 @@
+# scripts/bench_models.py
+
+import argparse
+import gc
+import tracemalloc
+from gohighlevel_import_cli.models import Contact, Note, Task
+
+
+class LegacyTask:
+    # The __dict__-based Task before slots, with owner bolted on afterwards
+    def __init__(self, subject, due_date=None, description=None, status=None, priority=None, completed=False):
+        self.subject = subject
+        self.due_date = due_date
+        self.description = description
+        self.status = status
+        self.priority = priority
+        self.completed = completed
+
+
+class LegacyNote:
+    def __init__(self, content, title="Note", created_time=None):
+        self.content = content
+        self.title = title or "Note"
+        self.created_time = created_time
+
+
+class LegacyContact:
+    def __init__(self, email, first_name=None, last_name=None, business_name=None,
+                 phone=None, additional_phones=None, address=None, source_id=None):
+        self.email = email
+        self.first_name = first_name
+        self.last_name = last_name
+        self.business_name = business_name
+        self.phone = phone
+        self.additional_phones = additional_phones or []
+        self.address = address or {}
+        self.source_id = source_id
+        self.tasks = []
+        self.notes = []
+
+
+# Field values are shared across records so only per-object overhead is measured
+OWNER = "Jane Doe"
+DUE = "2025-01-01T00:00:00"
+ADDRESS = {"street": "1 Main St", "city": "Springfield", "state": "IL", "postalCode": "62701", "country": "US"}
+
+
+def build_tasks(cls, n):
+    records = []
+    for _ in range(n):
+        task = cls("Follow up", DUE, "Call back", "Open", "High")
+        task.owner = OWNER
+        records.append(task)
+    return records
+
+
+def build_notes(cls, n):
+    records = []
+    for _ in range(n):
+        note = cls("Body", "Title", DUE)
+        note.owner = OWNER
+        records.append(note)
+    return records
+
+
+def build_contacts(cls, n):
+    return [cls("a@example.com", "A", "B", "Co", "+1", None, dict(ADDRESS), 1) for _ in range(n)]
+
+
+def bytes_per_record(build, cls, n):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = build(cls, n)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Exclude the list holding the records
+    return (after - before - records.__sizeof__()) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory per record for the slot-based models.")
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'record':<8} {'before':>10} {'after':>10} {'saved':>7}")
+    for name, build, legacy, current in (
+        ("Task", build_tasks, LegacyTask, Task),
+        ("Note", build_notes, LegacyNote, Note),
+        ("Contact", build_contacts, LegacyContact, Contact),
+    ):
+        before = bytes_per_record(build, legacy, args.records)
+        after = bytes_per_record(build, current, args.records)
+        print(f"{name:<8} {before:>8.0f} B {after:>8.0f} B {(1 - after / before) * 100:>6.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# scripts/bench_session.py
+
+import argparse
+import statistics
+import time
+import requests
+from gohighlevel_import_cli.gohighlevel_client import GoHighLevelClient
+from gohighlevel_import_cli.mock_server import MockGoHighLevelServer
+from gohighlevel_import_cli.rate_limiter import RateLimiter
+
+
+def unpooled_request(client, url, payload):
+    # What _make_request did before the client owned a session
+    response = requests.request("POST", url, headers=client._get_headers(), json=payload)
+    response.raise_for_status()
+    return response.json()
+
+
+def pooled_request(client, url, payload):
+    return client._make_request("POST", url, json=payload)
+
+
+def measure(fn, client, url, n):
+    payload = {"locationId": client.location_id, "page": 1, "pageLimit": 1}
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn(client, url, payload)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label, latencies):
+    total = sum(latencies)
+    print(f"{label:<9} {len(latencies) / total:8.0f} req/s   "
+          f"mean {statistics.mean(latencies) * 1000:6.2f} ms   "
+          f"p50 {statistics.median(latencies) * 1000:6.2f} ms")
+    return statistics.mean(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-call requests.request with the pooled client session.")
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    server = MockGoHighLevelServer(rate_limit=None).start()
+    url = f"{server.url}/contacts/search"
+
+    # Effectively unlimited bucket so only connection handling is measured
+    limiter = RateLimiter(burst=10 ** 9, interval=1)
+    with GoHighLevelClient(api_key="bench", location_id="bench", dry_run=False, rate_limiter=limiter) as client:
+        unpooled = report("unpooled", measure(unpooled_request, client, url, args.requests))
+        pooled = report("pooled", measure(pooled_request, client, url, args.requests))
+
+    server.stop()
+    print(f"per-request latency saved: {(1 - pooled / unpooled) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
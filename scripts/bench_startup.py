@@ -0,0 +1,50 @@
+# scripts/bench_startup.py
+
+import argparse
+import subprocess
+import sys
+import time
+
+COMMANDS = {
+    "python -c pass": ["-c", "pass"],
+    "main --help": ["-m", "gohighlevel_import_cli.main", "--help"],
+    "import importer": ["-c", "import gohighlevel_import_cli.importer"],
+}
+
+
+def wall_time(args, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    return min(times), sorted(times)[len(times) // 2]
+
+
+def slowest_imports(args, top):
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if not name[1:].startswith(" "):
+                rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI startup time and the imports behind it.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=8, help="Top-level imports to list for main --help")
+    args = parser.parse_args()
+
+    for label, command in COMMANDS.items():
+        best, median = wall_time(command, args.runs)
+        print(f"{label:<18} min {best * 1000:7.1f} ms   median {median * 1000:7.1f} ms")
+    print("slowest top-level imports for main --help (-X importtime, cumulative):")
+    for cumulative, name in slowest_imports(COMMANDS["main --help"], args.top):
+        print(f"  {name:<32} {cumulative / 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# scripts/bench_throughput.py
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from gohighlevel_import_cli.importer import Importer
+from gohighlevel_import_cli.mock_server import MockGoHighLevelServer, write_synthetic_exports
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def timed_requests(client, latencies):
+    # Record the wall time of every client call, including retries and waits
+    make_request = client._make_request
+
+    def wrapper(method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            return make_request(method, url, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    client._make_request = wrapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Importer.run against the local mock GoHighLevel API.")
+    parser.add_argument("--contacts", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=400)
+    parser.add_argument("--notes", type=int, default=800)
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-concurrency", type=int, help="Let the adaptive limit grow up to this many workers")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--pipeline", action="store_true")
+    parser.add_argument("--prefetch-contacts", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock server latency per request (s)")
+    parser.add_argument("--burst", type=int, default=1000, help="Mock rate limit: requests per interval")
+    parser.add_argument("--interval", type=float, default=1.0, help="Mock rate limit interval (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--http-timeout", type=float, default=2.0, help="Client timeout used with --timeout-rate")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="ghl-bench-")
+    paths = write_synthetic_exports(workdir, args.contacts, args.tasks, args.notes, fmt=args.format)
+    os.chdir(workdir)
+
+    server = MockGoHighLevelServer(
+        latency=args.latency, rate_limit=(args.burst, args.interval),
+        error_rate=args.error_rate, timeout_rate=args.timeout_rate,
+        timeout_delay=args.http_timeout * 2
+    ).start()
+    os.environ["GHL_BASE_URL"] = server.url
+    os.environ["HTTP_TIMEOUT"] = str(args.http_timeout)
+
+    importer = Importer(
+        "bench-token", "bench-location", *paths, dry_run=False,
+        concurrency=args.concurrency, max_concurrency=args.max_concurrency, prefetch_contacts=args.prefetch_contacts,
+        stream=args.stream, pipeline=args.pipeline, cache_dir=None
+    )
+    latencies = []
+    timed_requests(importer.client, latencies)
+
+    start = time.perf_counter()
+    importer.run()
+    elapsed = time.perf_counter() - start
+    server.stop()
+    summary = importer.metrics.summary()
+
+    state = server.state
+    records = len(state.contacts) + sum(len(c["tasks"]) + len(c["notes"]) for c in state.children.values())
+    report = {
+        "input_rows": args.contacts + args.tasks + args.notes,
+        "records_written": records,
+        "failed_records": len(importer.failed_imports),
+        "requests": sum(server.request_counts.values()),
+        "requests_by_endpoint": {f"{m} {p}": n for (m, p), n in sorted(server.request_counts.items())},
+        "elapsed_s": round(elapsed, 3),
+        "records_per_s": round(records / elapsed, 1),
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "phases_s": summary["phases_s"],
+        "concurrency_limit": {
+            "low": int(importer.client.concurrency.low_water),
+            "high": int(importer.client.concurrency.high_water),
+            "final": int(importer.client.concurrency.limit),
+        },
+        "stages": {name: stats["per_s"] for name, stats in summary["stages"].items()},
+        "peak_rss_mb": round(peak_rss_mb(), 1) if resource else None,
+        "workdir": workdir,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for key, value in report.items():
+        if isinstance(value, dict):
+            print(f"{key}:")
+            for name, count in value.items():
+                print(f"  {name:<32} {count}")
+        else:
+            print(f"{key:<18} {value}")
+
+
+if __name__ == "__main__":
+    main()
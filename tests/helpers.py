@@ -0,0 +1,50 @@
+# tests/helpers.py
+
+import os
+import tempfile
+import unittest
+import pandas as pd
+from gohighlevel_import_cli.importer import Importer
+from gohighlevel_import_cli.mock_server import MockGoHighLevelServer, write_synthetic_exports
+
+
+class MockServerTestCase(unittest.TestCase):
+    """A temp dir, a running MockGoHighLevelServer and synthetic exports.
+
+    `exports` is the (contacts, tasks, notes) row counts written to the temp
+    dir as self.paths; None leaves writing the exports to the test.
+    """
+
+    exports = (20, 30, 40)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.server = MockGoHighLevelServer().start()
+        self.addCleanup(self.server.stop)
+        self.paths = write_synthetic_exports(self.tmp.name, *self.exports) if self.exports else None
+        self.checkpoint_path = self.path("checkpoint.sqlite")
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def importer(self, paths=None, **kwargs):
+        """A live Importer against the mock server; its output files go to the temp dir."""
+        options = dict(dry_run=False, cache_dir=None, checkpoint_path=self.checkpoint_path)
+        options.update(kwargs)
+        importer = Importer("dummy", "loc", *(paths or self.paths), **options)
+        importer.client.base_url = self.server.url
+        importer.unmatched_log_path = self.path("unmatched.csv")
+        importer.failed_log_path = self.path("failed.jsonl")
+        return importer
+
+    def blank_optional_cells(self, rows=3):
+        """Empty the Due Date, Description and Note Title of the first `rows` task and note rows."""
+        _, tasks, notes = self.paths
+        for path, columns in ((tasks, ['Due Date', 'Description']), (notes, ['Note Title'])):
+            df = pd.read_csv(path)
+            df.loc[:rows - 1, columns] = None
+            df.to_csv(path, index=False)
+
+    def children(self, kind):
+        return sum(len(records[kind]) for records in self.server.state.children.values())
@@ -0,0 +1,83 @@
+# tests/test_checkpoint.py
+
+import os
+import tempfile
+import unittest
+from gohighlevel_import_cli.checkpoint import CheckpointStore, contact_key, SUCCESS, FAILED
+from gohighlevel_import_cli.importer import Importer
+from gohighlevel_import_cli.models import Contact, Task, Note
+
+
+class FlakyClient:
+
+    def __init__(self, failing_subjects=()):
+        self.failing_subjects = set(failing_subjects)
+        self.calls = []
+
+    def find_contact_by_email(self, email):
+        self.calls.append(("find", email))
+        return {"id": "ghl-1"}
+
+    def resolve_user_id(self, name):
+        return None
+
+    def create_task(self, contact_id, task, completed=False, assigned_to=None):
+        self.calls.append(("task", task.subject))
+        if task.subject in self.failing_subjects:
+            raise Exception("boom")
+        return {"task": {"id": f"task-{task.subject}"}}
+
+    def create_note(self, contact_id, note, assigned_to=None):
+        self.calls.append(("note", note.content))
+        return {"note": {"id": f"note-{note.content}"}}
+
+
+def make_contact():
+    contact = Contact("Jane@Example.com")
+    contact.add_task(Task("Call", "2025-01-01"))
+    contact.add_task(Task("Call", "2025-01-01"))  # identical duplicate row
+    contact.add_task(Task("Email"))
+    contact.add_note(Note("Hello"))
+    return contact
+
+
+class TestCheckpointStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "checkpoint.sqlite")
+
+    def importer(self, client):
+        importer = Importer("dummy", "loc", None, None, None, dry_run=False, checkpoint_path=self.path)
+        importer.client = client
+        importer.checkpoint = CheckpointStore(self.path)
+        return importer
+
+    def test_batched_writes_and_upsert(self):
+        with CheckpointStore(self.path, batch_size=2, flush_interval=60) as store:
+            store.record("k1", "task", "A@x.com", FAILED, error="boom")
+            self.assertEqual(store.lookup("a@x.com"), {})
+            store.record("k1", "task", "a@x.com", SUCCESS, ghl_id="t1")
+            self.assertEqual(store.lookup("a@x.com"), {"k1": (SUCCESS, "t1")})
+            self.assertEqual(store.counts(), {("task", SUCCESS): 1})
+
+    def test_resume_only_retries_failed_records(self):
+        first = self.importer(FlakyClient(failing_subjects={"Email"}))
+        self.assertTrue(first.import_contact(make_contact()))
+        first.checkpoint.close()
+        self.assertEqual(len(first.client.calls), 5)
+
+        second = self.importer(FlakyClient())
+        self.assertTrue(second.import_contact(make_contact()))
+        second.checkpoint.close()
+        self.assertEqual(second.client.calls, [("task", "Email")])
+
+        with CheckpointStore(self.path) as store:
+            records = store.lookup("jane@example.com")
+        self.assertEqual(records[contact_key("jane@example.com")], (SUCCESS, "ghl-1"))
+        self.assertEqual(sum(1 for status, _ in records.values() if status == SUCCESS), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
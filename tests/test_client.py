@@ -0,0 +1,53 @@
+# tests/test_client.py
+
+import unittest
+from gohighlevel_import_cli.gohighlevel_client import GoHighLevelClient
+from gohighlevel_import_cli.models import Contact
+
+
+class TestContactPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.client = GoHighLevelClient(api_key="dummy", location_id="loc", dry_run=False)
+        self.contacts = [
+            {"id": f"id{i}", "email": f"User{i}@Example.com", "searchAfter": [i, f"id{i}"]}
+            for i in range(5)
+        ]
+        self.requests = []
+        self.client._make_request = self.fake_request
+
+    def fake_request(self, method, url, json=None, **kwargs):
+        self.requests.append((method, url, json))
+        if url.endswith("/contacts/"):
+            return {"contact": {"id": "new-id", "email": json["email"]}}
+        start = 0
+        if "searchAfter" in json:
+            start = json["searchAfter"][0] + 1
+        return {"contacts": self.contacts[start:start + json["pageLimit"]]}
+
+    def test_pages_with_cursor(self):
+        index = self.client.prefetch_contacts(page_limit=2)
+        self.assertEqual(len(index), 5)
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(self.requests[1][2]["searchAfter"], [1, "id1"])
+
+    def test_lookup_is_local_and_exact(self):
+        self.client.prefetch_contacts(page_limit=10)
+        calls = len(self.requests)
+        self.assertEqual(self.client.find_contact_by_email(" user3@example.COM "), {"id": "id3"})
+        self.assertIsNone(self.client.find_contact_by_email("ser3@example.com"))
+        self.assertEqual(len(self.requests), calls)
+
+    def test_created_contacts_join_the_index(self):
+        self.client.prefetch_contacts(page_limit=10)
+        created = self.client.create_contact(Contact("New@example.com"))
+        self.assertEqual(created["id"], "new-id")
+        self.assertEqual(self.client.find_contact_by_email("new@example.com"), {"id": "new-id"})
+
+    def test_search_rejects_partial_match(self):
+        self.client._make_request = lambda *a, **k: {"contacts": [{"id": "x", "email": "jimbob@x.com"}]}
+        self.assertIsNone(self.client.find_contact_by_email("bob@x.com"))
+
+
+if __name__ == '__main__':
+    unittest.main()
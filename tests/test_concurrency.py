@@ -0,0 +1,155 @@
+# tests/test_concurrency.py
+
+import unittest
+from unittest import mock
+import requests
+from gohighlevel_import_cli.concurrency import AdaptiveConcurrency, CircuitBreaker, CLOSED, OPEN
+from gohighlevel_import_cli.gohighlevel_client import GoHighLevelClient, PermanentError, RetryableError
+from gohighlevel_import_cli.mock_server import MockGoHighLevelServer
+from gohighlevel_import_cli.models import Contact, Note, Task
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = AdaptiveConcurrency(4, maximum=8, cooldown=1.0, clock=self.clock)
+
+    def complete(self, n, latency=0.1, overloaded=False):
+        for _ in range(n):
+            self.limiter.acquire()
+            self.limiter.release(latency, overloaded=overloaded)
+
+    def test_grows_while_healthy_up_to_maximum(self):
+        self.complete(4)
+        self.assertAlmostEqual(self.limiter.limit, 5, delta=0.1)
+        self.complete(200)
+        self.assertEqual(self.limiter.limit, 8)
+
+    def test_slow_responses_hold_the_limit(self):
+        self.complete(5, latency=0.1)
+        limit = self.limiter.limit
+        self.complete(20, latency=1.0)
+        self.assertEqual(self.limiter.limit, limit)
+
+    def test_overload_halves_once_per_cooldown(self):
+        self.complete(3, overloaded=True)
+        self.assertEqual(self.limiter.limit, 2)
+        self.clock.now += 1.0
+        self.complete(3, overloaded=True)
+        self.assertEqual(self.limiter.limit, 1)
+        self.assertEqual(self.limiter.low_water, 1)
+        self.assertEqual(self.limiter.in_flight, 0)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+
+        self.breaker.before_request()
+        self.assertGreaterEqual(self.clock.now, 10)
+        # The probe failed: twice as long this time
+        self.breaker.record_failure()
+        start = self.clock.now
+        self.breaker.before_request()
+        self.assertGreaterEqual(self.clock.now - start, 20)
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+class TestErrorClassification(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockGoHighLevelServer().start()
+        self.addCleanup(self.server.stop)
+        self.client = GoHighLevelClient(api_key="dummy", location_id="loc", dry_run=False)
+        self.client.base_url = self.server.url
+        self.addCleanup(self.client.close)
+
+    def test_rejected_payload_is_not_retried(self):
+        contact_id = self.client.create_contact(Contact("a@example.com"))["id"]
+        with self.assertRaises(PermanentError) as raised:
+            self.client.create_task(contact_id, Task(None))
+        self.assertEqual(raised.exception.status_code, 422)
+        self.assertEqual(self.server.request_counts[("POST", "/contacts/{id}/tasks")], 1)
+
+    @mock.patch("gohighlevel_import_cli.gohighlevel_client.time.sleep")
+    def test_server_errors_exhaust_retries(self, sleep):
+        self.server.error_rate = 1.0
+        with self.assertRaises(RetryableError) as raised:
+            self.client.create_contact(Contact("a@example.com"))
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertEqual(self.server.request_counts[("POST", "/contacts/")], self.client.max_attempts)
+        self.assertLess(self.client.concurrency.limit, 10)
+
+    def test_unencodable_payload_fails_fast(self):
+        contact_id = self.client.create_contact(Contact("a@example.com"))["id"]
+        sent = sum(self.server.request_counts.values())
+        for _ in range(12):
+            with self.assertRaises(PermanentError):
+                self.client.create_note(contact_id, Note(float("nan")))
+        self.assertEqual(sum(self.server.request_counts.values()), sent)
+        self.assertEqual(self.client.circuit_breaker.state, CLOSED)
+        self.assertEqual(self.client.circuit_breaker._failures, 0)
+        self.assertEqual(self.client.concurrency.limit, 10)
+        self.assertNotIn("POST /contacts/{id}/notes", self.client.metrics.summary()["endpoints"])
+
+    def html_response(self, method, url, **kwargs):
+        # A 200 whose body is not JSON, as a misbehaving proxy might send
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"<html>Bad gateway</html>"
+        response.request = requests.Request(method, url).prepare()
+        return response
+
+    @mock.patch("gohighlevel_import_cli.gohighlevel_client.time.sleep")
+    def test_unreadable_body_is_retried(self, sleep):
+        real_request = self.client.session.request
+        calls = iter([self.html_response])
+
+        def respond(method, url, **kwargs):
+            # The first attempt gets the unreadable body, the retry reaches the server
+            return next(calls, real_request)(method, url, **kwargs)
+
+        with mock.patch.object(self.client.session, "request", side_effect=respond):
+            contact = self.client.create_contact(Contact("a@example.com"))
+        self.assertEqual(self.server.state.contacts[contact["id"]]["email"], "a@example.com")
+        self.assertEqual(self.client.metrics.summary()["endpoints"]["POST /contacts/"]["retries"], 1)
+
+    @mock.patch("gohighlevel_import_cli.gohighlevel_client.time.sleep")
+    def test_unreadable_body_exhausts_retries(self, sleep):
+        with mock.patch.object(self.client.session, "request", side_effect=self.html_response):
+            with self.assertRaises(RetryableError) as raised:
+                self.client.create_contact(Contact("a@example.com"))
+        self.assertEqual(raised.exception.status_code, 200)
+        self.assertIn("not JSON", str(raised.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# tests/test_delta.py
+
+import unittest
+import pandas as pd
+from gohighlevel_import_cli.delta import classify, row_fingerprints, NEW, CHANGED, UNCHANGED
+from gohighlevel_import_cli.mock_server import synthetic_frames
+from tests.helpers import MockServerTestCase
+
+
+class TestFingerprints(unittest.TestCase):
+
+    def test_classify_against_stored(self):
+        df = pd.DataFrame({"Subject": ["a", "b", "c"], "Due": [1, 2.0, None]})
+        fingerprints = row_fingerprints(df, ["Subject", "Due", "Missing"])
+        self.assertEqual(fingerprints.tolist(), row_fingerprints(df.copy(), ["Subject", "Due"]).tolist())
+        stored = pd.DataFrame(
+            {"hash": [fingerprints[0], "stale"], "ghl_id": ["t1", "t2"]}, index=pd.Index(["1", "2"], name="record_id")
+        )
+        status, ghl_ids = classify(pd.Series(["1", "2", "3"]), fingerprints, stored)
+        self.assertEqual(status.tolist(), [UNCHANGED, CHANGED, NEW])
+        self.assertEqual(ghl_ids.tolist(), ["t1", "t2", None])
+
+
+class TestDeltaImport(MockServerTestCase):
+
+    exports = None
+
+    def setUp(self):
+        super().setUp()
+        contacts, tasks, notes = synthetic_frames(10, 20, 30)
+        # Zoho task and note exports carry their own Record Id
+        tasks.insert(0, "Record Id", range(1001, 1021))
+        notes.insert(0, "Record Id", range(2001, 2031))
+        self.frames = {"contacts": contacts, "tasks": tasks, "notes": notes}
+        self.paths = [self.path(f"{name}.csv") for name in self.frames]
+
+    def run_delta(self):
+        for path, df in zip(self.paths, self.frames.values()):
+            df.to_csv(path, index=False)
+        importer = self.importer(concurrency=4, delta=True, fingerprints_path=self.path("fingerprints.sqlite"))
+        before = dict(self.server.request_counts)
+        importer.run()
+        self.assertEqual(importer.failed_imports, [])
+        # Writes and contact searches; the owner list is fetched on every run
+        return {route: count - before.get(route, 0) for route, count in self.server.request_counts.items()
+                if route[0] != "GET" and count != before.get(route, 0)}
+
+    def test_second_export_sends_only_changes(self):
+        self.run_delta()
+        self.assertEqual(self.children("tasks"), 20)
+
+        tasks, notes = self.frames["tasks"], self.frames["notes"]
+        tasks.loc[3, "Subject"] = "Renamed task"
+        notes.loc[5, "Note Content"] = "Edited body"
+        self.frames["notes"] = pd.concat([notes, notes.iloc[[0]].assign(**{"Record Id": 3000})], ignore_index=True)
+        self.frames["contacts"].loc[0, "First Name"] = "Changed"
+        # Reformatting a date without changing it is not an edit
+        tasks["Due Date"] = pd.to_datetime(tasks["Due Date"]).dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+        sent = self.run_delta()
+        self.assertEqual(sent, {
+            ("PUT", "/contacts/{id}/tasks/{id}"): 1,
+            ("PUT", "/contacts/{id}/notes/{id}"): 1,
+            ("POST", "/contacts/{id}/notes"): 1,
+            ("PUT", "/contacts/{id}"): 1,
+        })
+        self.assertEqual(self.children("tasks"), 20)
+        children = self.server.state.children.values()
+        self.assertIn("Renamed task", [t["title"] for c in children for t in c["tasks"]])
+        self.assertIn("Edited body", [n["body"] for c in children for n in c["notes"]])
+
+        # Nothing changed since, so nothing is sent
+        self.assertEqual(self.run_delta(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# tests/test_dry_run.py
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from gohighlevel_import_cli.dry_run import DryRunPlanner
+from gohighlevel_import_cli.gohighlevel_client import GoHighLevelClient
+from gohighlevel_import_cli.importer import Importer, load_failures
+from gohighlevel_import_cli.mock_server import write_synthetic_exports
+from gohighlevel_import_cli.models import Contact, Note, Task
+from tests.helpers import MockServerTestCase
+
+
+class TestDryRunPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.client = GoHighLevelClient(api_key="dummy", location_id="loc", dry_run=True)
+        self.addCleanup(self.client.close)
+
+    def test_invalid_records_reported(self):
+        planner = DryRunPlanner(self.client)
+        contact = Contact("a@example.com")
+        contact.add_task(Task("Call back", "2025-01-01"))
+        contact.add_task(Task(None))
+        contact.add_note(Note(float("nan")))
+        invalid = planner.check_contact(contact)
+        self.assertEqual([kind for kind, _, _, _ in invalid], ["Task", "Note"])
+        self.assertIs(invalid[0][2], contact.tasks[1])
+        self.assertEqual(invalid[0][3]["title"], None)
+        self.assertEqual(planner.counts["tasks"], 1)
+
+        bad = Contact("not-an-email")
+        bad.add_task(Task("Call back"))
+        self.assertEqual(planner.check_contact(bad)[0][0], "Contact")
+        self.assertEqual(planner.counts["records_skipped"], 1)
+
+    def test_projection_follows_rate_limit(self):
+        planner = DryRunPlanner(self.client, concurrency=50, latency=0.1)
+        for i in range(10):
+            contact = Contact(f"c{i}@example.com")
+            for _ in range(9):
+                contact.add_task(Task("Call back"))
+            planner.check_contact(contact)
+        projection = planner.projection()
+        # 10 searches + 90 tasks, plus up to 10 contact creates, at 10 requests/s
+        self.assertEqual((projection["requests_min"], projection["requests_max"]), (100, 110))
+        self.assertEqual(projection["seconds_max"], 11.0)
+
+
+class TestOfflineDryRun(unittest.TestCase):
+
+    def test_run_makes_no_requests(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_synthetic_exports(tmp, 20, 30, 40)
+            importer = Importer("dummy", "loc", *paths, dry_run=True, cache_dir=None)
+            importer.import_log_path = os.path.join(tmp, "imported.log")
+            importer.dry_run_report_path = os.path.join(tmp, "report.json")
+            with mock.patch.object(importer.client.session, "request", side_effect=AssertionError("network")):
+                importer.run()
+
+            with open(importer.dry_run_report_path) as f:
+                report = json.load(f)
+            self.assertEqual(report["counts"]["tasks"], 30)
+            self.assertEqual(report["counts"]["notes"], 40)
+            self.assertEqual(report["payload_sizes"]["note"]["count"], 40)
+            self.assertEqual(report["projection"]["requests_min"],
+                             report["counts"]["contacts"] + 70 + 1)
+
+
+class TestDryRunFindings(MockServerTestCase):
+
+    def test_fixed_findings_can_be_replayed(self):
+        df = pd.read_csv(self.paths[1])
+        df.loc[:1, 'Subject'] = None
+        df.to_csv(self.paths[1], index=False)
+        dry = self.importer(dry_run=True, checkpoint_path=None)
+        dry.import_log_path = self.path("imported.log")
+        dry.dry_run_report_path = self.path("report.json")
+        dry.run()
+
+        findings = load_failures(dry.failed_log_path)
+        self.assertEqual([f["Type"] for f in findings], ["Task", "Task"])
+        for finding in findings:
+            # The record as a live failure log stores it, plus the would-be request
+            self.assertEqual(finding["Payload"].keys(), Task("x").to_dict().keys())
+            self.assertIsNone(finding["Request"]["title"])
+            finding["Payload"]["subject"] = "Fixed"
+        with open(dry.failed_log_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(finding) + "\n" for finding in findings)
+
+        self.assertEqual(self.importer().replay_failures(dry.failed_log_path), 2)
+        titles = [t["title"] for c in self.server.state.children.values() for t in c["tasks"]]
+        self.assertEqual(titles, ["Fixed", "Fixed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+# tests/test_existing.py
+
+import os
+import unittest
+from gohighlevel_import_cli.existing import task_signature, note_signature
+from tests.helpers import MockServerTestCase
+
+
+class TestSignatures(unittest.TestCase):
+
+    def test_normalized_matches(self):
+        self.assertEqual(task_signature("  Call   Bob ", "2025-01-01"), task_signature("call bob", "2025-01-01T00:00:00.000Z"))
+        self.assertEqual(task_signature("Call", "2025-01-01T05:00:00-05:00"), task_signature("Call", "2025-01-01T10:00:00Z"))
+        self.assertNotEqual(task_signature("Call", "2025-01-01"), task_signature("Call", "2025-01-02"))
+        self.assertEqual(task_signature("Call", None), ("call", None))
+        self.assertEqual(note_signature("Hello\n  world"), note_signature("hello world"))
+
+
+class TestSkipExisting(MockServerTestCase):
+
+    exports = (10, 20, 30)
+
+    def run_import(self, **kwargs):
+        # No checkpoint and a fresh import log: nothing local says what was sent
+        importer = self.importer(concurrency=4, checkpoint_path=None, **kwargs)
+        importer.import_log_path = self.path("imported.log")
+        importer.run()
+        os.remove(importer.import_log_path)
+        return importer
+
+    def test_rerun_only_reads_and_fills_gaps(self):
+        self.run_import()
+        children = self.server.state.children
+        contact_id = next(cid for cid, records in children.items() if records["notes"])
+        children[contact_id]["notes"].pop()
+        before = dict(self.server.request_counts)
+
+        importer = self.run_import(skip_existing=True)
+        sent = {route: count - before.get(route, 0) for route, count in self.server.request_counts.items()}
+        self.assertEqual(sent[("POST", "/contacts/{id}/notes")], 1)
+        self.assertEqual(sent[("POST", "/contacts/{id}/tasks")], 0)
+        self.assertEqual(sent[("POST", "/contacts/")], 0)
+        self.assertEqual(sent[("GET", "/contacts/{id}/tasks")], len(children))
+        self.assertEqual(sent[("GET", "/contacts/{id}/notes")], len(children))
+        self.assertEqual(importer.metrics.records["tasks_existing"], 20)
+        self.assertEqual(importer.metrics.records["notes_existing"], 29)
+        self.assertEqual(sum(len(records["notes"]) for records in children.values()), 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
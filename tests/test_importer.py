@@ -1,8 +1,16 @@
 # tests/test_importer.py
 
+import os
+import sys
+import tempfile
+import threading
 import unittest
-from gohighlevel_import_cli.models import Contact, Task, Note
+from unittest import mock
+import pandas as pd
+from gohighlevel_import_cli.importer import Importer
+from gohighlevel_import_cli.models import Contact, Task, Note, DeltaTask, DeltaNote, task_from_dict, note_from_dict
 from gohighlevel_import_cli.gohighlevel_client import GoHighLevelClient
+from gohighlevel_import_cli.mock_server import MockGoHighLevelServer, write_synthetic_exports
 
 
 class TestModels(unittest.TestCase):
@@ -27,13 +35,27 @@ class TestModels(unittest.TestCase):
         self.assertEqual(len(contact.tasks), 1)
         self.assertEqual(len(contact.notes), 1)
 
+    def test_delta_fields_only_on_delta_records(self):
+        task = Task("Follow Up")
+        self.assertIsNone(task.fingerprint)
+        self.assertNotIn("fingerprint", task.to_dict())
+        with self.assertRaises(AttributeError):
+            task.fingerprint = "abc"
+        self.assertLess(sys.getsizeof(task), sys.getsizeof(DeltaTask("Follow Up")))
+
+    def test_payload_round_trip(self):
+        delta = DeltaNote("Body", "Title", source_id=7, fingerprint="abc", occurrence=1)
+        self.assertIsInstance(note_from_dict(delta.to_dict()), DeltaNote)
+        self.assertEqual(note_from_dict(delta.to_dict()).to_dict(), delta.to_dict())
+        self.assertIs(type(task_from_dict(Task("Call").to_dict())), Task)
+
 class TestClientDryRun(unittest.TestCase):
 
     def setUp(self):
-        self.client = GoHighLevelClient(api_key="dummy", dry_run=True)
+        self.client = GoHighLevelClient(api_key="dummy", location_id="loc", dry_run=True)
 
-    def test_find_contact_dry(self):
-        contact = self.client.find_contact_by_email("someone@example.com")
+    def test_create_contact_dry(self):
+        contact = self.client.create_contact(Contact("someone@example.com"))
         self.assertEqual(contact["id"], "mock-someone@example.com")
 
     def test_create_task_payload(self):
@@ -44,7 +66,195 @@ class TestClientDryRun(unittest.TestCase):
     def test_create_note_payload(self):
         note = Note("Intro call", "Intro")
         payload = self.client.create_note("mock-id", note)
-        self.assertEqual(payload["title"], "Intro")
+        self.assertEqual(payload["body"], "Intro call")
+
+
+class TestClientAgainstMockServer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = MockGoHighLevelServer().start()
+        self.addCleanup(self.server.stop)
+        self.client = GoHighLevelClient(api_key="dummy", location_id="loc", dry_run=False)
+        self.client.base_url = self.server.url
+        self.addCleanup(self.client.close)
+
+    def test_find_contact_live(self):
+        self.assertIsNone(self.client.find_contact_by_email("someone@example.com"))
+        created = self.client.create_contact(Contact("someone@example.com", first_name="Some"))
+        found = self.client.find_contact_by_email("Someone@example.com")
+        self.assertEqual(found["id"], created["id"])
+
+    def test_tasks_notes_and_owner(self):
+        contact_id = self.client.create_contact(Contact("a@example.com"))["id"]
+        owner = self.client.resolve_user_id("jane doe")
+        self.client.create_task(contact_id, Task("Call back"), assigned_to=owner)
+        self.client.create_note(contact_id, Note("Intro call"))
+        tasks = self.server.state.list_children(contact_id, "tasks")
+        self.assertEqual(tasks[0]["assignedTo"], "user-1")
+        self.assertEqual(self.server.state.list_children(contact_id, "notes")[0]["body"], "Intro call")
+
+    @mock.patch("gohighlevel_import_cli.gohighlevel_client.time.sleep")
+    def test_retries_server_errors(self, sleep):
+        self.server.error_rate = 0.5
+        self.client.max_attempts = 20
+        for i in range(5):
+            self.client.create_contact(Contact(f"c{i}@example.com"))
+        self.assertTrue(sleep.called)
+        self.assertEqual(len(self.server.state.contacts), 5)
+
+class TestImporterRun(unittest.TestCase):
+
+    def test_live_run_against_mock_server(self):
+        with tempfile.TemporaryDirectory() as tmp, MockGoHighLevelServer() as server:
+            paths = write_synthetic_exports(tmp, 20, 30, 40)
+            importer = Importer("dummy", "loc", *paths, dry_run=False, concurrency=4, cache_dir=None,
+                                checkpoint_path=os.path.join(tmp, "checkpoint.sqlite"))
+            importer.client.base_url = server.url
+            importer.unmatched_log_path = os.path.join(tmp, "unmatched.csv")
+            importer.run()
+
+            children = server.state.children.values()
+            self.assertEqual(sum(len(c["tasks"]) for c in children), 30)
+            self.assertEqual(sum(len(c["notes"]) for c in children), 40)
+            self.assertEqual(importer.failed_imports, [])
+
+            # A second run finds everything in the checkpoint and writes nothing
+            writes = sum(server.request_counts.values())
+            rerun = Importer("dummy", "loc", *paths, dry_run=False, cache_dir=None,
+                             checkpoint_path=os.path.join(tmp, "checkpoint.sqlite"))
+            rerun.client.base_url = server.url
+            rerun.unmatched_log_path = importer.unmatched_log_path
+            rerun.run()
+            self.assertEqual(sum(server.request_counts.values()), writes)
+
+
+class TestImporterMapping(unittest.TestCase):
+
+    def setUp(self):
+        self.importer = Importer("dummy", "loc", None, None, None, dry_run=True)
+        self.importer.contacts_df = pd.DataFrame({
+            "Record Id": [1, 2, 3],
+            "Email": ["a@example.com", "b@example.com", "a@example.com"],
+            "First Name": ["Ann", "Bob", "Dup"],
+            "Mobile Phone": ["111", "222", "333"],
+            "Phone": ["444", None, "555"],
+            "Mailing City": ["Austin", "Boston", "Chicago"],
+        })
+        self.importer.tasks_df = pd.DataFrame({
+            "Subject": ["T1", "T2", "T3"],
+            "Due Date": [pd.Timestamp("2025-01-01"), None, "2025-02-03"],
+            "Status": ["Completed", "Open", None],
+            "Task Owner": ["Jane Doe", None, "John Roe"],
+            "Email": ["b@example.com", "a@example.com", "b@example.com"],
+        })
+        self.importer.notes_df = pd.DataFrame({
+            "Note Title": ["N1", None],
+            "Note Content": ["Hello", "World"],
+            "Note Owner": ["Jane Doe", "Jane Doe"],
+            "Email": ["a@example.com", "b@example.com"],
+        })
+        # load_data normalizes dates, statuses and owners before mapping
+        self.importer._normalize_frames()
+
+    def test_contacts_in_first_seen_order(self):
+        self.importer.map_to_objects()
+        self.assertEqual(list(self.importer.contacts_dict), ["b@example.com", "a@example.com"])
+
+    def test_contact_fields_from_first_match(self):
+        self.importer.map_to_objects()
+        contact = self.importer.contacts_dict["a@example.com"]
+        self.assertEqual(contact.first_name, "Ann")
+        self.assertEqual(contact.source_id, 1)
+        self.assertEqual(contact.phone, "111")
+        self.assertEqual(contact.additional_phones, ["444"])
+        self.assertEqual(contact.address["city"], "Austin")
+        self.assertIsNone(contact.address["street"])
+        self.assertEqual(self.importer.contacts_dict["b@example.com"].additional_phones, [])
+
+    def test_tasks_and_notes_attached_in_file_order(self):
+        self.importer.map_to_objects()
+        b = self.importer.contacts_dict["b@example.com"]
+        self.assertEqual([t.subject for t in b.tasks], ["T1", "T3"])
+        self.assertTrue(b.tasks[0].completed)
+        self.assertEqual(b.tasks[0].due_date, "2025-01-01T00:00:00")
+        self.assertEqual(b.tasks[1].owner, "John Roe")
+        self.assertEqual(b.tasks[1].due_date, "2025-02-03T00:00:00")
+        self.assertFalse(b.tasks[1].completed)
+        self.assertEqual([n.content for n in b.notes], ["World"])
+        a = self.importer.contacts_dict["a@example.com"]
+        self.assertEqual([n.content for n in a.notes], ["Hello"])
+
+    def test_no_extra_phone_columns(self):
+        self.importer.contacts_df = self.importer.contacts_df.drop(columns=["Phone"])
+        self.importer.map_to_objects()
+        self.assertEqual(self.importer.contacts_dict["a@example.com"].additional_phones, [])
+
+    def test_blank_text_cells_map_to_none(self):
+        self.importer.tasks_df["Subject"] = ["T1", float("nan"), "T3"]
+        self.importer.notes_df["Note Content"] = ["Hello", float("nan")]
+        self.importer.map_to_objects()
+        self.assertIsNone(self.importer.contacts_dict["a@example.com"].tasks[0].subject)
+        self.assertIsNone(self.importer.contacts_dict["b@example.com"].notes[0].content)
+        self.assertIsNone(self.importer.contacts_dict["b@example.com"].tasks[0].description)
+
+    def test_plain_records_without_delta(self):
+        self.importer.map_to_objects()
+        contact = self.importer.contacts_dict["b@example.com"]
+        self.assertIs(type(contact.tasks[0]), Task)
+        self.assertIs(type(contact.notes[0]), Note)
+
+class RecordingClient:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+
+    def _record(self, *event):
+        with self.lock:
+            self.events.append(event)
+
+    def find_contact_by_email(self, email):
+        self._record("find", email)
+        return None
+
+    def create_contact(self, contact):
+        self._record("contact", contact.email)
+        return {"id": f"id-{contact.email}"}
+
+    def resolve_user_id(self, name):
+        return None
+
+    def create_task(self, contact_id, task, completed=False, assigned_to=None):
+        self._record("task", contact_id)
+
+    def create_note(self, contact_id, note, assigned_to=None):
+        self._record("note", contact_id)
+
+
+class TestConcurrentImport(unittest.TestCase):
+
+    def test_children_follow_their_contact(self):
+        importer = Importer("dummy", "loc", None, None, None, dry_run=True, concurrency=4)
+        importer.client = RecordingClient()
+        importer.import_log_path = os.devnull
+        contacts = []
+        for i in range(10):
+            contact = Contact(f"c{i}@example.com")
+            for _ in range(3):
+                contact.add_task(Task("t"))
+                contact.add_note(Note("n"))
+            contacts.append(contact)
+
+        processed = importer._run_concurrent(contacts)
+
+        self.assertEqual(processed, 10)
+        events = importer.client.events
+        self.assertEqual(len(events), 10 * 8)
+        for contact in contacts:
+            created = events.index(("contact", contact.email))
+            children = [i for i, e in enumerate(events) if e[1] == f"id-{contact.email}"]
+            self.assertEqual(len(children), 6)
+            self.assertTrue(all(i > created for i in children))
 
 if __name__ == '__main__':
     unittest.main()
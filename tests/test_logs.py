@@ -0,0 +1,61 @@
+# tests/test_logs.py
+
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+from gohighlevel_import_cli.logs import RECORD_LOGGER, record_event, setup_logging
+
+
+class TestStructuredLogging(unittest.TestCase):
+
+    def setUp(self):
+        root = logging.getLogger()
+        saved = (list(root.handlers), root.level, RECORD_LOGGER.level, list(RECORD_LOGGER.filters))
+
+        def restore():
+            handlers, level, record_level, filters = saved
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            for handler in handlers:
+                root.addHandler(handler)
+            root.setLevel(level)
+            RECORD_LOGGER.setLevel(record_level)
+            RECORD_LOGGER.filters[:] = filters
+
+        self.addCleanup(restore)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.log_file = os.path.join(self.tmp.name, "import.log")
+
+    def read_lines(self):
+        with open(self.log_file, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_json_lines_with_sampled_record_events(self):
+        with mock.patch("sys.stderr", new_callable=io.StringIO):
+            listener = setup_logging("INFO", "json", self.log_file, sample_every=2)
+            logging.info("Starting %s", "import")
+            for i in range(4):
+                record_event("task_created", "Created task %d", i, contact_id=f"c{i}")
+            listener.stop()
+
+        lines = self.read_lines()
+        self.assertEqual(lines[0]["message"], "Starting import")
+        events = [line for line in lines if line.get("event") == "task_created"]
+        self.assertEqual([event["contact_id"] for event in events], ["c0", "c2"])
+
+    def test_record_events_hidden_at_info(self):
+        with mock.patch("sys.stderr", new_callable=io.StringIO):
+            listener = setup_logging("INFO", "json", self.log_file)
+            record_event("task_created", "Created task")
+            logging.warning("done")
+            listener.stop()
+        self.assertEqual([line["message"] for line in self.read_lines()], ["done"])
+
+
+if __name__ == "__main__":
+    unittest.main()
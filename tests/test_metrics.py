@@ -0,0 +1,80 @@
+# tests/test_metrics.py
+
+import io
+import threading
+import unittest
+from gohighlevel_import_cli.gohighlevel_client import GoHighLevelClient
+from gohighlevel_import_cli.metrics import LatencyHistogram, ProgressReporter, RunMetrics, endpoint_name
+from gohighlevel_import_cli.mock_server import MockGoHighLevelServer
+from gohighlevel_import_cli.models import Contact, Task
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_endpoint_name_collapses_ids(self):
+        self.assertEqual(endpoint_name("POST", "https://x/contacts/abc123/tasks"), "POST /contacts/{id}/tasks")
+        self.assertEqual(endpoint_name("POST", "https://x/contacts/search"), "POST /contacts/search")
+        self.assertEqual(endpoint_name("GET", "https://x/users/?locationId=1"), "GET /users/")
+
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for ms in [1] * 90 + [200] * 9 + [40000]:
+            histogram.add(ms)
+        self.assertEqual(histogram.percentile(50), 5.0)
+        self.assertEqual(histogram.percentile(99), 250.0)
+        self.assertEqual(histogram.percentile(100), 40000)
+
+    def test_progress_line_has_eta(self):
+        metrics = RunMetrics()
+        metrics.contacts_total = 10
+        reporter = ProgressReporter(metrics, stream=io.StringIO())
+        reporter._started = 0
+        metrics.count("contacts_done", 5)
+        metrics.count("tasks_created", 7)
+        self.assertIn("contacts 5/10", reporter.line())
+        self.assertIn("7 records", reporter.line())
+        self.assertIn("ETA", reporter.line())
+
+    def test_progress_line_while_counters_are_added(self):
+        metrics = RunMetrics()
+        reporter = ProgressReporter(metrics, stream=io.StringIO())
+        reporter._started = 0
+        for i in range(1000):
+            metrics.count(f"kind{i}_created")
+
+        def count():
+            for i in range(1000, 20000):
+                metrics.count(f"kind{i}_created")
+
+        worker = threading.Thread(target=count)
+        worker.start()
+        try:
+            while worker.is_alive():
+                reporter.line()
+        finally:
+            worker.join()
+        self.assertIn("20000 records", reporter.line())
+
+    def test_client_records_requests_and_rate_limits(self):
+        with MockGoHighLevelServer(rate_limit=(3, 0.3)) as server:
+            metrics = RunMetrics()
+            client = GoHighLevelClient(api_key="dummy", location_id="loc", dry_run=False, metrics=metrics)
+            client.base_url = server.url
+            contact_id = client.create_contact(Contact("a@example.com"))["id"]
+            # The client starts with the default 100-token bucket, so the
+            # server's 3-request burst is exceeded before headers resync it
+            for i in range(5):
+                client.create_task(contact_id, Task(f"T{i}"))
+            client.close()
+
+        summary = metrics.summary()
+        tasks = summary["endpoints"]["POST /contacts/{id}/tasks"]
+        self.assertEqual(tasks["statuses"].get("201"), 5)
+        self.assertGreater(tasks["bytes_sent"], 0)
+        self.assertEqual(summary["endpoints"]["POST /contacts/"]["requests"], 1)
+        rate_limited = sum(e["rate_limited"] for e in summary["endpoints"].values())
+        self.assertEqual(rate_limited > 0, summary["rate_limit_wait_s"] > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
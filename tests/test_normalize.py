@@ -0,0 +1,48 @@
+# tests/test_normalize.py
+
+import unittest
+from datetime import datetime, timezone
+import pandas as pd
+from gohighlevel_import_cli.normalize import (normalize_datetimes, normalize_datetime, normalize_text,
+                                              completed_flags)
+
+
+class TestNormalizeDatetimes(unittest.TestCase):
+
+    VALUES = [
+        "2025-01-01", "2025-01-02 10:30:00.5", "01/02/2025", "garbage", None, float("nan"), "",
+        datetime(2024, 5, 1), "2025-03-01T10:00:00+02:00", datetime(2024, 5, 1, tzinfo=timezone.utc),
+    ]
+
+    def test_column_matches_row_wise(self):
+        values, rejected = normalize_datetimes(pd.Series(self.VALUES, dtype=object), formats=("%d/%m/%Y",))
+        self.assertEqual(values.tolist(), [normalize_datetime(v, ("%d/%m/%Y",))[0] for v in self.VALUES])
+        self.assertEqual(values.tolist()[:3], ["2025-01-01T00:00:00", "2025-01-02T10:30:00.500000",
+                                               "2025-02-01T00:00:00"])
+        # Aware values are converted to UTC
+        self.assertEqual(values[8], "2025-03-01T08:00:00+00:00")
+        self.assertEqual(rejected[rejected].index.tolist(), [3])
+
+    def test_naive_values_localized(self):
+        values, _ = normalize_datetimes(pd.Series(["2025-01-01 09:00"]), timezone="America/New_York")
+        self.assertEqual(values[0], "2025-01-01T14:00:00+00:00")
+        self.assertEqual(normalize_datetime("2025-01-01 09:00", timezone="America/New_York")[0], values[0])
+
+    def test_datetime_column(self):
+        values, rejected = normalize_datetimes(pd.Series([pd.Timestamp("2025-01-01"), pd.NaT]))
+        self.assertEqual(values.tolist(), ["2025-01-01T00:00:00", None])
+        self.assertFalse(rejected.any())
+
+
+class TestNormalizeText(unittest.TestCase):
+
+    def test_owner_whitespace(self):
+        self.assertEqual(normalize_text(["  Jane   Doe ", None, "", float("nan")]).tolist(),
+                         ["Jane Doe", None, None, None])
+
+    def test_completed_flags(self):
+        self.assertEqual(completed_flags([" Completed", "open", None]).tolist(), [True, False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# tests/test_parse_cache.py
+
+import os
+import tempfile
+import unittest
+import pandas as pd
+from gohighlevel_import_cli.importer import Importer
+from gohighlevel_import_cli.parse_cache import ParseCache
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.paths = [os.path.join(self.tmp.name, f"{name}.csv") for name in ("contacts", "tasks", "notes")]
+        pd.DataFrame({"Record Id": [1, 2], "Email": ["a@example.com", "b@example.com"]}).to_csv(self.paths[0], index=False)
+        pd.DataFrame({"Contact Name.id": [1, 3], "Subject": ["T1", "T2"]}).to_csv(self.paths[1], index=False)
+        pd.DataFrame({"Parent ID.id": [2], "Note Content": ["Hi"]}).to_csv(self.paths[2], index=False)
+
+    def load(self):
+        importer = Importer("dummy", "loc", *self.paths, dry_run=True, cache_dir=self.cache_dir)
+        importer.load_data()
+        return importer
+
+    def test_second_load_reuses_cache(self):
+        first = self.load()
+        cache = ParseCache(self.cache_dir)
+        key = cache.key(self.paths)
+        self.assertIsNotNone(cache.get(key, ("contacts", "tasks", "notes")))
+        second = self.load()
+        pd.testing.assert_frame_equal(first.tasks_df, second.tasks_df)
+        self.assertEqual(list(second.tasks_df["Email"]), ["a@example.com"])
+
+    def test_changed_input_invalidates(self):
+        self.load()
+        cache = ParseCache(self.cache_dir)
+        old_key = cache.key(self.paths)
+        pd.DataFrame({"Contact Name.id": [1, 2], "Subject": ["T1", "T2"]}).to_csv(self.paths[1], index=False)
+        self.assertNotEqual(cache.key(self.paths), old_key)
+        self.assertEqual(len(self.load().tasks_df), 2)
+
+    def test_prunes_old_entries(self):
+        cache = ParseCache(self.cache_dir, max_entries=2)
+        for i in range(4):
+            cache.put(f"key{i}", {"contacts": pd.DataFrame({"a": [i]})})
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# tests/test_pipeline.py
+
+import threading
+import unittest
+from unittest import mock
+from gohighlevel_import_cli.pipeline import ImportPipeline
+from tests.helpers import MockServerTestCase
+
+
+class TestImportPipeline(MockServerTestCase):
+
+    def test_pipeline_uploads_everything_once(self):
+        importer = self.importer(concurrency=4, pipeline=True, pipeline_queue_size=5)
+        importer.run()
+
+        self.assertEqual(self.children("tasks"), 30)
+        self.assertEqual(self.children("notes"), 40)
+        self.assertEqual(importer.failed_imports, [])
+        stages = importer.metrics.summary()["stages"]
+        self.assertEqual(stages["read"]["processed"], 70)
+        self.assertEqual(stages["write"]["processed"], 70)
+        self.assertLessEqual(stages["write"]["max_queue_depth"], 5)
+
+        # Checkpoint keys match the contact-at-a-time importer, so it resumes cleanly
+        requests = sum(self.server.request_counts.values())
+        self.importer().run()
+        self.assertEqual(sum(self.server.request_counts.values()), requests)
+
+    def test_pipeline_resumes_in_memory_run(self):
+        self.blank_optional_cells()
+        self.importer(concurrency=2).run()
+        self.assertEqual((self.children("tasks"), self.children("notes")), (30, 40))
+
+        importer = self.importer(concurrency=2, pipeline=True)
+        importer.run()
+        self.assertEqual((self.children("tasks"), self.children("notes")), (30, 40))
+        self.assertEqual(importer.metrics.records["records_resumed"], 70)
+
+    def test_dead_stage_fails_the_run(self):
+        importer = self.importer(concurrency=1, pipeline=True, pipeline_queue_size=2)
+        errors = []
+
+        def run():
+            try:
+                importer.run()
+            except RuntimeError as e:
+                errors.append(e)
+
+        with mock.patch.object(ImportPipeline, "_contact_id", side_effect=RuntimeError("resolver died")):
+            # Without the stop flag the reader would block on the full queue
+            thread = threading.Thread(target=run, daemon=True)
+            thread.start()
+            thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([str(e) for e in errors], ["resolver died"])
+
+    def test_limit_counts_contacts(self):
+        importer = self.importer(concurrency=2, pipeline=True, limit=3)
+        importer.run()
+        self.assertEqual(len(self.server.state.contacts), 3)
+        self.assertEqual(importer.metrics.records["contacts_done"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
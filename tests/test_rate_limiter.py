@@ -0,0 +1,115 @@
+# tests/test_rate_limiter.py
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from gohighlevel_import_cli.gohighlevel_client import GoHighLevelClient
+from gohighlevel_import_cli.rate_limiter import RateLimiter
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(burst=10, interval=10, safety_margin=0,
+                                   clock=self.clock, sleep=self.clock.sleep)
+
+    def test_burst_then_paced(self):
+        for _ in range(10):
+            self.limiter.acquire()
+        self.assertEqual(self.clock.slept, [])
+        self.limiter.acquire()
+        self.assertAlmostEqual(self.clock.now, 1.0)
+
+    def test_remaining_header_caps_tokens(self):
+        self.limiter.update({"X-RateLimit-Remaining": "2", "X-RateLimit-Max": "10",
+                             "X-RateLimit-Interval-Milliseconds": "10000"})
+        self.limiter.acquire()
+        self.limiter.acquire()
+        self.assertEqual(self.clock.slept, [])
+        self.limiter.acquire()
+        self.assertGreater(self.clock.now, 0)
+
+    def test_headers_change_rate(self):
+        self.limiter.update({"X-RateLimit-Max": "50", "X-RateLimit-Interval-Milliseconds": "5000"})
+        self.assertEqual(self.limiter.rate, 10)
+
+    def test_share_of_quota(self):
+        limiter = RateLimiter(burst=10, interval=10, safety_margin=0, clock=self.clock,
+                              sleep=self.clock.sleep, share=0.5)
+        limiter.update({"X-RateLimit-Remaining": "8", "X-RateLimit-Max": "50",
+                        "X-RateLimit-Interval-Milliseconds": "5000"})
+        self.assertEqual(limiter.rate, 5)
+        for _ in range(4):
+            limiter.acquire()
+        self.assertEqual(self.clock.slept, [])
+        limiter.acquire()
+        self.assertGreater(self.clock.now, 0)
+
+    def test_exhausted_quota_pauses_until_reset(self):
+        self.limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "3"})
+        self.limiter.acquire()
+        self.assertGreaterEqual(self.clock.now, 3)
+
+
+class RateLimitedHandler(BaseHTTPRequestHandler):
+    # Answers the first request with a 429, then succeeds, always sending quota headers
+    calls = 0
+
+    def do_POST(self):
+        type(self).calls += 1
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        status = 429 if type(self).calls == 1 else 200
+        body = json.dumps({"contacts": [{"id": "abc"}]}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Max", "100")
+        self.send_header("X-RateLimit-Interval-Milliseconds", "10000")
+        self.send_header("X-RateLimit-Remaining", "0" if status == 429 else "99")
+        self.send_header("X-RateLimit-Reset", "0.05")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestClientAgainstFakeServer(unittest.TestCase):
+
+    def setUp(self):
+        RateLimitedHandler.calls = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RateLimitedHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = GoHighLevelClient(api_key="dummy", location_id="loc", dry_run=False)
+        self.client.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.client.max_attempts = 1
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_429_waits_without_using_an_attempt(self):
+        contact = self.client.find_contact_by_email("a@example.com")
+        self.assertEqual(contact["id"], "abc")
+        self.assertEqual(RateLimitedHandler.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
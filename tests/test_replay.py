@@ -0,0 +1,85 @@
+# tests/test_replay.py
+
+import os
+import unittest
+from unittest import mock
+from gohighlevel_import_cli.gohighlevel_client import RetryableError
+from gohighlevel_import_cli.importer import load_failures
+from tests.helpers import MockServerTestCase
+
+
+class TestReplayFailures(MockServerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.failed_log_path = self.path("failed.jsonl")
+
+    def importer(self, paths=None, **kwargs):
+        return super().importer(paths, concurrency=4, **kwargs)
+
+    def test_replay_sends_only_failed_records(self):
+        first = self.importer(self.paths)
+        create_contact = first.client.create_contact
+
+        def flaky_contact(contact):
+            if contact.email == "user1@example.com":
+                raise Exception("boom")
+            return create_contact(contact)
+
+        with mock.patch.object(first.client, "create_note", side_effect=Exception("503")), \
+                mock.patch.object(first.client, "create_contact", side_effect=flaky_contact):
+            first.run()
+
+        failures = load_failures(self.failed_log_path)
+        notes = [f for f in failures if f["Type"] == "Note" and f["ContactId"]]
+        self.assertTrue(notes)
+        self.assertTrue(all(f["Key"] for f in failures))
+        self.assertIn("Contact", {f["Type"] for f in failures})
+        tasks_before = self.children("tasks")
+        self.assertLess(tasks_before, 30)
+
+        # Export paths are not needed for a replay
+        replayed = self.importer((None, None, None)).replay_failures(self.failed_log_path)
+        self.assertEqual(replayed, len(failures))
+        self.assertEqual(self.children("notes"), 40)
+        self.assertEqual(self.children("tasks"), 30)
+        self.assertFalse(os.path.exists(self.failed_log_path))
+
+        # The checkpoint now covers everything, so a full rerun sends nothing
+        requests = sum(self.server.request_counts.values())
+        self.importer(self.paths).run()
+        self.assertEqual(sum(self.server.request_counts.values()), requests)
+
+
+class TestContactSearchFailure(MockServerTestCase):
+
+    def test_failed_search_fails_only_that_contact(self):
+        failed_log_path = self.path("failed.jsonl")
+        for options in (dict(concurrency=1), dict(concurrency=4), dict(concurrency=4, pipeline=True)):
+            with self.subTest(**options):
+                # No checkpoint: every run sends the same records again
+                importer = self.importer(checkpoint_path=None, **options)
+                importer.import_log_path = self.path("imported.log")
+                find = importer.client.find_contact_by_email
+
+                def flaky_find(email):
+                    if email == "user1@example.com":
+                        raise RetryableError("search timed out")
+                    return find(email)
+
+                tasks_before = self.server.request_counts[("POST", "/contacts/{id}/tasks")]
+                with mock.patch.object(importer.client, "find_contact_by_email", side_effect=flaky_find):
+                    importer.run()
+
+                failures = load_failures(failed_log_path)
+                self.assertEqual({f["Email"] for f in failures}, {"user1@example.com"})
+                contacts = [f for f in failures if f["Type"] == "Contact"]
+                self.assertEqual(len(contacts), 1)
+                self.assertIn("search timed out", contacts[0]["Error"])
+                sent = self.server.request_counts[("POST", "/contacts/{id}/tasks")] - tasks_before
+                self.assertEqual(sent + sum(f["Type"] == "Task" for f in failures), 30)
+                os.remove(failed_log_path)
+                os.remove(importer.import_log_path)
+
+if __name__ == "__main__":
+    unittest.main()
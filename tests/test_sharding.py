@@ -0,0 +1,146 @@
+# tests/test_sharding.py
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from gohighlevel_import_cli.importer import Importer, load_failures
+from gohighlevel_import_cli.mock_server import write_synthetic_exports
+from gohighlevel_import_cli.models import Contact, Note, Task
+from gohighlevel_import_cli.sharding import email_plans, replay_by_location, run_sharded, shard_of
+from tests.helpers import MockServerTestCase
+
+
+class TestShardOf(unittest.TestCase):
+
+    def test_stable_and_normalized(self):
+        self.assertEqual(shard_of("Bob@Example.com ", 4), shard_of("bob@example.com", 4))
+        self.assertEqual(shard_of(None, 4), 0)
+        counts = pd.Series([shard_of(f"user{i}@example.com", 4) for i in range(1000)]).value_counts()
+        self.assertEqual(sorted(counts.index), [0, 1, 2, 3])
+        self.assertGreater(counts.min(), 200)
+
+    def test_concurrent_shards_split_the_rate_limit(self):
+        for shards, processes, running in ((8, 2, 2), (2, 8, 2), (4, 4, 4)):
+            plans, workers = email_plans({}, shards, processes)
+            self.assertEqual(workers, running)
+            self.assertEqual([options["rate_share"] for _, options in plans], [1 / running] * shards)
+            self.assertEqual([options["shard"] for _, options in plans], [(i, shards) for i in range(shards)])
+
+    def test_selection_keeps_each_contacts_records(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_synthetic_exports(tmp, 20, 30, 40)
+            seen = []
+            for index in range(3):
+                importer = Importer("dummy", "loc", *paths, cache_dir=None, shard=(index, 3))
+                importer.load_data()
+                self.assertTrue(importer.tasks_df['Email'].isin(importer.contacts_df['Email']).all())
+                seen.append((len(importer.contacts_df), len(importer.tasks_df), len(importer.notes_df)))
+            self.assertEqual(tuple(map(sum, zip(*seen))), (20, 30, 40))
+
+
+class TestRunSharded(MockServerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Shard output files are written to the working directory
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        # Shard processes build their own clients from the environment
+        patcher = mock.patch.dict(os.environ, {"GHL_BASE_URL": self.server.url})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def options(self, **kwargs):
+        contacts, tasks, notes = self.paths
+        return dict(api_key="dummy", location_id="loc", contacts_path=contacts, tasks_path=tasks,
+                    notes_path=notes, concurrency=2, metrics_path="metrics.json", **kwargs)
+
+    def test_email_shards_write_everything_once(self):
+        options = self.options(dry_run=False)
+        processed = run_sharded(options, shards=2, processes=2)
+
+        counts = self.server.request_counts
+        self.assertEqual(processed, counts[("POST", "/contacts/")])
+        self.assertEqual(counts[("POST", "/contacts/{id}/tasks")], 30)
+        self.assertEqual(counts[("POST", "/contacts/{id}/notes")], 40)
+        self.assertFalse([name for name in os.listdir(".") if ".shard" in name])
+        metrics = pd.read_json("metrics.json", typ="series")
+        self.assertEqual(metrics["records"]["notes_created"], 40)
+        self.assertEqual(sorted(metrics["shards"]), ["shard0", "shard1"])
+
+        # Both shards checkpointed into the shared store: nothing is resent
+        self.assertEqual(run_sharded(options, shards=2, processes=2), processed)
+        self.assertEqual(counts[("POST", "/contacts/")], processed)
+        self.assertEqual(counts[("POST", "/contacts/{id}/tasks")], 30)
+        self.assertEqual(counts[("POST", "/contacts/{id}/notes")], 40)
+
+    def test_failures_and_reports_are_merged(self):
+        options = self.options(dry_run=True)
+        df = pd.read_csv(options["tasks_path"])
+        df.loc[:4, 'Subject'] = None
+        df.to_csv(options["tasks_path"], index=False)
+
+        run_sharded(options, shards=2, processes=2)
+
+        failures = load_failures("dry_run_invalid.jsonl")
+        self.assertEqual([failure["Error"] for failure in failures], ["task has no subject"] * 5)
+        report = pd.read_json("dry_run_report.json", typ="series")
+        self.assertEqual(report["counts"]["tasks"], 25)
+        self.assertEqual(report["counts"]["tasks_invalid"], 5)
+        self.assertEqual(sorted(report["shards"]), ["shard0", "shard1"])
+        self.assertFalse([name for name in os.listdir(".") if ".shard" in name])
+
+
+class TestReplayByLocation(MockServerTestCase):
+
+    exports = None
+
+    def setUp(self):
+        super().setUp()
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        # replay_by_location builds one Importer, and client, per location
+        patcher = mock.patch.dict(os.environ, {"GHL_BASE_URL": self.server.url})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # As merged from two location shards whose contacts could not be created
+        entries = []
+        for email, location, record in (("a@example.com", "loc-a", Note("Hello")),
+                                        ("b@example.com", "loc-b", Task("Call back"))):
+            entries.append({"Email": email, "Type": "Contact", "Error": "503", "Payload": Contact(email).to_dict(),
+                            "ContactId": None, "Key": f"contact:{email}", "Location": location})
+            entries.append({"Email": email, "Type": type(record).__name__, "Error": "contact was not created",
+                            "Payload": record.to_dict(), "ContactId": None, "Key": f"record:{email}",
+                            "Location": location})
+        with open("failed_imports.jsonl", "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+
+    def locations(self):
+        return {c["email"]: c["locationId"] for c in self.server.state.contacts.values()}
+
+    def test_records_go_back_to_their_location(self):
+        options = dict(api_key="dummy", location_id=None, contacts_path=None, tasks_path=None, notes_path=None,
+                       dry_run=False, cache_dir=None, checkpoint_path="checkpoint.sqlite")
+        self.assertEqual(replay_by_location(options, "failed_imports.jsonl"), 4)
+        self.assertEqual(self.locations(), {"a@example.com": "loc-a", "b@example.com": "loc-b"})
+        self.assertEqual((self.children("notes"), self.children("tasks")), (1, 1))
+        self.assertFalse(os.path.exists("failed_imports.jsonl"))
+        self.assertTrue(os.path.exists("checkpoint.loc-a.sqlite"))
+
+    def test_single_location_replay_leaves_other_locations(self):
+        importer = Importer("dummy", "loc-a", None, None, None, dry_run=False, cache_dir=None, checkpoint_path=None)
+        importer.client.base_url = self.server.url
+        self.assertEqual(importer.replay_failures("failed_imports.jsonl"), 2)
+        self.assertEqual(self.locations(), {"a@example.com": "loc-a"})
+        left = load_failures("failed_imports.jsonl")
+        self.assertEqual({(f["Email"], f["Location"]) for f in left}, {("b@example.com", "loc-b")})
+        self.assertEqual(len(left), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+# tests/test_startup.py
+
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "numpy", "requests", "openpyxl", "sqlite3")
+
+
+def import_times(*args):
+    """Run the CLI under -X importtime; return {top-level module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "gohighlevel_import_cli.main", *args],
+        cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Drop the separator space; what is left of the indent is the nesting
+        times[name[1:].rstrip()] = int(cumulative)
+    return result, times
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_help_skips_heavy_imports(self):
+        result, times = import_times("--help")
+        self.assertEqual(result.returncode, 0)
+        self.assertIn("--live", result.stdout)
+        modules = {name.strip() for name in times}
+        self.assertEqual([module for module in HEAVY_MODULES if module in modules], [])
+        # Everything --help imports beyond the interpreter's own startup
+        names = list(times)
+        first = next(i for i, name in enumerate(names) if name.strip().startswith("gohighlevel_import_cli"))
+        own = sum(us for name, us in list(times.items())[first:] if not name.startswith(" "))
+        self.assertLess(own, 100_000, f"--help spent {own / 1000:.1f} ms importing modules")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+# tests/test_streaming.py
+
+import os
+import tempfile
+import unittest
+import pandas as pd
+from gohighlevel_import_cli.importer import Importer
+from gohighlevel_import_cli.streaming import iter_rows, record_key
+from tests.helpers import MockServerTestCase
+
+CONTACTS = pd.DataFrame({
+    "Record Id": [101, 102, 103, 104],
+    "Email": ["a@example.com", "b@example.com", "a@example.com", "d@example.com"],
+    "First Name": ["Ann", "Bob", "Dup", "Dee"],
+    "Mobile Phone": ["+1-111", "+1-222", "+1-333", "+1-444"],
+    "Phone": ["+1-555", None, None, "+1-666"],
+    "Mailing City": ["Austin", None, "Chicago", "Denver"],
+})
+TASKS = pd.DataFrame({
+    "Contact Name.id": [102, 101, 999, 102, 103],
+    "Subject": ["T1", "T2", "orphan", "T3", "T4"],
+    "Due Date": [pd.Timestamp("2025-01-01"), None, None, pd.Timestamp("2025-03-01"), None],
+    "Status": ["Completed", "Open", "Open", None, "completed "],
+    "Task Owner": ["Jane Doe", None, None, "John Roe", "Jane Doe"],
+})
+NOTES = pd.DataFrame({
+    "Parent ID.id": [104, 101, 102],
+    "Note Title": ["N1", "N2", "N3"],
+    "Note Content": ["Hello", "World", "Again"],
+    "Created Time": [pd.Timestamp("2024-06-01 10:30"), None, pd.Timestamp("2024-07-01")],
+    "Note Owner": ["Jane Doe", "Jane Doe", None],
+})
+
+
+def plain(value):
+    # pandas reports blanks as NaN/NaT, the row readers as None
+    if isinstance(value, dict):
+        return {k: plain(v) for k, v in value.items()}
+    if value is pd.NaT or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+
+def snapshot(contacts):
+    result = []
+    for contact in contacts:
+        fields = {k: v for k, v in contact.to_dict().items() if k != "source_id"}
+        result.append((
+            plain(fields),
+            [plain(task.to_dict()) for task in contact.tasks],
+            [plain(note.to_dict()) for note in contact.notes],
+        ))
+    return result
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, ext):
+        paths = []
+        for name, df in (("contacts", CONTACTS), ("tasks", TASKS), ("notes", NOTES)):
+            path = os.path.join(self.tmp.name, f"{name}{ext}")
+            if ext == ".csv":
+                df.to_csv(path, index=False)
+            else:
+                df.to_excel(path, index=False)
+            paths.append(path)
+        return paths
+
+    def in_memory(self, paths):
+        importer = Importer("dummy", "loc", *paths, dry_run=True, cache_dir=None)
+        importer.load_data()
+        importer.map_to_objects()
+        return snapshot(importer.contacts_dict.values())
+
+    def streamed(self, paths, batch_size):
+        importer = Importer("dummy", "loc", *paths, dry_run=True, stream=True, stream_batch_size=batch_size)
+        source = importer._streaming_source()
+        try:
+            batches = list(source.batches())
+            self.assertTrue(all(len(batch) <= batch_size for batch in batches))
+            return snapshot(contact for batch in batches for contact in batch)
+        finally:
+            source.close()
+
+    def test_xlsx_matches_in_memory_mapping(self):
+        paths = self.write(".xlsx")
+        self.assertEqual(self.streamed(paths, batch_size=2), self.in_memory(paths))
+
+    def test_xlsx_odd_headers_match_in_memory_mapping(self):
+        from openpyxl import Workbook
+
+        paths = self.write(".xlsx")
+        workbook = Workbook()
+        sheet = workbook.active
+        # A blank, a numeric and a repeated header cell
+        sheet.append(list(CONTACTS.columns) + [None, 2024, "Phone"])
+        for i, row in enumerate(CONTACTS.itertuples(index=False)):
+            sheet.append([None if value != value else value for value in row] + ["x", i, f"+1-90{i}"])
+        workbook.save(paths[0])
+
+        self.assertEqual(list(iter_rows(paths[0]))[0].keys(), set(pd.read_excel(paths[0]).columns))
+        contacts = self.streamed(paths, batch_size=2)
+        self.assertEqual(contacts, self.in_memory(paths))
+        self.assertEqual(contacts[1][0]["additional_phones"], ["+1-555", "+1-900"])
+
+    def test_csv_rows_and_contacts(self):
+        paths = self.write(".csv")
+        rows = list(iter_rows(paths[0], chunk_size=2))
+        self.assertEqual(len(rows), 4)
+        self.assertIsNone(rows[1]["Phone"])
+        contacts = self.streamed(paths, batch_size=1)
+        self.assertEqual([c[0]["email"] for c in contacts], ["b@example.com", "a@example.com", "d@example.com"])
+        self.assertEqual([t["subject"] for t in contacts[1][1]], ["T2", "T4"])
+        self.assertEqual(contacts[1][0]["first_name"], "Ann")
+
+    def test_record_key_normalizes_ids(self):
+        self.assertEqual(record_key(101), record_key(101.0))
+        self.assertEqual(record_key(" 101"), "101")
+        self.assertIsNone(record_key(float("nan")))
+
+
+
+class TestResumeAcrossModes(MockServerTestCase):
+
+    def test_stream_resumes_in_memory_run(self):
+        self.blank_optional_cells()
+        first = self.importer(concurrency=2)
+        first.run()
+        self.assertEqual(first.failed_imports, [])
+        self.assertEqual((self.children("tasks"), self.children("notes")), (30, 40))
+
+        # Blank cells are NaN in memory and None when streamed; keys must agree
+        self.importer(stream=True).run()
+        self.assertEqual((self.children("tasks"), self.children("notes")), (30, 40))
+
+
+if __name__ == '__main__':
+    unittest.main()
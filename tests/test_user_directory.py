@@ -0,0 +1,78 @@
+# tests/test_user_directory.py
+
+import os
+import tempfile
+import threading
+import unittest
+from gohighlevel_import_cli.gohighlevel_client import PermanentError
+from gohighlevel_import_cli.user_directory import UserDirectory
+
+USERS = [
+    {"id": "u1", "firstName": "Jane", "lastName": "Doe", "email": "jane@example.com"},
+    {"id": "u2", "firstName": "John ", "lastName": " Smith", "name": "Johnny Smith", "email": "john@example.com"},
+]
+
+
+class TestUserDirectory(unittest.TestCase):
+
+    def setUp(self):
+        self.fetches = 0
+
+    def fetch(self):
+        self.fetches += 1
+        return USERS
+
+    def test_normalized_name_and_email_matching(self):
+        directory = UserDirectory(self.fetch, "loc")
+        self.assertEqual(directory.resolve("Jane  Doe"), "u1")
+        self.assertEqual(directory.resolve(" jane doe "), "u1")
+        self.assertEqual(directory.resolve("JOHN@example.com"), "u2")
+        self.assertEqual(directory.resolve("johnny smith"), "u2")
+        self.assertIsNone(directory.resolve("Nobody"))
+        self.assertIsNone(directory.resolve(float("nan")))
+        self.assertEqual(self.fetches, 1)
+
+    def test_aliases(self):
+        directory = UserDirectory(self.fetch, "loc", aliases={"J. Doe": "jane@example.com", "JS": "u2"})
+        self.assertEqual(directory.resolve("j. doe"), "u1")
+        self.assertEqual(directory.resolve("JS"), "u2")
+
+    def test_concurrent_callers_fetch_once(self):
+        directory = UserDirectory(self.fetch, "loc")
+        threads = [threading.Thread(target=directory.resolve, args=("Jane Doe",)) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.fetches, 1)
+
+    def test_disk_cache_respects_location_and_ttl(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "users.json")
+            UserDirectory(self.fetch, "loc", cache_path=path).load()
+            UserDirectory(self.fetch, "loc", cache_path=path).load()
+            self.assertEqual(self.fetches, 1)
+            UserDirectory(self.fetch, "other", cache_path=path).load()
+            self.assertEqual(self.fetches, 2)
+            UserDirectory(self.fetch, "other", cache_path=path, ttl=-1).load()
+            self.assertEqual(self.fetches, 3)
+
+    def test_failed_fetch_is_not_repeated(self):
+        def forbidden():
+            self.fetches += 1
+            raise PermanentError("GET /users/ returned 403", 403)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "users.json")
+            directory = UserDirectory(forbidden, "loc", cache_path=path)
+            with self.assertLogs(level="WARNING") as logs:
+                for _ in range(5):
+                    self.assertIsNone(directory.resolve("Jane Doe"))
+            self.assertEqual(self.fetches, 1)
+            self.assertEqual(len(logs.records), 1)
+            self.assertFalse(directory.available)
+            self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()